@@ -10,8 +10,9 @@ from alembic import context
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # 导入我们的模型
-from model import BaseModel, User, Brand, Camera, Lens, Mount, BrandMount
+from model import BaseModel, User, Brand, Camera, Lens, Mount, BrandMount, TableVersion, ImportJob, ImportLedger, ImportRowHash
 from database.engine import engine
+from database.fts import is_fts_table
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -26,6 +27,14 @@ if config.config_file_name is not None:
 from sqlmodel import SQLModel
 target_metadata = SQLModel.metadata
 
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """忽略由迁移脚本手动维护的 FTS5 全文索引表"""
+    if type_ == "table" and is_fts_table(name):
+        return False
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -51,7 +60,8 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
-        compare_server_default=True
+        compare_server_default=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -73,7 +83,8 @@ def run_migrations_online() -> None:
             connection=connection, 
             target_metadata=target_metadata,
             compare_type=True,
-            compare_server_default=True
+            compare_server_default=True,
+            include_object=include_object
         )
 
         with context.begin_transaction():
@@ -0,0 +1,50 @@
+"""Add import_ledger and import_row_hash for repeated uploads
+
+Revision ID: 3f9a6c1d2e84
+Revises: 65bdaae064e7
+Create Date: 2026-10-16 22:04:18.316502
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a6c1d2e84'
+down_revision: Union[str, Sequence[str], None] = '65bdaae064e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('import_ledger',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('create_time', sa.DateTime(), nullable=False),
+    sa.Column('update_time', sa.DateTime(), nullable=False),
+    sa.Column('kind', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('mode', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('content_hash', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('versions', sa.JSON(), nullable=False),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_import_ledger_kind'), 'import_ledger', ['kind'], unique=False)
+    op.create_index(op.f('ix_import_ledger_content_hash'), 'import_ledger', ['content_hash'], unique=False)
+    op.create_table('import_row_hash',
+    sa.Column('kind', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('key', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('row_hash', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.PrimaryKeyConstraint('kind', 'key')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('import_row_hash')
+    op.drop_index(op.f('ix_import_ledger_content_hash'), table_name='import_ledger')
+    op.drop_index(op.f('ix_import_ledger_kind'), table_name='import_ledger')
+    op.drop_table('import_ledger')
@@ -0,0 +1,63 @@
+"""Add FTS5 full-text search for camera and lens
+
+Revision ID: 57acc282e992
+Revises: 23aaeb6b2508
+Create Date: 2026-10-16 10:12:41.318254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '57acc282e992'
+down_revision: Union[str, Sequence[str], None] = '23aaeb6b2508'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FTS_TABLES = {'camera': 'camera_fts', 'lens': 'lens_fts'}
+COLUMNS = 'model, series, description'
+NEW_VALUES = 'new.model, new.series, new.description'
+OLD_VALUES = 'old.model, old.series, old.description'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # FTS5 仅用于 SQLite，其他数据库继续使用 LIKE 搜索
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    for table, fts in FTS_TABLES.items():
+        op.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5("
+            f"{COLUMNS}, content='{table}', content_rowid='id', tokenize='trigram')"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts}(rowid, {COLUMNS}) VALUES (new.id, {NEW_VALUES}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD_VALUES}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {COLUMNS} ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD_VALUES}); "
+            f"INSERT INTO {fts}(rowid, {COLUMNS}) VALUES (new.id, {NEW_VALUES}); END"
+        )
+        # 为已有数据建立索引
+        op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    for fts in FTS_TABLES.values():
+        op.execute(f"DROP TRIGGER IF EXISTS {fts}_au")
+        op.execute(f"DROP TRIGGER IF EXISTS {fts}_ad")
+        op.execute(f"DROP TRIGGER IF EXISTS {fts}_ai")
+        op.execute(f"DROP TABLE IF EXISTS {fts}")
@@ -0,0 +1,47 @@
+"""Unique catalog keys and import options
+
+Revision ID: 65bdaae064e7
+Revises: dedcb0447e16
+Create Date: 2026-10-16 21:12:37.562233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '65bdaae064e7'
+down_revision: Union[str, Sequence[str], None] = 'dedcb0447e16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 导入时按这些字段匹配已有记录（INSERT ... ON CONFLICT），索引改为唯一索引
+UNIQUE_KEYS = [('camera', 'model'), ('lens', 'model'), ('mount', 'name')]
+
+
+def _check_duplicates(table: str, column: str) -> None:
+    """已有重复值时无法建立唯一索引，先给出明确的错误"""
+    duplicates = op.get_bind().execute(sa.text(
+        f'SELECT {column} FROM {table} GROUP BY {column} HAVING COUNT(*) > 1 LIMIT 5'
+    )).scalars().all()
+    if duplicates:
+        raise RuntimeError(f'{table}.{column} has duplicate values, clean them up before upgrading: {duplicates}')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in UNIQUE_KEYS:
+        _check_duplicates(table, column)
+        op.drop_index(op.f(f'ix_{table}_{column}'), table_name=table)
+        op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=True)
+    op.add_column('import_job', sa.Column('options', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('import_job', 'options')
+    for table, column in reversed(UNIQUE_KEYS):
+        op.drop_index(op.f(f'ix_{table}_{column}'), table_name=table)
+        op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False)
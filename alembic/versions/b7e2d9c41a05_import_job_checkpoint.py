@@ -0,0 +1,30 @@
+"""Add checkpoint and cancel flag to import_job for per-chunk commits
+
+Revision ID: b7e2d9c41a05
+Revises: 3f9a6c1d2e84
+Create Date: 2026-10-17 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d9c41a05'
+down_revision: Union[str, Sequence[str], None] = '3f9a6c1d2e84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('import_job', sa.Column('checkpoint_row', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('import_job', sa.Column('cancel_requested', sa.Boolean(), nullable=False, server_default=sa.false()))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('import_job', 'cancel_requested')
+    op.drop_column('import_job', 'checkpoint_row')
@@ -0,0 +1,31 @@
+"""Add owner and heartbeat to import_job so only stale running jobs are requeued
+
+Revision ID: e4c81a6f93b2
+Revises: b7e2d9c41a05
+Create Date: 2026-10-17 10:05:21.604417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4c81a6f93b2'
+down_revision: Union[str, Sequence[str], None] = 'b7e2d9c41a05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('import_job', sa.Column('owner', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    op.add_column('import_job', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('import_job', 'heartbeat_at')
+    op.drop_column('import_job', 'owner')
@@ -4,9 +4,9 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
-from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
 
-from database.engine import get_session
+from database.session import Database, get_db, not_sticky
 from model.user import User, UserRole
 from services.user_service import UserService, verify_password
 
@@ -35,7 +35,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 # 验证令牌并获取当前用户
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_db)
 ) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -51,7 +51,7 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = session.exec(select(User).where(User.username == username)).first()
+    user = await db.run(UserService.get_user_by_username, username)
     if user is None:
         raise credentials_exception
     
@@ -78,15 +78,17 @@ async def get_current_admin_user(current_user: User = Depends(get_current_user))
 
 # 用户认证
 @router.post("/auth/login", summary="用户登录")
-def login_for_access_token(
+@not_sticky
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_db)
 ):
     """用户登录，获取访问令牌"""
     # 查找用户
-    user = session.exec(select(User).where(User.username == form_data.username)).first()
+    user = await db.run(UserService.get_user_by_username, form_data.username)
     
-    if not user or not verify_password(form_data.password, user.hash_password):
+    # 密码哈希校验耗 CPU，放到线程池中执行，不阻塞事件循环
+    if not user or not await run_in_threadpool(verify_password, form_data.password, user.hash_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="用户名或密码错误",
@@ -120,6 +122,7 @@ def login_for_access_token(
 
 # 刷新令牌
 @router.post("/auth/refresh", summary="刷新访问令牌")
+@not_sticky
 def refresh_access_token(current_user: User = Depends(get_current_user)):
     """刷新访问令牌"""
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -1,38 +1,55 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query
 from fastapi.responses import FileResponse
 import os
 from sqlmodel import Session
 
 from database.engine import get_session
+from database.instrumentation import query_budget
+from database.session import Database, get_db
 from model.brand import Brand, BrandCreate, BrandUpdate, BrandResponse, BrandQuery
+from model.import_job import ImportMode, ImportResults
 from model.user import User
 from api.auth import get_current_user, get_current_admin_user
+from api.etag import catalog_etag
+from api.imports import IMPORT_OPENAPI, import_request
 from services.brand_service import BrandService
-from services.import_service import ImportService
 from utils.limiter import limiter
+from utils.serialization import FastJSONResponse
 
 router = APIRouter()
 
 @router.post("/brands/", response_model=BrandResponse, summary="创建品牌")
-def create_brand(
+async def create_brand(
     brand: BrandCreate,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     """创建品牌（需要管理员权限）"""
-    brand_entity = BrandService.create_brand(session, brand.model_dump())
+    brand_entity = await db.run(BrandService.create_brand, brand.model_dump())
     return BrandResponse.model_validate(brand_entity)
 
-@router.post("/brands/import", summary="批量导入品牌")
+@router.post("/brands/import", summary="批量导入品牌", openapi_extra=IMPORT_OPENAPI, dependencies=[Depends(query_budget(None))])
 async def import_brands(
-    file: UploadFile = File(...),
+    request: Request,
+    response: Response,
+    background: bool = Query(False, description="后台执行：立即返回导入任务，通过 /imports/{job_id} 查询进度"),
+    mode: ImportMode = Query(ImportMode.INSERT, description="导入模式：insert 只新增，upsert 新增或更新，update_only 只更新"),
+    dry_run: bool = Query(False, description="只校验：返回逐行校验报告，不写入数据库"),
+    results: ImportResults = Query(ImportResults.ALL, description="逐行结果：all 全部返回，failures 只返回失败的行，stream 边导入边以 NDJSON 返回"),
+    force: bool = Query(False, description="忽略导入记录：相同文件也重新导入，不直接返回上次的结果"),
+    skip_unchanged: bool = Query(True, description="upsert / update_only 模式下跳过与上次导入相比没有变化的行"),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_admin_user)
 ):
-    """从 Excel 文件批量导入品牌（需要管理员权限）"""
-    content = await file.read()
-    return ImportService.import_brands(session, content)
+    """
+    批量导入品牌（需要管理员权限）
+
+    支持 multipart 上传 Excel / CSV / NDJSON 文件，或直接以 text/csv、application/x-ndjson 作为请求体流式上传。
+    列名可以使用模板中的中文表头或英文字段名。
+    upsert / update_only 模式按品牌名称匹配已有记录，只更新文件中提供的列。
+    """
+    return await import_request(request, response, session, "brand", current_user, background, mode, dry_run, results, force, skip_unchanged)
 
 @router.get("/brands/template", summary="下载品牌导入模板")
 @limiter.limit("5/minute")
@@ -45,57 +62,58 @@ def download_brands_template(request: Request):
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
     )
 
-@router.get("/brands/", response_model=List[BrandResponse], summary="获取品牌列表")
-def read_brands(
+@router.get("/brands/", response_model=List[BrandResponse], summary="获取品牌列表", dependencies=[Depends(catalog_etag("brand"))])
+async def read_brands(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     is_active: Optional[bool] = None,
     brand_type: Optional[str] = None,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_db)
 ):
     """获取品牌列表（允许所有用户访问）"""
-    brands = BrandService.get_brands(session, skip, limit, is_active, brand_type)
-    return [BrandResponse.model_validate(brand) for brand in brands]
+    rows = await db.run(BrandService.get_brand_rows, skip, limit, is_active, brand_type)
+    return FastJSONResponse(rows, headers=response.headers)
 
-@router.get("/brands/{brand_id}", response_model=BrandResponse, summary="获取品牌详情")
-def read_brand(brand_id: int, session: Session = Depends(get_session)):
+@router.get("/brands/{brand_id}", response_model=BrandResponse, summary="获取品牌详情", dependencies=[Depends(catalog_etag("brand"))])
+async def read_brand(brand_id: int, db: Database = Depends(get_db)):
     """根据ID获取品牌信息"""
-    brand = BrandService.get_brand_by_id(session, brand_id)
+    brand = await db.run(BrandService.get_brand_by_id, brand_id)
     return BrandResponse.model_validate(brand)
 
-@router.get("/brands/name/{brand_name}", response_model=BrandResponse, summary="根据名称获取品牌")
-def read_brand_by_name(brand_name: str, session: Session = Depends(get_session)):
+@router.get("/brands/name/{brand_name}", response_model=BrandResponse, summary="根据名称获取品牌", dependencies=[Depends(catalog_etag("brand"))])
+async def read_brand_by_name(brand_name: str, db: Database = Depends(get_db)):
     """根据品牌名称获取品牌信息"""
-    brand = BrandService.get_brand_by_name(session, brand_name)
+    brand = await db.run(BrandService.get_brand_by_name, brand_name)
     return BrandResponse.model_validate(brand)
 
 @router.put("/brands/{brand_id}", response_model=BrandResponse, summary="更新品牌")
-def update_brand(
+async def update_brand(
     brand_id: int,
     brand_update: BrandUpdate,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     """更新品牌信息（需要管理员权限）"""
-    brand = BrandService.update_brand(session, brand_id, brand_update.model_dump(exclude_unset=True))
+    brand = await db.run(BrandService.update_brand, brand_id, brand_update.model_dump(exclude_unset=True))
     return BrandResponse.model_validate(brand)
 
 @router.delete("/brands/{brand_id}", summary="删除品牌")
-def delete_brand(brand_id: int, current_user: User = Depends(get_current_admin_user), session: Session = Depends(get_session)):
+async def delete_brand(brand_id: int, current_user: User = Depends(get_current_admin_user), db: Database = Depends(get_db)):
     """删除品牌（需要管理员权限）"""
-    return BrandService.delete_brand(session, brand_id)
+    return await db.run(BrandService.delete_brand, brand_id)
 
 @router.patch("/brands/{brand_id}/activate", summary="激活品牌")
-def activate_brand(brand_id: int, current_user: User = Depends(get_current_admin_user), session: Session = Depends(get_session)):
+async def activate_brand(brand_id: int, current_user: User = Depends(get_current_admin_user), db: Database = Depends(get_db)):
     """激活品牌（需要管理员权限）"""
-    return BrandService.set_brand_active_status(session, brand_id, True)
+    return await db.run(BrandService.set_brand_active_status, brand_id, True)
 
 @router.patch("/brands/{brand_id}/deactivate", summary="停用品牌")
-def deactivate_brand(brand_id: int, current_user: User = Depends(get_current_admin_user), session: Session = Depends(get_session)):
+async def deactivate_brand(brand_id: int, current_user: User = Depends(get_current_admin_user), db: Database = Depends(get_db)):
     """停用品牌（需要管理员权限）"""
-    return BrandService.set_brand_active_status(session, brand_id, False)
+    return await db.run(BrandService.set_brand_active_status, brand_id, False)
 
-@router.get("/brands/types/", summary="获取品牌类型")
-def get_brand_types():
+@router.get("/brands/types/", summary="获取品牌类型", dependencies=[Depends(catalog_etag())])
+async def get_brand_types():
     """获取品牌类型列表（允许所有用户访问）"""
     return BrandService.get_brand_types()
\ No newline at end of file
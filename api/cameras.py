@@ -1,40 +1,57 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Request, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query
 from fastapi.responses import FileResponse
 import os
 from sqlmodel import Session, select
 
 from database.engine import get_session
+from database.instrumentation import query_budget
+from database.session import Database, get_db
 from model.camera import Camera, CameraCreate, CameraUpdate, CameraResponse, CameraQuery
-from model.query import CameraQueryParams, QueryResponse
+from model.query import CameraQueryParams, CountMode, QueryResponse
+from model.import_job import ImportMode, ImportResults
 from model.user import User
 from api.auth import get_current_user, get_current_admin_user
+from api.etag import catalog_etag
+from api.imports import IMPORT_OPENAPI, import_request
 from services.camera_service import CameraService
 from services.query_service import CameraQueryService
-from services.import_service import ImportService
 from utils.limiter import limiter
+from utils.serialization import FastJSONResponse
 
 router = APIRouter()
 
 @router.post("/cameras/", response_model=CameraResponse, summary="创建相机")
-def create_camera(
+async def create_camera(
     camera: CameraCreate,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     """创建相机（需要管理员权限）"""
-    camera_result = CameraService.create_camera(session, camera.model_dump())
+    camera_result = await db.run(CameraService.create_camera, camera.model_dump())
     return CameraResponse.model_validate(camera_result)
 
-@router.post("/cameras/import", summary="批量导入相机")
+@router.post("/cameras/import", summary="批量导入相机", openapi_extra=IMPORT_OPENAPI, dependencies=[Depends(query_budget(None))])
 async def import_cameras(
-    file: UploadFile = File(...),
+    request: Request,
+    response: Response,
+    background: bool = Query(False, description="后台执行：立即返回导入任务，通过 /imports/{job_id} 查询进度"),
+    mode: ImportMode = Query(ImportMode.INSERT, description="导入模式：insert 只新增，upsert 新增或更新，update_only 只更新"),
+    dry_run: bool = Query(False, description="只校验：返回逐行校验报告，不写入数据库"),
+    results: ImportResults = Query(ImportResults.ALL, description="逐行结果：all 全部返回，failures 只返回失败的行，stream 边导入边以 NDJSON 返回"),
+    force: bool = Query(False, description="忽略导入记录：相同文件也重新导入，不直接返回上次的结果"),
+    skip_unchanged: bool = Query(True, description="upsert / update_only 模式下跳过与上次导入相比没有变化的行"),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_admin_user)
 ):
-    """从 Excel 文件批量导入相机（需要管理员权限）"""
-    content = await file.read()
-    return ImportService.import_cameras(session, content)
+    """
+    批量导入相机（需要管理员权限）
+
+    支持 multipart 上传 Excel / CSV / NDJSON 文件，或直接以 text/csv、application/x-ndjson 作为请求体流式上传。
+    列名可以使用模板中的中文表头或英文字段名。
+    upsert / update_only 模式按型号匹配已有记录，只更新文件中提供的列。
+    """
+    return await import_request(request, response, session, "camera", current_user, background, mode, dry_run, results, force, skip_unchanged)
 
 @router.get("/cameras/template", summary="下载相机导入模板")
 @limiter.limit("5/minute")
@@ -47,25 +64,30 @@ def download_cameras_template(request: Request):
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
     )
 
-@router.get("/cameras/", response_model=List[CameraResponse], summary="获取相机列表")
-def read_cameras(
+@router.get("/cameras/", response_model=List[CameraResponse], summary="获取相机列表", dependencies=[Depends(catalog_etag("camera", "brand", "mount"))])
+async def read_cameras(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     is_active: Optional[bool] = None,
     brand_id: Optional[int] = None,
     mount_id: Optional[int] = None,
     sensor_size: Optional[str] = None,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_db)
 ):
     """获取相机列表（允许所有用户访问）"""
-    cameras = CameraService.get_cameras(session, skip, limit, is_active, brand_id, mount_id, sensor_size)
-    return [CameraResponse.model_validate(camera) for camera in cameras]
+    rows = await db.run(CameraService.get_camera_rows, skip, limit, is_active, brand_id, mount_id, sensor_size)
+    return FastJSONResponse(rows, headers=response.headers)
 
-@router.get("/cameras/query", response_model=QueryResponse, summary="高级查询相机")
-def query_cameras(
+@router.get("/cameras/query", response_model=QueryResponse, summary="高级查询相机", dependencies=[Depends(catalog_etag("camera", "brand", "mount"))])
+async def query_cameras(
+    response: Response,
+    
     # 分页参数
     skip: int = Query(0, ge=0, description="跳过的记录数"),
     limit: int = Query(20, ge=1, le=100, description="返回记录数"),
+    cursor: Optional[str] = Query(None, description="分页游标，使用上一页返回的 next_cursor，提供时忽略 skip"),
+    count: CountMode = Query(CountMode.EXACT, description="总数统计方式: exact(精确) / estimate(缓存估算) / none(不统计)"),
     
     # 排序参数
     sort_by: Optional[str] = Query(None, description="排序字段，如: model, megapixels, release_price"),
@@ -115,7 +137,10 @@ def query_cameras(
     # 状态过滤
     is_active: Optional[bool] = Query(None, description="是否只返回活跃记录"),
     
-    session: Session = Depends(get_session)
+    # 分面统计
+    facets: Optional[str] = Query(None, description="需要统计的分面，逗号分隔，如: brand_id,price"),
+    
+    db: Database = Depends(get_db)
 ):
     """
     高级查询相机接口，支持多字段组合查询
@@ -125,6 +150,8 @@ def query_cameras(
     ### 1. 基础查询
     - 查询前10个相机: `/cameras/query?limit=10`
     - 按价格降序排列: `/cameras/query?sort_by=release_price&sort_order=desc`
+    - 游标翻页: `/cameras/query?limit=20&cursor=<上一页的 next_cursor>`
+    - 不统计总数（无限滚动）: `/cameras/query?count=none`
     
     ### 2. 品牌和卡口过滤
     - 查询佳能相机: `/cameras/query?brand_id=1`
@@ -149,7 +176,11 @@ def query_cameras(
     - 搜索EOS系列: `/cameras/query?series=EOS`
     - 搜索特定型号: `/cameras/query?model=A7`
     
-    ### 7. 组合查询
+    ### 7. 分面统计
+    - 返回品牌计数和价格区间: `/cameras/query?facets=brand_id,price`
+    - 筛选佳能后仍返回全部品牌计数: `/cameras/query?brand_id=1&facets=brand_id,sensor_size,megapixels`
+    
+    ### 8. 组合查询
     - 查询索尼全画幅微单，价格1-2万: `/cameras/query?brand_id=3&sensor_size=full_frame&price_min=10000&price_max=20000`
     - 查询2020年后发布的轻便高像素相机: `/cameras/query?megapixels_min=30&weight_max=600&release_year_min=2020`
     """
@@ -157,6 +188,8 @@ def query_cameras(
     query_params = CameraQueryParams(
         skip=skip,
         limit=limit,
+        cursor=cursor,
+        count=count,
         sort_by=sort_by,
         sort_order=sort_order,
         search=search,
@@ -190,35 +223,36 @@ def query_cameras(
     if sensor_sizes:
         query_params.sensor_sizes = [size.strip() for size in sensor_sizes.split(',') if size.strip()]
     
+    if facets:
+        query_params.facets = [facet.strip() for facet in facets.split(',') if facet.strip()]
+    
     # 执行查询
     query_service = CameraQueryService()
-    result = query_service.query_with_pagination(session, query_params)
-    
-    return result
+    return FastJSONResponse(await db.run(query_service.query_json, query_params), headers=response.headers)
 
-@router.get("/cameras/{camera_id}", response_model=CameraResponse, summary="获取相机详情")
-def read_camera(camera_id: int, session: Session = Depends(get_session)):
+@router.get("/cameras/{camera_id}", response_model=CameraResponse, summary="获取相机详情", dependencies=[Depends(catalog_etag("camera"))])
+async def read_camera(camera_id: int, db: Database = Depends(get_db)):
     """根据ID获取相机信息（允许所有用户访问）"""
-    camera = CameraService.get_camera_by_id(session, camera_id)
+    camera = await db.run(CameraService.get_camera_by_id, camera_id)
     return CameraResponse.model_validate(camera)
 
 @router.put("/cameras/{camera_id}", response_model=CameraResponse, summary="更新相机")
-def update_camera(camera_id: int, camera_update: CameraUpdate, current_user: User = Depends(get_current_admin_user), session: Session = Depends(get_session)):
+async def update_camera(camera_id: int, camera_update: CameraUpdate, current_user: User = Depends(get_current_admin_user), db: Database = Depends(get_db)):
     """更新相机信息（需要管理员权限）"""
-    camera = CameraService.update_camera(session, camera_id, camera_update.model_dump(exclude_unset=True))
+    camera = await db.run(CameraService.update_camera, camera_id, camera_update.model_dump(exclude_unset=True))
     return CameraResponse.model_validate(camera)
 
 @router.delete("/cameras/{camera_id}", summary="删除相机")
-def delete_camera(camera_id: int, current_user: User = Depends(get_current_admin_user), session: Session = Depends(get_session)):
+async def delete_camera(camera_id: int, current_user: User = Depends(get_current_admin_user), db: Database = Depends(get_db)):
     """删除相机（需要管理员权限）"""
-    return CameraService.delete_camera(session, camera_id)
+    return await db.run(CameraService.delete_camera, camera_id)
 
 @router.patch("/cameras/{camera_id}/activate", summary="激活相机")
-def activate_camera(camera_id: int, current_user: User = Depends(get_current_admin_user), session: Session = Depends(get_session)):
+async def activate_camera(camera_id: int, current_user: User = Depends(get_current_admin_user), db: Database = Depends(get_db)):
     """激活相机（需要管理员权限）"""
-    return CameraService.activate_camera(session, camera_id)
+    return await db.run(CameraService.activate_camera, camera_id)
 
 @router.patch("/cameras/{camera_id}/deactivate", summary="停用相机")
-def deactivate_camera(camera_id: int, current_user: User = Depends(get_current_admin_user), session: Session = Depends(get_session)):
+async def deactivate_camera(camera_id: int, current_user: User = Depends(get_current_admin_user), db: Database = Depends(get_db)):
     """停用相机（需要管理员权限）"""
-    return CameraService.deactivate_camera(session, camera_id)
\ No newline at end of file
+    return await db.run(CameraService.deactivate_camera, camera_id)
\ No newline at end of file
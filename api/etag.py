@@ -0,0 +1,61 @@
+"""
+目录类 GET 接口的 ETag / 条件请求支持
+
+ETag 由请求路径、规范化后的查询参数和相关表的版本号计算，
+客户端携带的 If-None-Match 与之匹配时直接返回 304，不执行接口中的查询。
+"""
+import hashlib
+import os
+from typing import Callable
+
+from fastapi import Depends, Request, Response
+
+from database.session import Database, get_db
+from services.version_service import VersionService
+
+# 客户端缓存时间（秒），默认每次都需要向服务器确认
+CACHE_MAX_AGE = int(os.getenv("CATALOG_CACHE_MAX_AGE", "0"))
+CACHE_CONTROL = f"public, max-age={CACHE_MAX_AGE}, must-revalidate"
+
+
+class NotModified(Exception):
+    """资源未变更，由异常处理器转换为 304 响应"""
+
+    def __init__(self, etag: str):
+        self.etag = etag
+
+
+def not_modified_handler(request: Request, exc: NotModified) -> Response:
+    """返回不带响应体的 304"""
+    return Response(status_code=304, headers={"ETag": exc.etag, "Cache-Control": CACHE_CONTROL})
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 使用弱比较，忽略 W/ 前缀（不处理 *，资源是否存在需要执行查询才能确定）"""
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def catalog_etag(*tables: str) -> Callable:
+    """
+    生成 ETag 依赖
+
+    Args:
+        tables: 响应内容依赖的表，任一表写入后 ETag 变化
+
+    用法: `@router.get(..., dependencies=[Depends(catalog_etag("camera", "brand", "mount"))])`
+    """
+    async def dependency(request: Request, response: Response, db: Database = Depends(get_db)) -> None:
+        versions = await db.run(VersionService.get_versions, tables) if tables else ()
+        query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+        source = f"{request.app.version}|{request.url.path}?{query}|{','.join(tables)}|{versions}"
+        etag = '"' + hashlib.sha1(source.encode("utf-8")).hexdigest() + '"'
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, etag):
+            raise NotModified(etag)
+
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = CACHE_CONTROL
+
+    return dependency
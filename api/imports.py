@@ -0,0 +1,156 @@
+import os
+from itertools import chain
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import Session
+from starlette.datastructures import UploadFile
+
+from database.engine import get_session
+from database.session import mark_primary
+from model.import_job import ImportJobResponse, ImportMode, ImportOptions, ImportResults
+from model.user import User
+from api.auth import get_current_admin_user
+from services.import_job_service import ImportJobService
+from services.import_mapping import ImportColumnError
+from services.import_service import ImportService
+from utils.serialization import NDJSONStreamingResponse
+from utils.streams import open_stream
+
+router = APIRouter()
+
+# 请求体 Content-Type -> 文件格式
+IMPORT_CONTENT_TYPES = {"text/csv": "csv", "application/x-ndjson": "ndjson"}
+
+# multipart 上传的文件扩展名 -> 文件格式，其他扩展名按 Excel 处理
+IMPORT_EXTENSIONS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+# 导入接口的请求体说明（请求体由 import_request 按 Content-Type 自行解析）
+IMPORT_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary", "description": "Excel / CSV / NDJSON 文件"}},
+                    "required": ["file"],
+                }
+            },
+            "text/csv": {"schema": {"type": "string"}},
+            "application/x-ndjson": {"schema": {"type": "string"}},
+        },
+    }
+}
+
+
+async def import_request(
+    request: Request,
+    response: Response,
+    session: Session,
+    kind: str,
+    current_user: User,
+    background: bool = False,
+    mode: ImportMode = ImportMode.INSERT,
+    dry_run: bool = False,
+    results: ImportResults = ImportResults.ALL,
+    force: bool = False,
+    skip_unchanged: bool = True
+):
+    """
+    处理导入请求：multipart 上传 Excel / CSV / NDJSON 文件，或直接以 text/csv、application/x-ndjson 作为请求体
+
+    直接发送的请求体边接收边解析和写入，上传结束前就开始导入；导入本身在线程池中执行。
+    mode 指定导入模式：insert 只新增，upsert 新增或按唯一字段更新，update_only 只更新已有记录；
+    dry_run 时只校验并返回逐行报告，不写入数据库。
+    results 指定逐行结果的返回方式：all 全部返回，failures 只返回失败的行，
+    stream 边导入边以 NDJSON 逐行返回（最后一行为汇总），服务端不累积逐行结果。
+    相同文件再次上传时直接返回上次的结果（force 时重新导入）；upsert / update_only 模式下 skip_unchanged（默认开启）时跳过与数据库中的记录相同的行。
+    """
+    if background and results == ImportResults.STREAM:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="后台导入不支持 results=stream，请通过任务接口查询进度")
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == "multipart/form-data":
+        form = await request.form()
+        upload = form.get("file")
+        if not isinstance(upload, UploadFile):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="缺少上传文件: file")
+        filename = upload.filename
+        extension = os.path.splitext(filename or "")[1].lower()
+        file_format = IMPORT_EXTENSIONS.get(extension, "xlsx")
+        # 直接读取已落盘的上传文件，不把整个文件读入内存
+        file = upload.file
+    elif content_type in IMPORT_CONTENT_TYPES:
+        filename = None
+        file_format = IMPORT_CONTENT_TYPES[content_type]
+        file = open_stream(request.stream())
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"不支持的导入格式: {content_type or '未指定'}"
+        )
+
+    options = ImportOptions(
+        file_format=file_format, mode=mode, dry_run=dry_run, force=force, skip_unchanged=skip_unchanged
+    )
+    if background:
+        job = await run_in_threadpool(ImportJobService.submit, session, kind, file, filename, options, current_user.id)
+        response.status_code = status.HTTP_202_ACCEPTED
+        mark_primary(response)
+        return ImportJobService.to_response(job)
+    try:
+        if results == ImportResults.STREAM:
+            # 逐行结果在线程池中边导入边产出；先取得第一项，表头错误在开始输出前以 400 返回
+            rows = ImportService.iter_import(session, kind, file, options)
+            first = await run_in_threadpool(next, rows)
+            stream = NDJSONStreamingResponse(chain([first], rows))
+            mark_primary(stream)
+            return stream
+        result = await run_in_threadpool(ImportService.import_file, session, kind, file, options, None, results)
+        mark_primary(response)
+        return result
+    except ImportColumnError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.get("/imports/", response_model=List[ImportJobResponse], summary="获取导入任务列表")
+def read_import_jobs(
+    skip: int = 0,
+    limit: int = 20,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """获取最近的导入任务，按提交时间倒序（需要管理员权限）"""
+    jobs = ImportJobService.list_jobs(session, skip, limit)
+    return [ImportJobService.to_response(job) for job in jobs]
+
+@router.get("/imports/{job_id}", response_model=ImportJobResponse, summary="查询导入任务进度")
+def read_import_job(
+    job_id: int,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    查询导入任务状态（需要管理员权限）
+
+    执行中的任务返回已处理行数、处理速率（行/秒）、预计剩余时间（秒）和目前为止的错误；
+    任务结束后返回导入结果。
+    """
+    job = ImportJobService.get_job(session, job_id)
+    return ImportJobService.to_response(job)
+
+@router.post("/imports/{job_id}/cancel", response_model=ImportJobResponse, summary="取消导入任务")
+def cancel_import_job(
+    job_id: int,
+    response: Response,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    取消导入任务（需要管理员权限）
+
+    排队中的任务立即取消；执行中的任务在下一批提交前中止：当前批次回滚，之前已提交的批次保留。
+    """
+    job = ImportJobService.cancel(session, job_id)
+    mark_primary(response)
+    return ImportJobService.to_response(job)
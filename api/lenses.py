@@ -1,40 +1,57 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Request, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query
 from fastapi.responses import FileResponse
 import os
 from sqlmodel import Session
 
 from database.engine import get_session
+from database.instrumentation import query_budget
+from database.session import Database, get_db
 from model.lens import Lens, LensCreate, LensUpdate, LensResponse, LensQuery, LensType, FocusType
-from model.query import LensQueryParams, QueryResponse
+from model.query import LensQueryParams, CountMode, QueryResponse
+from model.import_job import ImportMode, ImportResults
 from model.user import User
 from api.auth import get_current_user, get_current_admin_user
+from api.etag import catalog_etag
+from api.imports import IMPORT_OPENAPI, import_request
 from services.lens_service import LensService
 from services.query_service import LensQueryService
-from services.import_service import ImportService
 from utils.limiter import limiter
+from utils.serialization import FastJSONResponse
 
 router = APIRouter()
 
 @router.post("/lenses/", response_model=LensResponse, summary="创建镜头")
-def create_lens(
+async def create_lens(
     lens: LensCreate,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     """创建镜头（需要管理员权限）"""
-    lens_result = LensService.create_lens(session, lens.model_dump())
+    lens_result = await db.run(LensService.create_lens, lens.model_dump())
     return LensResponse.model_validate(lens_result)
 
-@router.post("/lenses/import", summary="批量导入镜头")
+@router.post("/lenses/import", summary="批量导入镜头", openapi_extra=IMPORT_OPENAPI, dependencies=[Depends(query_budget(None))])
 async def import_lenses(
-    file: UploadFile = File(...),
+    request: Request,
+    response: Response,
+    background: bool = Query(False, description="后台执行：立即返回导入任务，通过 /imports/{job_id} 查询进度"),
+    mode: ImportMode = Query(ImportMode.INSERT, description="导入模式：insert 只新增，upsert 新增或更新，update_only 只更新"),
+    dry_run: bool = Query(False, description="只校验：返回逐行校验报告，不写入数据库"),
+    results: ImportResults = Query(ImportResults.ALL, description="逐行结果：all 全部返回，failures 只返回失败的行，stream 边导入边以 NDJSON 返回"),
+    force: bool = Query(False, description="忽略导入记录：相同文件也重新导入，不直接返回上次的结果"),
+    skip_unchanged: bool = Query(True, description="upsert / update_only 模式下跳过与上次导入相比没有变化的行"),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_admin_user)
 ):
-    """从 Excel 文件批量导入镜头（需要管理员权限）"""
-    content = await file.read()
-    return ImportService.import_lenses(session, content)
+    """
+    批量导入镜头（需要管理员权限）
+
+    支持 multipart 上传 Excel / CSV / NDJSON 文件，或直接以 text/csv、application/x-ndjson 作为请求体流式上传。
+    列名可以使用模板中的中文表头或英文字段名。
+    upsert / update_only 模式按型号匹配已有记录，只更新文件中提供的列。
+    """
+    return await import_request(request, response, session, "lens", current_user, background, mode, dry_run, results, force, skip_unchanged)
 
 @router.get("/lenses/template", summary="下载镜头导入模板")
 @limiter.limit("5/minute")
@@ -47,8 +64,9 @@ def download_lenses_template(request: Request):
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
     )
 
-@router.get("/lenses/", response_model=List[LensResponse], summary="获取镜头列表")
-def read_lenses(
+@router.get("/lenses/", response_model=List[LensResponse], summary="获取镜头列表", dependencies=[Depends(catalog_etag("lens"))])
+async def read_lenses(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     is_active: Optional[bool] = None,
@@ -57,20 +75,25 @@ def read_lenses(
     lens_type: Optional[LensType] = None,
     focus_type: Optional[FocusType] = None,
     has_stabilization: Optional[bool] = None,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_db)
 ):
     """获取镜头列表（允许所有用户访问）"""
-    lenses = LensService.get_lenses(
-        session, skip, limit, is_active, brand_id, mount_id,
+    rows = await db.run(
+        LensService.get_lens_rows,
+        skip, limit, is_active, brand_id, mount_id,
         lens_type, focus_type, has_stabilization
     )
-    return [LensResponse.model_validate(lens) for lens in lenses]
+    return FastJSONResponse(rows, headers=response.headers)
 
-@router.get("/lenses/query", response_model=QueryResponse, summary="高级查询镜头")
-def query_lenses(
+@router.get("/lenses/query", response_model=QueryResponse, summary="高级查询镜头", dependencies=[Depends(catalog_etag("lens", "brand", "mount"))])
+async def query_lenses(
+    response: Response,
+    
     # 分页参数
     skip: int = Query(0, ge=0, description="跳过的记录数"),
     limit: int = Query(20, ge=1, le=100, description="返回记录数"),
+    cursor: Optional[str] = Query(None, description="分页游标，使用上一页返回的 next_cursor，提供时忽略 skip"),
+    count: CountMode = Query(CountMode.EXACT, description="总数统计方式: exact(精确) / estimate(缓存估算) / none(不统计)"),
     
     # 排序参数
     sort_by: Optional[str] = Query(None, description="排序字段，如: model, min_focal_length, max_aperture_min, release_price"),
@@ -130,7 +153,10 @@ def query_lenses(
     # 状态过滤
     is_active: Optional[bool] = Query(None, description="是否只返回活跃记录"),
     
-    session: Session = Depends(get_session)
+    # 分面统计
+    facets: Optional[str] = Query(None, description="需要统计的分面，逗号分隔，如: brand_id,price"),
+    
+    db: Database = Depends(get_db)
 ):
     """
     高级查询镜头接口，支持多字段组合查询
@@ -140,6 +166,8 @@ def query_lenses(
     ### 1. 基础查询
     - 查询前10个镜头: `/lenses/query?limit=10`
     - 按价格升序排列: `/lenses/query?sort_by=release_price&sort_order=asc`
+    - 游标翻页: `/lenses/query?limit=20&cursor=<上一页的 next_cursor>`
+    - 不统计总数（无限滚动）: `/lenses/query?count=none`
     
     ### 2. 品牌和卡口过滤
     - 查询佳能镜头: `/lenses/query?brand_id=1`
@@ -174,7 +202,11 @@ def query_lenses(
     - 搜索L系列镜头: `/lenses/query?series=L`
     - 搜索特定型号: `/lenses/query?model=85mm`
     
-    ### 9. 组合查询
+    ### 9. 分面统计
+    - 返回镜头类型计数和光圈区间: `/lenses/query?facets=lens_type,aperture`
+    - 筛选定焦后仍返回各类型计数: `/lenses/query?lens_type=prime&facets=lens_type,price`
+    
+    ### 10. 组合查询
     - 查询索尼全画幅大光圈定焦: `/lenses/query?brand_id=3&lens_type=prime&aperture_min=1.8`
     - 查询万元内防抖变焦镜头: `/lenses/query?lens_type=zoom&has_stabilization=true&price_max=10000`
     - 查询2020年后发布的轻便定焦: `/lenses/query?lens_type=prime&weight_max=400&release_year_min=2020`
@@ -183,6 +215,8 @@ def query_lenses(
     query_params = LensQueryParams(
         skip=skip,
         limit=limit,
+        cursor=cursor,
+        count=count,
         sort_by=sort_by,
         sort_order=sort_order,
         search=search,
@@ -222,78 +256,79 @@ def query_lenses(
     if focus_types:
         query_params.focus_types = [focus_type.strip() for focus_type in focus_types.split(',') if focus_type.strip()]
     
+    if facets:
+        query_params.facets = [facet.strip() for facet in facets.split(',') if facet.strip()]
+    
     # 执行查询
     query_service = LensQueryService()
-    result = query_service.query_with_pagination(session, query_params)
-    
-    return result
+    return FastJSONResponse(await db.run(query_service.query_json, query_params), headers=response.headers)
 
-@router.get("/lenses/{lens_id}", response_model=LensResponse, summary="获取镜头详情")
-def read_lens(lens_id: int, session: Session = Depends(get_session)):
+@router.get("/lenses/{lens_id}", response_model=LensResponse, summary="获取镜头详情", dependencies=[Depends(catalog_etag("lens"))])
+async def read_lens(lens_id: int, db: Database = Depends(get_db)):
     """根据ID获取镜头信息（允许所有用户访问）"""
-    lens = LensService.get_lens_by_id(session, lens_id)
+    lens = await db.run(LensService.get_lens_by_id, lens_id)
     return LensResponse.model_validate(lens)
 
-@router.get("/lenses/model/{model}", response_model=LensResponse, summary="根据型号获取镜头")
-def read_lens_by_model(model: str, session: Session = Depends(get_session)):
+@router.get("/lenses/model/{model}", response_model=LensResponse, summary="根据型号获取镜头", dependencies=[Depends(catalog_etag("lens"))])
+async def read_lens_by_model(model: str, db: Database = Depends(get_db)):
     """根据型号获取镜头信息（允许所有用户访问）"""
-    lens = LensService.get_lens_by_model(session, model)
+    lens = await db.run(LensService.get_lens_by_model, model)
     return LensResponse.model_validate(lens)
 
 @router.put("/lenses/{lens_id}", response_model=LensResponse, summary="更新镜头")
-def update_lens(
+async def update_lens(
     lens_id: int,
     lens_update: LensUpdate,
     current_user: User = Depends(get_current_admin_user),
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_db)
 ):
     """更新镜头信息（需要管理员权限）"""
-    lens = LensService.update_lens(session, lens_id, lens_update.model_dump(exclude_unset=True))
+    lens = await db.run(LensService.update_lens, lens_id, lens_update.model_dump(exclude_unset=True))
     return LensResponse.model_validate(lens)
 
 @router.delete("/lenses/{lens_id}", summary="删除镜头")
-def delete_lens(
+async def delete_lens(
     lens_id: int,
     current_user: User = Depends(get_current_admin_user),
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_db)
 ):
     """删除镜头（需要管理员权限）"""
-    return LensService.delete_lens(session, lens_id)
+    return await db.run(LensService.delete_lens, lens_id)
 
 @router.patch("/lenses/{lens_id}/activate", summary="激活镜头")
-def activate_lens(
+async def activate_lens(
     lens_id: int,
     current_user: User = Depends(get_current_admin_user),
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_db)
 ):
     """激活镜头（需要管理员权限）"""
-    return LensService.activate_lens(session, lens_id)
+    return await db.run(LensService.activate_lens, lens_id)
 
 @router.patch("/lenses/{lens_id}/deactivate", summary="停用镜头")
-def deactivate_lens(
+async def deactivate_lens(
     lens_id: int,
     current_user: User = Depends(get_current_admin_user),
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_db)
 ):
     """停用镜头（需要管理员权限）"""
-    return LensService.deactivate_lens(session, lens_id)
+    return await db.run(LensService.deactivate_lens, lens_id)
 
-@router.get("/lenses/types/", summary="获取镜头类型")
-def get_lens_types():
+@router.get("/lenses/types/", summary="获取镜头类型", dependencies=[Depends(catalog_etag())])
+async def get_lens_types():
     """获取镜头类型列表（允许所有用户访问）"""
     return LensService.get_lens_types()
 
-@router.get("/lenses/focus-types/", summary="获取对焦方式")
-def get_focus_types():
+@router.get("/lenses/focus-types/", summary="获取对焦方式", dependencies=[Depends(catalog_etag())])
+async def get_focus_types():
     """获取对焦方式列表（允许所有用户访问）"""
     return LensService.get_focus_types()
 
-@router.get("/lenses/search/", summary="搜索镜头")
-def search_lenses(
+@router.get("/lenses/search/", summary="搜索镜头", dependencies=[Depends(catalog_etag("lens"))])
+async def search_lenses(
     q: str,
     skip: int = 0,
     limit: int = 100,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_db)
 ):
     """搜索镜头（允许所有用户访问）"""
-    return LensService.search_lenses(session, q, skip, limit)
\ No newline at end of file
+    return await db.run(LensService.search_lenses, q, skip, limit)
\ No newline at end of file
@@ -1,15 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from typing import List, Optional
 
-from database.engine import get_session
+from database.session import Database, get_db
 from model.mount import Mount, MountCreate, MountUpdate, MountResponse, MountQuery, BrandMountCreate, BrandMountResponse
 from model.brand import Brand
 from model.camera import Camera
 from model.lens import Lens
 from services.mount_service import MountService
 from api.auth import get_current_user, get_current_admin_user
+from api.etag import catalog_etag
 from model.user import User
+from utils.serialization import FastJSONResponse
 
 router = APIRouter()
 
@@ -17,12 +18,12 @@ router = APIRouter()
 @router.post("/mounts/", response_model=MountResponse, tags=["mounts"], summary="创建卡口")
 async def create_mount(
     mount_data: MountCreate,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     """创建卡口（需要管理员权限）"""
-    mount = MountService.create_mount(
-        session=session,
+    mount = await db.run(
+        MountService.create_mount,
         name=mount_data.name,
         flange_distance=mount_data.flange_distance,
         release_year=mount_data.release_year,
@@ -32,35 +33,36 @@ async def create_mount(
     return MountResponse.model_validate(mount)
 
 
-@router.get("/mounts/", response_model=List[MountResponse], tags=["mounts"], summary="获取卡口列表")
+@router.get("/mounts/", response_model=List[MountResponse], tags=["mounts"], summary="获取卡口列表", dependencies=[Depends(catalog_etag("mount"))])
 async def read_mounts(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     is_active: Optional[bool] = None,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_db)
 ):
     """获取卡口列表（公开访问）"""
-    mounts = MountService.get_mounts(session=session, skip=skip, limit=limit, is_active=is_active)
-    return [MountResponse.model_validate(mount) for mount in mounts]
+    rows = await db.run(MountService.get_mount_rows, skip=skip, limit=limit, is_active=is_active)
+    return FastJSONResponse(rows, headers=response.headers)
 
 
-@router.get("/mounts/{mount_id}", response_model=MountResponse, tags=["mounts"], summary="获取卡口详情")
+@router.get("/mounts/{mount_id}", response_model=MountResponse, tags=["mounts"], summary="获取卡口详情", dependencies=[Depends(catalog_etag("mount"))])
 async def read_mount(
     mount_id: int,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_db)
 ):
     """获取单个卡口"""
-    mount = MountService.get_mount_by_id(session=session, mount_id=mount_id)
+    mount = await db.run(MountService.get_mount_by_id, mount_id=mount_id)
     return MountResponse.model_validate(mount)
 
 
-@router.get("/mounts/name/{name}", response_model=MountResponse, tags=["mounts"], summary="根据名称获取卡口")
+@router.get("/mounts/name/{name}", response_model=MountResponse, tags=["mounts"], summary="根据名称获取卡口", dependencies=[Depends(catalog_etag("mount"))])
 async def read_mount_by_name(
     name: str,
-    db: Session = Depends(get_session)
+    db: Database = Depends(get_db)
 ):
     """根据名称获取卡口（公开访问）"""
-    mount = MountService.get_mount_by_name(db, name)
+    mount = await db.run(MountService.get_mount_by_name, name)
     if not mount:
         raise HTTPException(status_code=404, detail="卡口未找到")
     return MountResponse.model_validate(mount)
@@ -70,12 +72,12 @@ async def read_mount_by_name(
 async def update_mount(
     mount_id: int,
     mount_data: MountUpdate,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     """更新卡口信息（需要管理员权限）"""
-    mount = MountService.update_mount(
-        session=session,
+    mount = await db.run(
+        MountService.update_mount,
         mount_id=mount_id,
         name=mount_data.name,
         flange_distance=mount_data.flange_distance,
@@ -89,22 +91,22 @@ async def update_mount(
 @router.delete("/mounts/{mount_id}", tags=["mounts"], summary="删除卡口")
 async def delete_mount(
     mount_id: int,
-    session: Session = Depends(get_session),
+    db: Database = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     """删除卡口（需要管理员权限）"""
-    MountService.delete_mount(session=session, mount_id=mount_id)
+    await db.run(MountService.delete_mount, mount_id=mount_id)
     return {"message": "卡口删除成功"}
 
 
 @router.patch("/mounts/{mount_id}/activate", response_model=MountResponse, tags=["mounts"], summary="激活卡口")
 async def activate_mount(
     mount_id: int,
-    db: Session = Depends(get_session),
+    db: Database = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     """激活卡口（需要管理员权限）"""
-    mount = MountService.activate_mount(db, mount_id)
+    mount = await db.run(MountService.activate_mount, mount_id)
     if not mount:
         raise HTTPException(status_code=404, detail="卡口未找到")
     return MountResponse.model_validate(mount)
@@ -113,11 +115,11 @@ async def activate_mount(
 @router.patch("/mounts/{mount_id}/deactivate", response_model=MountResponse, tags=["mounts"], summary="停用卡口")
 async def deactivate_mount(
     mount_id: int,
-    db: Session = Depends(get_session),
+    db: Database = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     """停用卡口（需要管理员权限）"""
-    mount = MountService.deactivate_mount(db, mount_id)
+    mount = await db.run(MountService.deactivate_mount, mount_id)
     if not mount:
         raise HTTPException(status_code=404, detail="卡口未找到")
     return MountResponse.model_validate(mount)
@@ -127,13 +129,13 @@ async def deactivate_mount(
 async def add_brand_to_mount(
     mount_id: int,
     brand_data: BrandMountCreate,
-    db: Session = Depends(get_session),
+    db: Database = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     """为卡口添加品牌支持（需要管理员权限）"""
     try:
-        brand_mount = MountService.add_brand_to_mount(
-            db=db,
+        brand_mount = await db.run(
+            MountService.add_brand_to_mount,
             mount_id=mount_id,
             brand_id=brand_data.brand_id,
             is_primary=brand_data.is_primary,
@@ -148,53 +150,53 @@ async def add_brand_to_mount(
 async def remove_brand_from_mount(
     mount_id: int,
     brand_id: int,
-    db: Session = Depends(get_session),
+    db: Database = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     """从卡口移除品牌支持（需要管理员权限）"""
-    success = MountService.remove_brand_from_mount(db, mount_id, brand_id)
+    success = await db.run(MountService.remove_brand_from_mount, mount_id, brand_id)
     if not success:
         raise HTTPException(status_code=404, detail="品牌卡口关联未找到")
     return {"message": "品牌卡口关联移除成功"}
 
 
-@router.get("/mounts/{mount_id}/brands", response_model=List[Brand], tags=["mounts"], summary="获取卡口的品牌列表")
+@router.get("/mounts/{mount_id}/brands", response_model=List[Brand], tags=["mounts"], summary="获取卡口的品牌列表", dependencies=[Depends(catalog_etag("mount", "brand", "brandmount"))])
 async def get_mount_brands(
     mount_id: int,
-    db: Session = Depends(get_session)
+    db: Database = Depends(get_db)
 ):
     """获取支持该卡口的品牌列表（公开访问）"""
-    brands = MountService.get_mount_brands(db, mount_id)
+    brands = await db.run(MountService.get_mount_brands, mount_id)
     return brands
 
 
-@router.get("/mounts/{mount_id}/cameras", response_model=List[Camera], tags=["mounts"], summary="获取卡口的相机列表")
+@router.get("/mounts/{mount_id}/cameras", response_model=List[Camera], tags=["mounts"], summary="获取卡口的相机列表", dependencies=[Depends(catalog_etag("mount", "camera"))])
 async def get_mount_cameras(
     mount_id: int,
-    db: Session = Depends(get_session)
+    db: Database = Depends(get_db)
 ):
     """获取使用该卡口的相机列表（公开访问）"""
-    cameras = MountService.get_mount_cameras(db, mount_id)
+    cameras = await db.run(MountService.get_mount_cameras, mount_id)
     return cameras
 
 
-@router.get("/mounts/{mount_id}/lenses", response_model=List[Lens], tags=["mounts"], summary="获取卡口的镜头列表")
+@router.get("/mounts/{mount_id}/lenses", response_model=List[Lens], tags=["mounts"], summary="获取卡口的镜头列表", dependencies=[Depends(catalog_etag("mount", "lens"))])
 async def get_mount_lenses(
     mount_id: int,
-    db: Session = Depends(get_session)
+    db: Database = Depends(get_db)
 ):
     """获取使用该卡口的镜头列表（公开访问）"""
-    lenses = MountService.get_mount_lenses(db, mount_id)
+    lenses = await db.run(MountService.get_mount_lenses, mount_id)
     return lenses
 
 
-@router.get("/mounts/search/", response_model=List[MountResponse], tags=["mounts"], summary="搜索卡口")
+@router.get("/mounts/search/", response_model=List[MountResponse], tags=["mounts"], summary="搜索卡口", dependencies=[Depends(catalog_etag("mount"))])
 async def search_mounts(
     query: str = Query(...),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_session)
+    db: Database = Depends(get_db)
 ):
     """搜索卡口（公开访问）"""
-    mounts = MountService.search_mounts(db, query, skip=skip, limit=limit)
+    mounts = await db.run(MountService.search_mounts, query, skip=skip, limit=limit)
     return [MountResponse.model_validate(mount) for mount in mounts]
\ No newline at end of file
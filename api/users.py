@@ -1,8 +1,7 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, Query
-from sqlmodel import Session
 
-from database.engine import get_session
+from database.session import Database, get_db
 from model.user import User, UserCreate, UserUpdate, UserResponse, UserRole
 from api.auth import get_current_user, get_current_admin_user
 from services.user_service import UserService
@@ -10,17 +9,17 @@ from services.user_service import UserService
 router = APIRouter()
 
 @router.post("/users/", response_model=UserResponse, summary="创建用户")
-def create_user(
+async def create_user(
     user_create: UserCreate,
     current_user: User = Depends(get_current_admin_user),
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_db)
 ):
     """创建新用户（需要管理员权限）"""
-    user = UserService.create_user(session, user_create)
+    user = await db.run(UserService.create_user, user_create)
     return UserResponse.model_validate(user)
 
 @router.get("/users/", response_model=List[UserResponse], summary="获取用户列表")
-def read_users(
+async def read_users(
     skip: int = 0,
     limit: int = 100,
     username: Optional[str] = Query(None),
@@ -28,56 +27,56 @@ def read_users(
     role: Optional[UserRole] = Query(None),
     is_active: Optional[bool] = Query(None),
     current_user: User = Depends(get_current_admin_user),
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_db)
 ):
     """获取用户列表（支持筛选，需要管理员权限）"""
-    users = UserService.get_users(session, skip, limit, username, email, role, is_active)
+    users = await db.run(UserService.get_users, skip, limit, username, email, role, is_active)
     return [UserResponse.model_validate(user) for user in users]
 
 @router.get("/users/{user_id}", response_model=UserResponse, summary="获取用户详情")
-def read_user(user_id: int, current_user: User = Depends(get_current_admin_user), session: Session = Depends(get_session)):
+async def read_user(user_id: int, current_user: User = Depends(get_current_admin_user), db: Database = Depends(get_db)):
     """获取单个用户信息（需要管理员权限）"""
-    user = UserService.get_user_by_id(session, user_id)
+    user = await db.run(UserService.get_user_by_id, user_id)
     return UserResponse.model_validate(user)
 
 @router.put("/users/{user_id}", response_model=UserResponse, summary="更新用户")
-def update_user(user_id: int, user_update: UserUpdate, current_user: User = Depends(get_current_admin_user), session: Session = Depends(get_session)):
+async def update_user(user_id: int, user_update: UserUpdate, current_user: User = Depends(get_current_admin_user), db: Database = Depends(get_db)):
     """更新用户信息（需要管理员权限）"""
-    updated_user = UserService.update_user(session, user_id, user_update)
+    updated_user = await db.run(UserService.update_user, user_id, user_update)
     return UserResponse.model_validate(updated_user)
 
 @router.delete("/users/{user_id}", summary="删除用户")
-def delete_user(user_id: int, current_user: User = Depends(get_current_admin_user), session: Session = Depends(get_session)):
+async def delete_user(user_id: int, current_user: User = Depends(get_current_admin_user), db: Database = Depends(get_db)):
     """删除用户（需要管理员权限）"""
-    user = UserService.get_user_by_id(session, user_id)
-    UserService.delete_user(session, user)
+    user = await db.run(UserService.get_user_by_id, user_id)
+    await db.run(UserService.delete_user, user)
     return {"message": "User deleted successfully"}
 
 @router.patch("/users/{user_id}/activate", response_model=UserResponse, summary="激活用户")
-def activate_user(user_id: int, current_user: User = Depends(get_current_admin_user), session: Session = Depends(get_session)):
+async def activate_user(user_id: int, current_user: User = Depends(get_current_admin_user), db: Database = Depends(get_db)):
     """激活用户（需要管理员权限）"""
-    user = UserService.get_user_by_id(session, user_id)
-    activated_user = UserService.set_user_active_status(session, user, True)
+    user = await db.run(UserService.get_user_by_id, user_id)
+    activated_user = await db.run(UserService.set_user_active_status, user, True)
     return UserResponse.model_validate(activated_user)
 
 @router.patch("/users/{user_id}/deactivate", response_model=UserResponse, summary="停用用户")
-def deactivate_user(user_id: int, current_user: User = Depends(get_current_admin_user), session: Session = Depends(get_session)):
+async def deactivate_user(user_id: int, current_user: User = Depends(get_current_admin_user), db: Database = Depends(get_db)):
     """停用用户（需要管理员权限）"""
-    user = UserService.get_user_by_id(session, user_id)
-    deactivated_user = UserService.set_user_active_status(session, user, False)
+    user = await db.run(UserService.get_user_by_id, user_id)
+    deactivated_user = await db.run(UserService.set_user_active_status, user, False)
     return UserResponse.model_validate(deactivated_user)
 
 @router.get("/users/me", response_model=UserResponse, summary="获取当前用户信息")
-def read_current_user(current_user: User = Depends(get_current_user)):
+async def read_current_user(current_user: User = Depends(get_current_user)):
     """获取当前登录用户信息"""
     return UserResponse.model_validate(current_user)
 
 @router.put("/users/me", response_model=UserResponse, summary="更新当前用户信息")
-def update_current_user(
+async def update_current_user(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_db)
 ):
     """更新当前登录用户信息"""
-    updated_user = UserService.update_user(session, current_user, user_update)
+    updated_user = await db.run(UserService.update_user, current_user, user_update)
     return UserResponse.model_validate(updated_user)
\ No newline at end of file
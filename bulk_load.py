@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+离线批量加载脚本 - 不经过 HTTP 接口，直接把数据文件写入数据库
+用于新建数据库或重建测试数据库，支持 CSV、NDJSON、Excel（按扩展名识别）
+按依赖顺序加载：品牌、卡口、品牌-卡口关联、相机、镜头；整个加载在一个事务中完成
+"""
+
+import argparse
+import sys
+import time
+
+from database.engine import build_engine, describe_engine
+from services.bulk_load_service import LOAD_TARGETS, BulkLoadService
+
+# 数据类型 -> 说明
+TARGET_LABELS = {
+    "brands": "品牌文件（品牌名称、国家、官方网站……）",
+    "mounts": "卡口文件（卡口名称、法兰距、发布年份、是否在用、描述）",
+    "brand_mounts": "品牌-卡口关联文件（品牌、卡口、是否主要卡口、兼容性说明）",
+    "cameras": "相机文件（列与相机导入模板相同）",
+    "lenses": "镜头文件（列与镜头导入模板相同）",
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="离线批量加载数据（直接写入 DATABASE_URL 指定的数据库）",
+        epilog="示例: python bulk_load.py --brands brands.csv --mounts mounts.csv --cameras cameras.ndjson --lenses lenses.xlsx"
+    )
+    for target in LOAD_TARGETS:
+        parser.add_argument(f"--{target.name.replace('_', '-')}", dest=target.name, metavar="FILE", help=TARGET_LABELS[target.name])
+    parser.add_argument("--quiet", action="store_true", help="不输出失败行，只输出进度和汇总")
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    args = parse_args()
+    files = {target.name: getattr(args, target.name) for target in LOAD_TARGETS if getattr(args, target.name)}
+    if not files:
+        print("❌ 请至少指定一个数据文件，使用 --help 查看用法")
+        sys.exit(1)
+
+    def report(name: str, message: str):
+        print(f"[{name}] {message}" if name else message, flush=True)
+
+    def report_failure(name: str, result: dict):
+        print(f"[{name}] ❌ 第 {result['row']} 行 {result['item']}: {result['message']}", flush=True)
+
+    # 使用批量加载的引擎配置（单连接、不等待同步）
+    engine = build_engine("bulk")
+
+    print("\n🔧 离线批量加载")
+    print("=" * 50)
+    print(f"数据库: {describe_engine(engine)['url']}")
+    started = time.monotonic()
+    try:
+        summary = BulkLoadService.load(engine, files, report, None if args.quiet else report_failure)
+    except Exception as e:
+        print(f"❌ 加载失败，数据库未修改: {e}")
+        sys.exit(1)
+
+    print(f"\n✅ 加载完成，用时 {time.monotonic() - started:.1f} 秒")
+    for name, counts in summary.items():
+        print(f"   {name}: 共 {counts['total']} 行，写入 {counts['inserted']} 行，失败 {counts['failure']} 行")
+
+if __name__ == "__main__":
+    main()
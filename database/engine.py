@@ -1,26 +1,197 @@
 import os
+import weakref
+from typing import Any, Dict, NamedTuple, Union
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import create_engine, SQLModel, Session
 from dotenv import load_dotenv
 
+from database.instrumentation import instrument_engine
+
 # 加载环境变量
 load_dotenv()
 
 # 获取数据库URL，默认为SQLite
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///camera.db")
 
+
+class EngineProfile(NamedTuple):
+    """引擎配置：连接池、编译缓存，以及 SQLite 每个连接建立时执行的 pragma"""
+    pool_size: int                      # 连接池常驻连接数
+    max_overflow: int                   # 超出常驻连接数后最多额外创建的连接数
+    pool_pre_ping: bool                 # 取出连接前检测是否可用
+    query_cache_size: int               # SQL 编译缓存条目数
+    sqlite_pragmas: Dict[str, Any]      # SQLite pragma（其他数据库忽略）
+
+
+# SQLite 通用设置：WAL 下读不阻塞写、写不阻塞读（导入期间查询不再等待）
+_SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",          # WAL 下只在检查点时同步，断电最多丢失最近的事务
+    "mmap_size": 268435456,           # 256MB 内存映射读取
+    "cache_size": -65536,             # 每个连接 64MB 页缓存（负数单位为 KB）
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,             # 写锁被占用时最多等待 5 秒
+}
+
+# 引擎配置名称 -> 配置，通过环境变量 DB_PROFILE 选择
+ENGINE_PROFILES = {
+    # 开发环境：小连接池
+    "dev": EngineProfile(
+        pool_size=5, max_overflow=5, pool_pre_ping=True, query_cache_size=500,
+        sqlite_pragmas=_SQLITE_PRAGMAS
+    ),
+    # 生产环境
+    "prod": EngineProfile(
+        pool_size=10, max_overflow=20, pool_pre_ping=True, query_cache_size=1200,
+        sqlite_pragmas=_SQLITE_PRAGMAS
+    ),
+    # 只读（查询服务、只读副本）：连接池更大，SQLite 连接禁止写入；
+    # journal_mode 由主库设置并保存在数据库文件中，只读连接（mode=ro）无法修改，不再设置
+    "readonly": EngineProfile(
+        pool_size=20, max_overflow=20, pool_pre_ping=True, query_cache_size=1200,
+        sqlite_pragmas={
+            **{name: value for name, value in _SQLITE_PRAGMAS.items() if name != "journal_mode"},
+            "query_only": "ON"
+        }
+    ),
+    # 离线批量加载：单个连接，不等待同步
+    "bulk": EngineProfile(
+        pool_size=1, max_overflow=0, pool_pre_ping=False, query_cache_size=100,
+        sqlite_pragmas={**_SQLITE_PRAGMAS, "synchronous": "OFF", "cache_size": -262144}
+    ),
+}
+
+DB_PROFILE = os.getenv("DB_PROFILE", "prod")
+
+# 输出每条 SQL（调试用，同步写日志，不要在生产环境开启）
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() in ("1", "true", "yes")
+
+# 只读副本地址，逗号分隔；GET 请求（包括高级查询）使用副本，未配置时读写都使用主库。
+# 单机部署或测试时可以指向同一个 SQLite 文件的只读连接: sqlite:///file:camera.db?mode=ro&uri=true
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+
+# 目录接口使用异步驱动（SQLite: aiosqlite，PostgreSQL: asyncpg），数据库访问不占用线程池
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+
+# 同步驱动 -> 异步驱动
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def _engine_options(profile_name: str, url: str) -> Dict[str, Any]:
+    """按配置名称生成 create_engine 参数"""
+    if profile_name not in ENGINE_PROFILES:
+        raise ValueError(f"未知的数据库配置 DB_PROFILE={profile_name}，可选: {', '.join(ENGINE_PROFILES)}")
+    profile = ENGINE_PROFILES[profile_name]
+    database_url = make_url(url)
+
+    options = {"echo": DB_ECHO, "pool_pre_ping": profile.pool_pre_ping, "query_cache_size": profile.query_cache_size}
+    # 内存数据库使用单连接池，不支持连接池大小设置
+    if not (database_url.get_backend_name() == "sqlite" and database_url.database in (None, "", ":memory:")):
+        options.update(pool_size=profile.pool_size, max_overflow=profile.max_overflow)
+    return options
+
+
+# 引擎 -> 创建时使用的配置名称（Engine 没有 info 字典，单独记录；引擎释放后自动移除）
+_engine_profiles: "weakref.WeakKeyDictionary[Engine, str]" = weakref.WeakKeyDictionary()
+
+
+def _configure(new_engine: Engine, profile_name: str) -> None:
+    """记录配置名称，SQLite 连接应用 pragma 并改为显式开启事务（异步引擎传入其 sync_engine）"""
+    _engine_profiles[new_engine] = profile_name
+    profile = ENGINE_PROFILES[profile_name]
+    # 按请求统计语句数和耗时（不在请求中执行时不统计）
+    instrument_engine(new_engine)
+
+    if new_engine.dialect.name == "sqlite":
+        # pysqlite 不会在 SAVEPOINT 前开启事务，RELEASE 时会直接提交；
+        # 改为由 SQLAlchemy 显式发出 BEGIN，保存点（批量导入使用）才能随外层事务一起回滚。
+        # 同时应用配置中的 pragma（不在事务中执行，journal_mode 才能生效）
+        @event.listens_for(new_engine, "connect")
+        def _configure_sqlite_connection(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+            cursor = dbapi_connection.cursor()
+            for name, value in profile.sqlite_pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+        # 执行选项 sqlite_begin="IMMEDIATE" 时开始事务即取得写锁：先读后写的事务（如导入）
+        # 不会在升级为写锁时因另一个写事务直接失败，而是按忙等待超时排队
+        @event.listens_for(new_engine, "begin")
+        def _begin_sqlite_transaction(connection):
+            connection.exec_driver_sql(f"BEGIN {connection.get_execution_options().get('sqlite_begin', '')}".strip())
+
+
+def build_engine(profile_name: str = DB_PROFILE, url: str = DATABASE_URL) -> Engine:
+    """按配置名称创建引擎"""
+    new_engine = create_engine(url, **_engine_options(profile_name, url))
+    _configure(new_engine, profile_name)
+    return new_engine
+
+
+def build_async_engine(profile_name: str = DB_PROFILE, url: str = DATABASE_URL) -> AsyncEngine:
+    """按配置名称创建异步引擎，DATABASE_URL 中的同步驱动替换为对应的异步驱动"""
+    database_url = make_url(url)
+    backend = database_url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"数据库 {backend} 不支持异步模式（DB_ASYNC），可选: {', '.join(ASYNC_DRIVERS)}")
+    async_url = database_url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+    new_engine = create_async_engine(async_url, **_engine_options(profile_name, url))
+    _configure(new_engine.sync_engine, profile_name)
+    return new_engine
+
+
+def describe_engine(target: Union[Engine, AsyncEngine]) -> Dict[str, Any]:
+    """引擎的实际设置，启动时输出"""
+    if isinstance(target, AsyncEngine):
+        target = target.sync_engine
+    profile_name = _engine_profiles.get(target)
+    profile = ENGINE_PROFILES.get(profile_name)
+    description = {
+        "profile": profile_name,
+        "url": target.url.render_as_string(hide_password=True),
+        "driver": target.dialect.driver,
+        "pool": type(target.pool).__name__,
+        "echo": target.echo,
+    }
+    if profile is not None:
+        description.update(
+            pool_size=profile.pool_size, max_overflow=profile.max_overflow,
+            pool_pre_ping=profile.pool_pre_ping, query_cache_size=profile.query_cache_size
+        )
+        if target.dialect.name == "sqlite":
+            description["sqlite_pragmas"] = profile.sqlite_pragmas
+    return description
+
+
 # 创建数据库引擎
-engine = create_engine(DATABASE_URL, echo=True)
+engine = build_engine()
+
+# 写事务使用的引擎（SQLite 下事务开始时即取得写锁，其他数据库与 engine 相同）
+write_engine = engine.execution_options(sqlite_begin="IMMEDIATE")
+
+# 异步引擎（DB_ASYNC 时创建）：目录、用户和认证接口使用；导入仍使用同步引擎，在线程池中执行
+async_engine = build_async_engine() if DB_ASYNC else None
+
+# 只读副本引擎（使用 readonly 配置），与主库引擎对应：同步接口使用 replica_engines，DB_ASYNC 时使用 async_replica_engines
+replica_engines = [build_engine("readonly", url) for url in DATABASE_REPLICA_URLS]
+async_replica_engines = [build_async_engine("readonly", url) for url in DATABASE_REPLICA_URLS] if DB_ASYNC else []
 
 def create_db_and_tables():
     """创建数据库和表"""
-    from model import BaseModel, User, Brand, Camera, Lens, Mount, BrandMount
+    from model import BaseModel, User, Brand, Camera, Lens, Mount, BrandMount, TableVersion, ImportJob, ImportLedger, ImportRowHash
     # 使用SQLModel的元数据来创建所有表
     from sqlmodel import SQLModel
     SQLModel.metadata.create_all(engine)
+    # 创建全文索引（仅 SQLite）
+    from database.fts import create_fts_tables
+    with engine.begin() as connection:
+        create_fts_tables(connection)
 
 def drop_db_and_tables():
     """删除数据库表（用于开发环境）"""
-    from model import BaseModel, User, Brand, Camera, Lens, Mount, BrandMount
+    from model import BaseModel, User, Brand, Camera, Lens, Mount, BrandMount, TableVersion, ImportJob, ImportLedger, ImportRowHash
     # 使用SQLModel的元数据来删除所有表
     from sqlmodel import SQLModel
     SQLModel.metadata.drop_all(engine)
@@ -0,0 +1,50 @@
+"""
+SQLite FTS5 全文索引
+
+camera_fts / lens_fts 是以 camera / lens 为外部内容表的 FTS5 虚拟表，
+使用 trigram 分词器（按三字符切分，中文描述也可以检索），
+通过触发器与原表保持同步。
+"""
+from sqlalchemy import inspect, text
+
+# 原表 -> 全文索引表
+FTS_TABLES = {"camera": "camera_fts", "lens": "lens_fts"}
+
+# 参与全文索引的列
+FTS_COLUMNS = ("model", "series", "description")
+
+
+def fts_statements(table: str, fts_table: str) -> list:
+    """创建全文索引表和同步触发器的语句"""
+    columns = ", ".join(FTS_COLUMNS)
+    new_values = ", ".join(f"new.{column}" for column in FTS_COLUMNS)
+    old_values = ", ".join(f"old.{column}" for column in FTS_COLUMNS)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+        f"{columns}, content='{table}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts_table}(rowid, {columns}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {columns} ON {table} BEGIN "
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts_table}(rowid, {columns}) VALUES (new.id, {new_values}); END",
+    ]
+
+
+def create_fts_tables(connection) -> None:
+    """创建全文索引（仅 SQLite），新建的索引会从原表重建一次"""
+    if connection.dialect.name != "sqlite":
+        return
+
+    existing = set(inspect(connection).get_table_names())
+    for table, fts_table in FTS_TABLES.items():
+        for statement in fts_statements(table, fts_table):
+            connection.execute(text(statement))
+        if fts_table not in existing:
+            connection.execute(text(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"))
+
+
+def is_fts_table(name: str) -> bool:
+    """是否为全文索引表或其影子表（迁移对比时需要忽略）"""
+    return any(name == fts_table or name.startswith(f"{fts_table}_") for fts_table in FTS_TABLES.values())
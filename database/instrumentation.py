@@ -0,0 +1,187 @@
+"""
+按请求统计 SQL - 语句数、数据库耗时、重复语句（N+1）
+
+引擎事件记录每条语句（executemany 计为一条），计入当前请求的统计（RequestStats，
+由 SQLInstrumentationMiddleware 在请求开始时放入 ContextVar；线程池和 AsyncSession.run_sync
+中执行的服务函数沿用请求的上下文）。不在请求中的执行（导入任务、批量加载）不统计。
+
+- 响应头 Server-Timing: db;dur=<毫秒>, db-queries;desc="<语句数>", db-repeat;desc="<同一语句最多执行次数>"
+- 同一语句在一个请求中执行 SQL_REPEAT_THRESHOLD 次及以上记录警告（疑似 N+1）
+- 按路由汇总，通过 /metrics/sql 查看（进程内统计）
+- 每个请求的语句数上限默认为 SQL_QUERY_BUDGET，路由可以用 query_budget 依赖单独设置；
+  超出时记录警告，SQL_STRICT 开启时（测试使用）直接抛出 QueryBudgetExceeded，请求失败
+"""
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# 每个请求默认的语句数上限
+SQL_QUERY_BUDGET = int(os.getenv("SQL_QUERY_BUDGET", "50"))
+
+# 同一语句执行多少次视为 N+1
+SQL_REPEAT_THRESHOLD = int(os.getenv("SQL_REPEAT_THRESHOLD", "5"))
+
+# 严格模式：超出语句数上限时请求失败（测试中开启）
+SQL_STRICT = os.getenv("SQL_STRICT", "false").lower() in ("1", "true", "yes")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(Exception):
+    """严格模式下请求执行的语句数超出上限"""
+
+
+class RequestStats:
+    """一个请求的 SQL 统计"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0                         # 秒
+        self.budget: Optional[int] = SQL_QUERY_BUDGET
+        self.statements: Counter = Counter()        # 规范化的语句 -> 执行次数
+
+    def over_budget(self) -> bool:
+        """语句数超出上限"""
+        return self.budget is not None and self.count > self.budget
+
+    def max_repeat(self) -> int:
+        """同一语句的最多执行次数"""
+        return max(self.statements.values(), default=0)
+
+    def repeated(self) -> Dict[str, int]:
+        """达到 N+1 阈值的语句"""
+        return {statement: count for statement, count in self.statements.items() if count >= SQL_REPEAT_THRESHOLD}
+
+    def server_timing(self) -> str:
+        """Server-Timing 响应头"""
+        return f'db;dur={self.duration * 1000:.2f}, db-queries;desc="{self.count}", db-repeat;desc="{self.max_repeat()}"'
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("sql_request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None or context is None:
+        return
+    if SQL_STRICT and stats.budget is not None and stats.count >= stats.budget:
+        raise QueryBudgetExceeded(f"请求执行的 SQL 语句超过上限 {stats.budget}: {statement}")
+    context._sql_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "_sql_started", None)
+    if stats is None or started is None:
+        return
+    stats.count += 1
+    stats.duration += time.perf_counter() - started
+    # 绑定参数已是占位符，规范化空白后即为语句指纹
+    stats.statements[_WHITESPACE.sub(" ", statement).strip()] += 1
+
+
+def instrument_engine(target: Engine) -> None:
+    """为引擎注册统计事件（异步引擎传入其 sync_engine）"""
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+
+
+def query_budget(limit: Optional[int]) -> Callable:
+    """
+    设置路由的语句数上限，None 表示不限制（语句数随请求体增长的接口，如批量导入）
+
+    用法: `@router.get(..., dependencies=[Depends(query_budget(5))])`
+    """
+    def dependency() -> None:
+        stats = _current.get()
+        if stats is not None:
+            stats.budget = limit
+
+    return dependency
+
+
+class RouteStats:
+    """按路由汇总的 SQL 统计（线程安全）"""
+
+    def __init__(self):
+        self._routes: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, stats: RequestStats) -> None:
+        repeated = stats.repeated()
+        with self._lock:
+            entry = self._routes.setdefault(route, {
+                "requests": 0, "queries": 0, "db_ms": 0.0, "max_queries": 0,
+                "over_budget": 0, "n_plus_one": 0
+            })
+            entry["requests"] += 1
+            entry["queries"] += stats.count
+            entry["db_ms"] += stats.duration * 1000
+            entry["max_queries"] = max(entry["max_queries"], stats.count)
+            entry["over_budget"] += stats.over_budget()
+            entry["n_plus_one"] += bool(repeated)
+
+        if stats.over_budget():
+            logger.warning(f"{route} executed {stats.count} SQL statements (budget {stats.budget})")
+        for statement, count in repeated.items():
+            logger.warning(f"{route} executed the same SQL statement {count} times (possible N+1): {statement}")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """每个路由的请求数、语句数、数据库耗时及平均值"""
+        with self._lock:
+            return {
+                route: {
+                    **entry,
+                    "db_ms": round(entry["db_ms"], 2),
+                    "avg_queries": round(entry["queries"] / entry["requests"], 2),
+                    "avg_db_ms": round(entry["db_ms"] / entry["requests"], 2),
+                }
+                for route, entry in sorted(self._routes.items())
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+route_stats = RouteStats()
+
+
+class SQLInstrumentationMiddleware:
+    """为每个 HTTP 请求建立 SQL 统计，输出 Server-Timing 响应头并按路由汇总"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+
+        async def send_with_timing(message):
+            # 响应头发送时的统计（流式响应之后执行的语句只计入路由汇总）
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"server-timing", stats.server_timing().encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            # 路由匹配后 FastAPI 把路由写入 scope
+            route = scope.get("route")
+            if route is not None:
+                route_stats.record(f"{scope['method']} {getattr(route, 'path', route)}", stats)
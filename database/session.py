@@ -0,0 +1,116 @@
+"""
+接口使用的数据库访问句柄 - 同一套同步服务代码在同步或异步引擎上执行
+
+服务层（CameraService、QueryService 等）保持同步写法，接口通过 Database.run 调用：
+- 默认（同步引擎）：服务函数在线程池中执行，与原来的同步接口相同
+- DB_ASYNC 时：通过 AsyncSession.run_sync 在事件循环中执行，数据库 IO 由异步驱动完成，
+  等待数据库时不占用线程池，一个工作进程可以同时处理大量慢速客户端
+
+服务函数运行在 run_sync 内部，可以照常使用 Session（包括延迟加载）；返回之后只能访问已加载的属性。
+
+读写分离（配置 DATABASE_REPLICA_URLS 时）：
+- GET / HEAD 请求使用只读副本（轮询），写请求使用主库
+- 写请求的响应设置 Cookie，之后 DB_STICKY_SECONDS 秒内该客户端的读请求仍使用主库，
+  能读到自己刚写入的数据（副本同步有延迟）
+- 不通过 get_db 注入的 Response 返回结果的写接口（导入、导入任务）自行调用 mark_primary 设置 Cookie
+- 用 @not_sticky 标记的写接口（登录、刷新令牌）不写数据，使用主库但不设置 Cookie
+"""
+import itertools
+import os
+import time
+from typing import Any, AsyncIterator, Callable, List, TypeVar, Union
+
+from fastapi import Request, Response
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from database.engine import async_engine, async_replica_engines, engine, replica_engines
+
+T = TypeVar("T")
+F = TypeVar("F", bound=Callable[..., Any])
+
+# 写请求之后该客户端继续读主库的时间（秒）
+DB_STICKY_SECONDS = int(os.getenv("DB_STICKY_SECONDS", "5"))
+
+# 记录继续读主库截止时间的 Cookie
+STICKY_COOKIE = "db_primary_until"
+
+# 只读请求方法，可以使用副本
+READ_METHODS = ("GET", "HEAD")
+
+# 轮询选择副本
+_replica_counter = itertools.count()
+
+
+class Database:
+    """请求内的数据库访问句柄"""
+
+    def __init__(self, session: Union[Session, AsyncSession], replica: bool = False):
+        self.session = session
+        self.replica = replica  # 是否使用只读副本
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """执行服务函数 fn(session, *args, **kwargs)"""
+        if isinstance(self.session, AsyncSession):
+            return await self.session.run_sync(lambda session: fn(session, *args, **kwargs))
+        return await run_in_threadpool(fn, self.session, *args, **kwargs)
+
+
+def _sticky(request: Request) -> bool:
+    """客户端最近有过写请求，读请求仍需使用主库"""
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def not_sticky(endpoint: F) -> F:
+    """标记不写数据的写方法接口（如登录）：使用主库，但不让客户端之后的读请求固定到主库"""
+    endpoint.db_sticky = False
+    return endpoint
+
+
+def mark_primary(response: Response) -> None:
+    """写入之后设置 Cookie，DB_STICKY_SECONDS 秒内该客户端的读请求使用主库；未配置副本或已设置时不再设置"""
+    if not (replica_engines or async_replica_engines):
+        return
+    if any(value.startswith(f"{STICKY_COOKIE}=") for value in response.headers.getlist("set-cookie")):
+        return  # 同一响应已经设置过（例如 get_db 已按写请求设置）
+    response.set_cookie(
+        STICKY_COOKIE, f"{time.time() + DB_STICKY_SECONDS:.3f}",
+        max_age=DB_STICKY_SECONDS, httponly=True, samesite="lax"
+    )
+
+
+def _bind(request: Request, response: Response, primary: Union[Engine, AsyncEngine], replicas: List[Any]):
+    """选择本次请求使用的引擎，返回 (引擎, 是否为副本)"""
+    if not replicas:
+        return primary, False
+    if request.method not in READ_METHODS:
+        route = request.scope.get("route")
+        if getattr(getattr(route, "endpoint", None), "db_sticky", True):
+            mark_primary(response)
+        return primary, False
+    if _sticky(request):
+        return primary, False
+    return replicas[next(_replica_counter) % len(replicas)], True
+
+
+async def get_db(request: Request, response: Response) -> AsyncIterator[Database]:
+    """获取数据库访问句柄，由 DB_ASYNC 决定使用异步或同步引擎，由请求方法决定使用主库或副本"""
+    # 提交后不过期已加载的对象：响应序列化在服务函数之外（事件循环中）进行，不能再触发刷新
+    if async_engine is not None:
+        bind, replica = _bind(request, response, async_engine, async_replica_engines)
+        async with AsyncSession(bind, expire_on_commit=False) as session:
+            yield Database(session, replica)
+        return
+
+    bind, replica = _bind(request, response, engine, replica_engines)
+    session = Session(bind, expire_on_commit=False)
+    try:
+        yield Database(session, replica)
+    finally:
+        await run_in_threadpool(session.close)
@@ -10,8 +10,10 @@ from dotenv import load_dotenv
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
-from database.engine import engine, create_db_and_tables
+from database.engine import async_engine, async_replica_engines, engine, replica_engines, create_db_and_tables, describe_engine
 from utils.limiter import limiter
+from api.etag import NotModified, not_modified_handler
+from database.instrumentation import SQLInstrumentationMiddleware, route_stats
 
 # 加载环境变量
 load_dotenv()
@@ -19,10 +21,24 @@ load_dotenv()
 # 定义lifespan事件处理器
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # 输出数据库引擎配置
+    print(f"🗄️  数据库配置: {describe_engine(engine)}")
+    if async_engine is not None:
+        print(f"🗄️  异步引擎: {describe_engine(async_engine)}")
+    for replica in async_replica_engines or replica_engines:
+        print(f"🗄️  只读副本: {describe_engine(replica)}")
     # 启动时创建数据库表
     create_db_and_tables()
+    # 重新执行上次未完成的导入任务
+    from services.import_job_service import ImportJobService
+    ImportJobService.resume()
     yield
-    # 关闭时可以添加清理逻辑
+    # 关闭时停止导入任务线程池，排队中的任务下次启动时继续执行
+    ImportJobService.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
+    for replica in async_replica_engines:
+        await replica.dispose()
 
 # 创建FastAPI应用 - 禁用默认的Swagger UI和ReDoc
 app = FastAPI(
@@ -38,6 +54,9 @@ app = FastAPI(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# 条件请求命中时返回 304
+app.add_exception_handler(NotModified, not_modified_handler)
+
 # 添加CORS中间件
 app.add_middleware(
     CORSMiddleware,
@@ -47,6 +66,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 按请求统计 SQL 语句数和耗时（Server-Timing 响应头，/metrics/sql 查看按路由汇总）
+app.add_middleware(SQLInstrumentationMiddleware)
+
 # 挂载静态文件
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -70,6 +92,17 @@ def read_root():
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics/cache")
+def cache_metrics():
+    """查询结果缓存命中统计"""
+    from services.query_service import query_cache
+    return {"query": query_cache.stats()}
+
+@app.get("/metrics/sql")
+def sql_metrics():
+    """按路由汇总的 SQL 语句数、数据库耗时和疑似 N+1 次数"""
+    return route_stats.stats()
+
 # 自定义Swagger UI路由 - 禁用默认的Swagger UI
 @app.get("/docs", include_in_schema=False)
 async def custom_swagger_ui_html():
@@ -88,7 +121,7 @@ async def custom_swagger_ui_html():
     )
 
 # 导入API路由
-from api import auth, users, cameras, brands, mounts, lenses
+from api import auth, users, cameras, brands, mounts, lenses, imports
 
 # 注册路由
 app.include_router(auth.router, prefix="/api/v1", tags=["auth"])
@@ -97,6 +130,7 @@ app.include_router(cameras.router, prefix="/api/v1", tags=["cameras"])
 app.include_router(brands.router, prefix="/api/v1", tags=["brands"])
 app.include_router(lenses.router, prefix="/api/v1", tags=["lenses"])
 app.include_router(mounts.router, prefix="/api/v1", tags=["mounts"])
+app.include_router(imports.router, prefix="/api/v1", tags=["imports"])
 
 # 启动服务器
 if __name__ == "__main__":
@@ -5,5 +5,8 @@ from .camera import Camera
 from .lens import Lens
 from .mount import Mount
 from .brand_mount import BrandMount
+from .table_version import TableVersion
+from .import_job import ImportJob
+from .import_ledger import ImportLedger, ImportRowHash
 
-__all__ = ["BaseModel", "User", "Camera", "Brand", "Lens", "Mount", "BrandMount"]
\ No newline at end of file
+__all__ = ["BaseModel", "User", "Camera", "Brand", "Lens", "Mount", "BrandMount", "TableVersion", "ImportJob", "ImportLedger", "ImportRowHash"]
\ No newline at end of file
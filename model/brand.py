@@ -2,6 +2,7 @@ from model.base import BaseModel
 from sqlmodel import Field, Relationship
 from typing import Optional, List, TYPE_CHECKING
 from model.brand_mount import BrandMount
+from model.loading import NOLOAD
 
 if TYPE_CHECKING:
     from model.camera import Camera
@@ -23,13 +24,13 @@ class Brand(BaseModel, table=True):
     # 品牌类型（相机、镜头、配件等）
     brand_type: str = Field(default="camera", description="品牌类型: camera, lens, accessory")
     # 一对多关系：品牌拥有的相机
-    cameras: List["Camera"] = Relationship(back_populates="brand", sa_relationship_kwargs={"lazy": "selectin"})
+    cameras: List["Camera"] = Relationship(back_populates="brand", sa_relationship_kwargs=NOLOAD)
     
     # 一对多关系：品牌拥有的镜头
-    lenses: List["Lens"] = Relationship(back_populates="brand", sa_relationship_kwargs={"lazy": "selectin"})
+    lenses: List["Lens"] = Relationship(back_populates="brand", sa_relationship_kwargs=NOLOAD)
     
     # 多对多关系：品牌支持的卡口
-    mounts: List["Mount"] = Relationship(back_populates="brands", link_model=BrandMount, sa_relationship_kwargs={"lazy": "selectin"})
+    mounts: List["Mount"] = Relationship(back_populates="brands", link_model=BrandMount, sa_relationship_kwargs=NOLOAD)
     
     def __str__(self):
         return f"{self.name} ({self.country})" if self.country else self.name
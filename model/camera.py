@@ -2,6 +2,7 @@ from model.base import BaseModel
 from sqlmodel import Field, Relationship
 from typing import Optional, TYPE_CHECKING
 from enum import Enum
+from model.loading import RAISE_ON_SQL
 
 if TYPE_CHECKING:
     from model.brand import Brand
@@ -19,11 +20,11 @@ class SensorSize(str, Enum):
 class Camera(BaseModel, table=True):
     # 品牌关联
     brand_id: int = Field(foreign_key="brand.id", description="品牌外键")
-    brand: "Brand" = Relationship(back_populates="cameras", sa_relationship_kwargs={"lazy": "joined"})
+    brand: "Brand" = Relationship(back_populates="cameras", sa_relationship_kwargs=RAISE_ON_SQL)
     
     # 卡口
     mount_id: int = Field(foreign_key="mount.id", description="卡口外键")
-    mount: "Mount" = Relationship(back_populates="cameras", sa_relationship_kwargs={"lazy": "joined"})
+    mount: "Mount" = Relationship(back_populates="cameras", sa_relationship_kwargs=RAISE_ON_SQL)
     
     # 传感器尺寸
     sensor_size: Optional[SensorSize] = Field(default=None, description="传感器尺寸")
@@ -32,7 +33,7 @@ class Camera(BaseModel, table=True):
     series: Optional[str] = Field(default=None, description="产品系列")
     
     # 型号信息
-    model: str = Field(index=True, description="具体型号")
+    model: str = Field(index=True, unique=True, description="具体型号")
     
     # 像素
     megapixels: Optional[float] = Field(default=None, description="有效像素(百万)")
@@ -0,0 +1,110 @@
+from sqlmodel import Field, SQLModel, Column, JSON
+from typing import Optional, Dict, Any, List
+from enum import Enum
+from datetime import datetime
+
+from model.base import BaseModel
+
+
+class ImportJobStatus(str, Enum):
+    """导入任务状态"""
+    PENDING = "pending"        # 排队中
+    RUNNING = "running"        # 执行中
+    SUCCEEDED = "succeeded"    # 已完成
+    FAILED = "failed"          # 失败（文件无法读取、缺少必要列或执行出错）
+    CANCELLED = "cancelled"    # 已取消
+
+
+class ImportMode(str, Enum):
+    """导入模式，按唯一字段（品牌名称 / 型号）匹配已有数据"""
+    INSERT = "insert"              # 只新增，已存在的记录作为失败行
+    UPSERT = "upsert"              # 新增或更新
+    UPDATE_ONLY = "update_only"    # 只更新，不存在的记录作为失败行
+
+
+class ImportResults(str, Enum):
+    """同步导入返回逐行结果的方式"""
+    ALL = "all"                # 导入完成后返回全部行的结果
+    FAILURES = "failures"      # 导入完成后只返回汇总和失败的行
+    STREAM = "stream"          # 边导入边以 NDJSON 逐行返回结果，最后一行为汇总
+
+
+class ImportOptions(SQLModel):
+    """导入选项，后台任务中随任务一起保存"""
+    file_format: str = "xlsx"                # 文件格式：xlsx / csv / ndjson
+    mode: ImportMode = ImportMode.INSERT     # 导入模式
+    dry_run: bool = False                    # 只校验，不写入
+    force: bool = False                      # 忽略导入记录，相同文件也重新导入
+    skip_unchanged: bool = True              # upsert / update_only 模式下跳过与上次导入相比没有变化的行
+
+
+# 数据库表模型
+class ImportJob(BaseModel, table=True):
+    """后台导入任务，任务状态保存在数据库中，服务重启后未完成的任务会重新执行"""
+
+    __tablename__ = "import_job"
+
+    # 导入类型：brand / camera / lens
+    kind: str = Field(index=True, description="导入类型")
+
+    # 状态
+    status: ImportJobStatus = Field(default=ImportJobStatus.PENDING, index=True, description="任务状态")
+
+    # 上传的文件名和落盘路径
+    filename: Optional[str] = Field(default=None, description="上传的文件名")
+    file_path: str = Field(description="落盘文件路径")
+
+    # 导入选项（ImportOptions）
+    options: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON), description="导入选项")
+
+    # 提交任务的用户
+    created_by: Optional[int] = Field(default=None, foreign_key="user.id", description="提交用户ID")
+
+    # 进度（每批提交时随导入数据一起写入，任一进程都可以查询）
+    total_rows: Optional[int] = Field(default=None, description="预计总行数")
+    processed_rows: int = Field(default=0, description="已处理行数")
+    success_rows: int = Field(default=0, description="成功行数")
+    failure_rows: int = Field(default=0, description="失败行数")
+
+    # 断点：已提交的最后一行的行号，服务重启后从其后的行继续
+    checkpoint_row: int = Field(default=0, description="已提交的最后一行的行号")
+
+    # 取消请求：执行任务的进程在下一批提交前检查，任一进程都可以设置
+    cancel_requested: bool = Field(default=False, description="是否已请求取消")
+
+    # 执行任务的进程（主机名:进程号）及其心跳；心跳过期的执行中任务在服务启动时重新排队
+    owner: Optional[str] = Field(default=None, description="执行任务的进程")
+    heartbeat_at: Optional[datetime] = Field(default=None, description="最近一次心跳时间")
+
+    # 结果：summary、failures、unknown_names
+    message: Optional[str] = Field(default=None, description="结果说明")
+    result: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON), description="导入结果")
+
+    started_at: Optional[datetime] = Field(default=None, description="开始时间")
+    finished_at: Optional[datetime] = Field(default=None, description="结束时间")
+
+
+# 导入任务响应模型（API输出）
+class ImportJobResponse(SQLModel):
+    """导入任务响应模型 - 包含实时进度、速率和预计剩余时间"""
+    id: int
+    kind: str
+    status: ImportJobStatus
+    filename: Optional[str] = None
+    options: Optional[Dict[str, Any]] = None
+    total_rows: Optional[int] = None
+    processed_rows: int = 0
+    success_rows: int = 0
+    failure_rows: int = 0
+    checkpoint_row: int = 0
+    cancel_requested: bool = False
+    owner: Optional[str] = None
+    heartbeat_at: Optional[datetime] = None
+    rows_per_second: Optional[float] = None
+    eta_seconds: Optional[float] = None
+    errors: List[Dict[str, Any]] = []
+    message: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    create_time: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
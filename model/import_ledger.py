@@ -0,0 +1,41 @@
+from sqlmodel import Field, SQLModel, Column, JSON
+from typing import Optional, Dict, Any, List
+
+from model.base import BaseModel
+
+
+# 数据库表模型
+class ImportLedger(BaseModel, table=True):
+    """导入记录：每次成功导入的文件内容哈希和结果，相同文件再次上传时直接返回上次的结果"""
+
+    __tablename__ = "import_ledger"
+
+    # 导入类型：brand / camera / lens
+    kind: str = Field(index=True, description="导入类型")
+
+    # 导入模式（同一文件按不同模式导入的结果不同）
+    mode: str = Field(description="导入模式")
+
+    # 文件内容的 SHA-256
+    content_hash: str = Field(index=True, description="文件内容哈希")
+
+    # 导入完成时相关表的版本号，版本号变化后（数据已被修改）不再复用结果
+    versions: List[int] = Field(sa_column=Column(JSON, nullable=False), description="相关表版本号")
+
+    # 导入结果：summary、results（逐行结果）、unknown_names
+    result: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON), description="导入结果")
+
+
+class ImportRowHash(SQLModel, table=True):
+    """逐行哈希：每条记录最近一次导入时文件中提供的字段值的哈希，用于跳过未变化的行"""
+
+    __tablename__ = "import_row_hash"
+
+    # 导入类型
+    kind: str = Field(primary_key=True, description="导入类型")
+
+    # 唯一字段值（品牌名称 / 型号）
+    key: str = Field(primary_key=True, description="唯一字段值")
+
+    # 行哈希
+    row_hash: str = Field(description="行哈希")
@@ -2,6 +2,7 @@ from model.base import BaseModel
 from sqlmodel import Field, Relationship
 from typing import Optional, TYPE_CHECKING
 from enum import Enum
+from model.loading import RAISE_ON_SQL
 
 if TYPE_CHECKING:
     from model.brand import Brand
@@ -17,17 +18,35 @@ class FocusType(str, Enum):
     AUTO = "auto"      # 自动对焦
     MANUAL = "manual"   # 手动对焦
 
+def derive_lens_fields(data: dict) -> dict:
+    """根据焦距和光圈自动判断镜头类型和是否恒定光圈（直接修改并返回 data，批量导入时也使用）"""
+    # 自动判断镜头类型
+    if 'min_focal_length' in data and 'max_focal_length' in data:
+        if data['min_focal_length'] == data['max_focal_length']:
+            data['lens_type'] = LensType.PRIME
+        else:
+            data['lens_type'] = LensType.ZOOM
+            
+    # 自动判断是否恒定光圈
+    if 'max_aperture_min' in data and 'max_aperture_max' in data:
+        if data['max_aperture_min'] == data['max_aperture_max']:
+            data['is_constant_aperture'] = True
+        else:
+            data['is_constant_aperture'] = False
+    
+    return data
+
 class Lens(BaseModel, table=True):
     # 品牌关联
     brand_id: int = Field(foreign_key="brand.id", description="品牌外键")
-    brand: "Brand" = Relationship(back_populates="lenses", sa_relationship_kwargs={"lazy": "joined"})
+    brand: "Brand" = Relationship(back_populates="lenses", sa_relationship_kwargs=RAISE_ON_SQL)
     
     # 卡口关联
     mount_id: int = Field(foreign_key="mount.id", description="卡口外键")
-    mount: "Mount" = Relationship(back_populates="lenses", sa_relationship_kwargs={"lazy": "joined"})
+    mount: "Mount" = Relationship(back_populates="lenses", sa_relationship_kwargs=RAISE_ON_SQL)
     
     # 型号信息
-    model: str = Field(index=True, description="镜头型号")
+    model: str = Field(index=True, unique=True, description="镜头型号")
     
     # 系列
     series: Optional[str] = Field(default=None, description="镜头系列")
@@ -73,26 +92,13 @@ class Lens(BaseModel, table=True):
     description: Optional[str] = Field(default=None, description="备注说明")
         
     def __init__(self, **kwargs):
-        # 自动判断镜头类型
-        if 'min_focal_length' in kwargs and 'max_focal_length' in kwargs:
-            if kwargs['min_focal_length'] == kwargs['max_focal_length']:
-                kwargs['lens_type'] = LensType.PRIME
-            else:
-                kwargs['lens_type'] = LensType.ZOOM
-                
-        # 自动判断是否恒定光圈
-        if 'max_aperture_min' in kwargs and 'max_aperture_max' in kwargs:
-            if kwargs['max_aperture_min'] == kwargs['max_aperture_max']:
-                kwargs['is_constant_aperture'] = True
-            else:
-                kwargs['is_constant_aperture'] = False
-                
-        super().__init__(**kwargs)
+        super().__init__(**derive_lens_fields(kwargs))
         
     def __str__(self):
         focal_range = f"{self.min_focal_length}mm" if self.lens_type == LensType.PRIME else f"{self.min_focal_length}-{self.max_focal_length}mm"
         aperture = f"f/{self.max_aperture_min}" if self.is_constant_aperture else f"f/{self.max_aperture_min}-{self.max_aperture_max}"
-        brand_name = getattr(getattr(self, 'brand', None), 'name', None) or "未知品牌"
+        # 品牌关系默认不加载，只在已加载时使用品牌名称
+        brand_name = getattr(self.__dict__.get('brand'), 'name', None) or "未知品牌"
         return f"{brand_name} {self.model} {focal_range} {aperture}"
 
 
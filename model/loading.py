@@ -0,0 +1,16 @@
+"""
+关系加载策略
+
+模型上的关系默认不自动加载：
+- 集合关系（品牌的相机/镜头/卡口、卡口的相机/镜头/品牌）使用 noload，访问时返回空列表
+- 多对一关系（相机/镜头的品牌和卡口）使用 raise_on_sql，未显式加载时访问会抛出异常
+
+需要关联数据的查询通过 selectinload / joinedload 等 loader options 显式加载。
+"""
+
+# 集合关系默认策略
+NOLOAD = {"lazy": "noload"}
+
+# 多对一关系默认策略
+RAISE_ON_SQL = {"lazy": "raise_on_sql"}
+
@@ -2,6 +2,7 @@ from model.base import BaseModel
 from sqlmodel import Field, Relationship
 from typing import Optional, List, TYPE_CHECKING
 from model.brand_mount import BrandMount
+from model.loading import NOLOAD
 
 if TYPE_CHECKING:
     from model.camera import Camera
@@ -10,7 +11,7 @@ if TYPE_CHECKING:
 
 class Mount(BaseModel, table=True):
     # 卡口基本信息
-    name: str = Field(index=True, description="卡口名称")
+    name: str = Field(index=True, unique=True, description="卡口名称")
     
     # 技术参数
     flange_distance: Optional[float] = Field(default=None, description="法兰距(mm)")
@@ -25,20 +26,17 @@ class Mount(BaseModel, table=True):
     description: Optional[str] = Field(default=None, description="备注说明")
     
     # 一对多关系：使用该卡口的相机
-    cameras: List["Camera"] = Relationship(back_populates="mount", sa_relationship_kwargs={"lazy": "selectin"})
+    cameras: List["Camera"] = Relationship(back_populates="mount", sa_relationship_kwargs=NOLOAD)
     
     # 一对多关系：使用该卡口的镜头
-    lenses: List["Lens"] = Relationship(back_populates="mount", sa_relationship_kwargs={"lazy": "selectin"})
+    lenses: List["Lens"] = Relationship(back_populates="mount", sa_relationship_kwargs=NOLOAD)
     
     # 多对多关系：支持该卡口的品牌
-    brands: List["Brand"] = Relationship(back_populates="mounts", link_model=BrandMount, sa_relationship_kwargs={"lazy": "selectin"})
+    brands: List["Brand"] = Relationship(back_populates="mounts", link_model=BrandMount, sa_relationship_kwargs=NOLOAD)
 
     def __str__(self):
-        if self.brands:
-            brand_names = ", ".join([brand.name for brand in self.brands])
-        else:
-            brand_names = "未知品牌"
-        return f"{self.name} ({brand_names})"
+        # 品牌关系默认不加载（noload 时为空列表），不在这里使用
+        return self.name
 
 
 # 卡口数据模型类
@@ -25,6 +25,13 @@ class SortOrder(str, Enum):
     DESC = "desc"  # 降序
 
 
+class CountMode(str, Enum):
+    """总数统计方式"""
+    EXACT = "exact"        # 精确统计（与数据在同一条语句中返回）
+    ESTIMATE = "estimate"  # 使用按过滤条件缓存的统计结果
+    NONE = "none"          # 不统计总数，只返回 has_more
+
+
 class FilterCondition(BaseModel):
     """单个过滤条件"""
     field: str = Field(..., description="字段名")
@@ -43,6 +50,8 @@ class BaseQueryParams(BaseModel):
     # 分页参数
     skip: int = Field(0, ge=0, description="跳过的记录数")
     limit: int = Field(100, ge=1, le=1000, description="返回记录数")
+    cursor: Optional[str] = Field(None, description="分页游标（上一页返回的 next_cursor），提供时忽略 skip")
+    count: CountMode = Field(CountMode.EXACT, description="总数统计方式: exact/estimate/none")
     
     # 排序参数
     sort_by: Optional[str] = Field(None, description="排序字段")
@@ -57,6 +66,9 @@ class BaseQueryParams(BaseModel):
     
     # 是否只返回活跃记录
     is_active: Optional[bool] = Field(None, description="是否只返回活跃记录")
+    
+    # 分面统计
+    facets: Optional[List[str]] = Field(None, description="需要统计的分面列表")
 
 
 class CameraQueryParams(BaseQueryParams):
@@ -154,7 +166,9 @@ class LensQueryParams(BaseQueryParams):
 class QueryResponse(BaseModel):
     """查询响应模型"""
     data: List[Dict[str, Any]]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
-    has_more: bool
\ No newline at end of file
+    has_more: bool
+    next_cursor: Optional[str] = None
+    facets: Optional[Dict[str, Any]] = None
\ No newline at end of file
@@ -0,0 +1,13 @@
+from sqlmodel import Field, SQLModel
+
+
+class TableVersion(SQLModel, table=True):
+    """数据表版本号，写入相机/镜头/品牌/卡口数据时递增，用于使查询结果缓存失效"""
+    
+    __tablename__ = "table_version"
+    
+    # 表名
+    name: str = Field(primary_key=True, description="表名")
+    
+    # 版本号
+    version: int = Field(default=0, description="版本号")
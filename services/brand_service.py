@@ -1,9 +1,11 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from sqlmodel import Session, select
 from fastapi import HTTPException, status
 
-from model.brand import Brand
+from model.brand import Brand, BrandResponse
+from services.projection import select_columns, fetch_rows
 from services.validation_service import ValidationService
+from services.version_service import VersionService
 
 
 class BrandService:
@@ -22,6 +24,7 @@ class BrandService:
         # 创建品牌对象
         brand = Brand(**brand_data)
         session.add(brand)
+        VersionService.bump(session, "brand")
         session.commit()
         session.refresh(brand)
         return brand
@@ -46,6 +49,25 @@ class BrandService:
         brands = session.exec(query.offset(skip).limit(limit)).all()
         return brands
 
+    @staticmethod
+    def get_brand_rows(
+        session: Session, 
+        skip: int = 0, 
+        limit: int = 100, 
+        is_active: Optional[bool] = None,
+        brand_type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """获取品牌列表（投影模式，只查询 BrandResponse 需要的列并返回字典）"""
+        query = select_columns(Brand, BrandResponse)
+        
+        if is_active is not None:
+            query = query.where(Brand.is_active == is_active)
+        
+        if brand_type:
+            query = query.where(Brand.brand_type == brand_type)
+        
+        return fetch_rows(session, query.offset(skip).limit(limit))
+
     @staticmethod
     def get_brand_by_id(session: Session, brand_id: int) -> Brand:
         """根据ID获取品牌"""
@@ -74,6 +96,7 @@ class BrandService:
             setattr(brand, key, value)
         
         session.add(brand)
+        VersionService.bump(session, "brand")
         session.commit()
         session.refresh(brand)
         return brand
@@ -93,6 +116,7 @@ class BrandService:
             )
         
         session.delete(brand)
+        VersionService.bump(session, "brand")
         session.commit()
         return {"message": "品牌删除成功"}
 
@@ -103,6 +127,7 @@ class BrandService:
         
         brand.is_active = is_active
         session.add(brand)
+        VersionService.bump(session, "brand")
         session.commit()
         
         action = "激活" if is_active else "停用"
@@ -0,0 +1,215 @@
+"""
+离线批量加载服务 - 不经过 HTTP 接口，直接把 CSV / NDJSON / Excel 文件写入数据库
+
+用于新建数据库或重建测试数据库。按依赖顺序（品牌、卡口、品牌-卡口关联、相机、镜头）加载，
+映射和校验与导入接口相同（import_mapping，整批按列计算，可使用多进程），写入使用
+executemany。整个加载在一个连接、一个事务中完成，出错时数据库保持原样：
+
+- SQLite 在加载期间使用 synchronous=OFF、journal_mode=MEMORY，结束后恢复
+- 目标表的二级索引（含唯一索引）和全文索引触发器先删除，全部写入后再重建，之后执行 ANALYZE
+- 唯一字段在开始前一次性读入内存去重，不依赖索引查询
+"""
+import os
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import insert, text
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import Session, select
+
+from database.fts import FTS_TABLES, fts_statements
+from model.brand import Brand
+from model.mount import Mount
+from services.import_mapping import (
+    BRAND_MOUNT_SPEC, BRAND_SPEC, CAMERA_SPEC, LENS_SPEC, MOUNT_SPEC,
+    ImportSpec, NameIndex, canonical_columns, fill_defaults
+)
+from services.import_service import IMPORT_FORMATS, ImportService
+from services.version_service import VersionService
+
+# 批量加载时每批的行数（比导入接口大，减少 executemany 次数）
+BULK_CHUNK_SIZE = 5000
+
+# 加载期间的 SQLite 设置，结束后恢复原值
+SQLITE_LOAD_PRAGMAS = {"synchronous": "OFF", "journal_mode": "MEMORY"}
+
+# 输出进度：(数据类型, 信息)
+Reporter = Callable[[str, str], None]
+
+# 输出失败行：(数据类型, 失败结果)
+FailureReporter = Callable[[str, Dict[str, Any]], None]
+
+
+class LoadTarget(NamedTuple):
+    """批量加载的数据类型"""
+    name: str                       # 数据类型（命令行参数名）
+    spec: ImportSpec                # 映射和校验配置
+    key_fields: Tuple[str, ...]     # 去重字段
+
+
+# 按依赖顺序排列
+LOAD_TARGETS = [
+    LoadTarget("brands", BRAND_SPEC, ("name",)),
+    LoadTarget("mounts", MOUNT_SPEC, ("name",)),
+    LoadTarget("brand_mounts", BRAND_MOUNT_SPEC, ("brand_id", "mount_id")),
+    LoadTarget("cameras", CAMERA_SPEC, ("model",)),
+    LoadTarget("lenses", LENS_SPEC, ("model",)),
+]
+
+# 文件扩展名 -> 文件格式
+LOAD_EXTENSIONS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".xlsx": "xlsx"}
+
+
+class BulkLoadService:
+    """离线批量加载服务类"""
+
+    @staticmethod
+    def _set_pragmas(connection: Connection, pragmas: Dict[str, str]) -> Dict[str, str]:
+        """在事务外设置 SQLite pragma（journal_mode 不能在事务中修改），返回原值"""
+        dbapi_connection = connection.connection.dbapi_connection
+        previous = {}
+        for name, value in pragmas.items():
+            previous[name] = str(dbapi_connection.execute(f"PRAGMA {name}").fetchone()[0])
+            dbapi_connection.execute(f"PRAGMA {name}={value}")
+        return previous
+
+    @staticmethod
+    def _drop_indexes(connection: Connection, tables: List[str]) -> List[Any]:
+        """删除目标表的二级索引和全文索引触发器，返回需要重建的索引"""
+        indexes = []
+        for target in LOAD_TARGETS:
+            table = target.spec.model.__table__
+            if table.name not in tables:
+                continue
+            for index in table.indexes:
+                index.drop(connection, checkfirst=True)
+                indexes.append(index)
+            if connection.dialect.name == "sqlite" and table.name in FTS_TABLES:
+                fts_table = FTS_TABLES[table.name]
+                for suffix in ("ai", "ad", "au"):
+                    connection.execute(text(f"DROP TRIGGER IF EXISTS {fts_table}_{suffix}"))
+        return indexes
+
+    @staticmethod
+    def _rebuild_indexes(connection: Connection, tables: List[str], indexes: List[Any]) -> None:
+        """重建二级索引，恢复全文索引触发器并从原表重建全文索引"""
+        for index in indexes:
+            index.create(connection)
+        if connection.dialect.name != "sqlite":
+            return
+        for table, fts_table in FTS_TABLES.items():
+            if table in tables:
+                for statement in fts_statements(table, fts_table):
+                    connection.execute(text(statement))
+                connection.execute(text(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"))
+
+    @staticmethod
+    def _existing_keys(session: Session, target: LoadTarget) -> Set[Tuple[Any, ...]]:
+        """表中已有的去重字段值，一次读入内存"""
+        columns = [getattr(target.spec.model, field) for field in target.key_fields]
+        return {tuple(row) for row in session.connection().execute(select(*columns)).all()}
+
+    @staticmethod
+    def _load_file(
+        session: Session,
+        target: LoadTarget,
+        path: str,
+        file_format: str,
+        indexes: Optional[Dict[str, NameIndex]],
+        report: Reporter,
+        report_failure: Optional[FailureReporter] = None
+    ) -> Dict[str, int]:
+        """加载一个文件，返回 {total, inserted, failure}"""
+        spec = target.spec
+        table = spec.model.__table__
+        keys = BulkLoadService._existing_keys(session, target)
+        total, inserted_count, failure = 0, 0, 0
+        with open(path, "rb") as file:
+            chunks = (canonical_columns(chunk, spec) for chunk in ImportService._iter_chunks(file, file_format, BULK_CHUNK_SIZE))
+            for size, fields, rows, failures in ImportService._map_chunks(chunks, spec, indexes):
+                total += size
+                rows, required_failures = ImportService._check_required(spec, fields, rows)
+                rows = fill_defaults(spec, rows)
+                failures.extend(required_failures)
+
+                # 文件内重复或表中已存在的行跳过
+                accepted = []
+                for row_num, item, values in rows:
+                    key = tuple(values[field] for field in target.key_fields)
+                    if key in keys:
+                        failures.append({"row": row_num, "item": item, "status": "failure", "message": spec.duplicate_message})
+                    else:
+                        keys.add(key)
+                        accepted.append((row_num, item, values))
+
+                inserted, write_failures = ImportService._write_chunk(session, insert(table), accepted)
+                failures.extend(write_failures)
+                inserted_count += len(inserted)
+                failure += len(failures)
+                if report_failure:
+                    for result in sorted(failures, key=lambda result: result["row"]):
+                        report_failure(target.name, result)
+                report(target.name, f"已处理 {total} 行，写入 {inserted_count} 行，失败 {failure} 行")
+        return {"total": total, "inserted": inserted_count, "failure": failure}
+
+    @staticmethod
+    def load(
+        engine: Engine,
+        files: Dict[str, str],
+        report: Reporter,
+        report_failure: Optional[FailureReporter] = None
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        按依赖顺序加载文件
+
+        Args:
+            engine: 数据库引擎
+            files: 数据类型（LOAD_TARGETS 中的 name） -> 文件路径，格式按扩展名识别
+            report: 进度输出
+            report_failure: 失败行输出（不提供时只计数）
+
+        Returns:
+            数据类型 -> {total, inserted, failure}
+        """
+        targets = [target for target in LOAD_TARGETS if target.name in files]
+        tables = [target.spec.model.__tablename__ for target in targets]
+        formats = {}
+        for target in targets:
+            extension = os.path.splitext(files[target.name])[1].lower()
+            if extension not in LOAD_EXTENSIONS:
+                raise ValueError(f"不支持的文件格式: {files[target.name]}")
+            formats[target.name] = LOAD_EXTENSIONS[extension]
+
+        summary = {}
+        with engine.connect() as connection:
+            sqlite = connection.dialect.name == "sqlite"
+            previous = BulkLoadService._set_pragmas(connection, SQLITE_LOAD_PRAGMAS) if sqlite else {}
+            try:
+                with Session(bind=connection) as session:
+                    dropped = BulkLoadService._drop_indexes(session.connection(), tables)
+
+                    indexes = None
+                    for target in targets:
+                        # 品牌和卡口加载完成后再建立名称索引
+                        if target.spec.resolve_relations and indexes is None:
+                            indexes = {
+                                "brand": NameIndex(session.exec(select(Brand.name, Brand.id)).all()),
+                                "mount": NameIndex(session.exec(select(Mount.name, Mount.id)).all()),
+                            }
+                        label = IMPORT_FORMATS[formats[target.name]]
+                        report(target.name, f"开始加载 {files[target.name]}（{label}）")
+                        summary[target.name] = BulkLoadService._load_file(
+                            session, target, files[target.name], formats[target.name], indexes, report, report_failure
+                        )
+
+                    report("", "重建索引")
+                    BulkLoadService._rebuild_indexes(session.connection(), tables, dropped)
+                    VersionService.bump(session, *tables)
+                    session.commit()
+            finally:
+                if previous:
+                    BulkLoadService._set_pragmas(connection, previous)
+
+            report("", "更新统计信息（ANALYZE）")
+            connection.execute(text("ANALYZE"))
+            connection.commit()
+        return summary
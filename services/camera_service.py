@@ -2,10 +2,12 @@ from typing import List, Optional, Dict, Any
 from fastapi import HTTPException, status
 from sqlmodel import Session, select
 
-from model.camera import Camera, SensorSize
+from model.camera import Camera, CameraResponse, SensorSize
 from model.brand import Brand
 from model.mount import Mount
+from services.projection import select_columns, fetch_rows
 from services.validation_service import ValidationService
+from services.version_service import VersionService
 
 
 class CameraService:
@@ -29,23 +31,20 @@ class CameraService:
         
         camera = Camera(**camera_data)
         session.add(camera)
+        VersionService.bump(session, "camera")
         session.commit()
         session.refresh(camera)
         return camera
     
     @staticmethod
-    def get_cameras(
-        session: Session, 
-        skip: int = 0, 
-        limit: int = 100, 
+    def _apply_list_filters(
+        query,
         is_active: Optional[bool] = None,
         brand_id: Optional[int] = None,
         mount_id: Optional[int] = None,
         sensor_size: Optional[SensorSize] = None
-    ) -> List[Camera]:
-        """获取相机列表"""
-        query = select(Camera)
-        
+    ):
+        """应用相机列表的过滤条件"""
         if is_active is not None:
             query = query.where(Camera.is_active == is_active)
         
@@ -58,9 +57,40 @@ class CameraService:
         if sensor_size is not None:
             query = query.where(Camera.sensor_size == sensor_size)
         
+        return query
+    
+    @staticmethod
+    def get_cameras(
+        session: Session, 
+        skip: int = 0, 
+        limit: int = 100, 
+        is_active: Optional[bool] = None,
+        brand_id: Optional[int] = None,
+        mount_id: Optional[int] = None,
+        sensor_size: Optional[SensorSize] = None
+    ) -> List[Camera]:
+        """获取相机列表"""
+        query = CameraService._apply_list_filters(select(Camera), is_active, brand_id, mount_id, sensor_size)
+        
         cameras = session.exec(query.offset(skip).limit(limit)).all()
         return cameras
     
+    @staticmethod
+    def get_camera_rows(
+        session: Session, 
+        skip: int = 0, 
+        limit: int = 100, 
+        is_active: Optional[bool] = None,
+        brand_id: Optional[int] = None,
+        mount_id: Optional[int] = None,
+        sensor_size: Optional[SensorSize] = None
+    ) -> List[Dict[str, Any]]:
+        """获取相机列表（投影模式，只查询 CameraResponse 需要的列并返回字典）"""
+        query = select_columns(Camera, CameraResponse)
+        query = CameraService._apply_list_filters(query, is_active, brand_id, mount_id, sensor_size)
+        
+        return fetch_rows(session, query.offset(skip).limit(limit))
+    
     @staticmethod
     def get_camera_by_id(session: Session, camera_id: int) -> Camera:
         """根据ID获取相机"""
@@ -97,6 +127,7 @@ class CameraService:
             setattr(camera, key, value)
         
         session.add(camera)
+        VersionService.bump(session, "camera")
         session.commit()
         session.refresh(camera)
         return camera
@@ -107,6 +138,7 @@ class CameraService:
         camera = ValidationService.validate_camera_exists(session, camera_id)
         
         session.delete(camera)
+        VersionService.bump(session, "camera")
         session.commit()
         return {"message": "相机删除成功"}
     
@@ -117,6 +149,7 @@ class CameraService:
         
         camera.is_active = is_active
         session.add(camera)
+        VersionService.bump(session, "camera")
         session.commit()
         
         action = "激活" if is_active else "停用"
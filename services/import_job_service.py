@@ -0,0 +1,379 @@
+"""
+后台导入任务服务
+
+上传内容先落盘到 IMPORT_SPOOL_DIR，任务记录写入 import_job 表后立即返回，
+由固定大小的线程池（IMPORT_WORKERS）依次执行。
+
+任务逐批提交：每批写入后在同一事务中把进度、失败行和断点（最后一行的行号）写入 import_job，
+批与批之间不持有写锁，接口的写入不会被长时间阻塞。进度和取消请求都保存在数据库中，
+多进程部署时任一进程都可以查询进度、取消任务。取消或失败时只回滚当前批次，之前的批次已经提交。
+
+执行任务的进程把自己（主机名:进程号）记录在任务上，并定期更新心跳。服务启动时排队中的任务、
+以及心跳已过期（执行进程已退出）的执行中任务从断点继续执行；其他进程仍在执行的任务不受影响。
+"""
+import os
+import shutil
+import socket
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, BinaryIO, Dict, List, Optional, Set
+from uuid import uuid4
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, or_, update
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, select
+
+from database.engine import engine, write_engine
+from model.import_job import ImportJob, ImportJobResponse, ImportJobStatus, ImportOptions, ImportResults
+from services.import_mapping import IMPORT_SPECS
+from services.import_service import IMPORT_FORMATS, ImportCancelled, ImportService
+
+logger = logging.getLogger(__name__)
+
+# 上传文件落盘目录
+IMPORT_SPOOL_DIR = os.getenv("IMPORT_SPOOL_DIR", os.path.join("data", "imports"))
+
+# 同时执行的导入任务数
+IMPORT_WORKERS = int(os.getenv("IMPORT_WORKERS", "2"))
+
+# 任务进度中保留的错误条数
+IMPORT_JOB_ERROR_LIMIT = int(os.getenv("IMPORT_JOB_ERROR_LIMIT", "100"))
+
+# 任务结果中保存的失败行数（每批随进度一起写入）
+IMPORT_JOB_FAILURE_LIMIT = int(os.getenv("IMPORT_JOB_FAILURE_LIMIT", "1000"))
+
+# 执行中任务的心跳间隔（秒）
+IMPORT_JOB_HEARTBEAT_SECONDS = float(os.getenv("IMPORT_JOB_HEARTBEAT_SECONDS", "10"))
+
+# 心跳超过该秒数未更新的执行中任务视为执行进程已退出，服务启动时重新排队
+IMPORT_JOB_STALE_SECONDS = float(os.getenv("IMPORT_JOB_STALE_SECONDS", "60"))
+
+# 进度中随每批更新的汇总字段
+SUMMARY_FIELDS = ("total", "success", "failure", "inserted", "updated", "unchanged")
+
+FINISHED_STATUSES = (ImportJobStatus.SUCCEEDED, ImportJobStatus.FAILED, ImportJobStatus.CANCELLED)
+
+
+def _worker_id() -> str:
+    """当前进程的标识（多进程部署时每个工作进程不同）"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class ImportJobLost(Exception):
+    """任务已被其他进程接管（本进程心跳过期后被重新排队），本进程停止执行且不再修改任务记录"""
+
+
+class JobCheckpoint:
+    """任务的逐批断点：每批提交前检查取消请求和任务归属，并把累计进度、失败行、断点和心跳写入任务记录"""
+
+    def __init__(self, job: ImportJob):
+        self.job_id = job.id
+        self.owner = job.owner
+        # 从断点继续时在已提交的进度上累加
+        result = job.result or {}
+        self.base = {field: result.get("summary", {}).get(field, 0) for field in SUMMARY_FIELDS}
+        self.failures: List[Dict[str, Any]] = list(result.get("failures", []))
+        self.summary = dict(self.base)
+
+    def save(self, session: Session, last_row: int, summary: Dict[str, int], failures: List[Dict[str, Any]]) -> None:
+        """ChunkCheckpoint 回调：取消时抛出 ImportCancelled，任务已被其他进程接管时抛出 ImportJobLost，当前批次随之回滚"""
+        cancel_requested, owner = session.exec(
+            select(ImportJob.cancel_requested, ImportJob.owner).where(ImportJob.id == self.job_id)
+        ).one()
+        if owner != self.owner:
+            raise ImportJobLost()
+        if cancel_requested:
+            raise ImportCancelled()
+        self.summary = {field: self.base[field] + summary[field] for field in SUMMARY_FIELDS}
+        room = IMPORT_JOB_FAILURE_LIMIT - len(self.failures)
+        if room > 0:
+            self.failures.extend(failures[:room])
+        session.exec(
+            update(ImportJob)
+            .where(ImportJob.id == self.job_id)
+            .values(
+                checkpoint_row=last_row,
+                processed_rows=self.summary["total"],
+                success_rows=self.summary["success"],
+                failure_rows=self.summary["failure"],
+                result={"summary": self.summary, "failures": self.failures},
+                heartbeat_at=datetime.now(),
+            )
+        )
+
+
+class ImportJobService:
+    """后台导入任务服务类"""
+
+    _executor: Optional[ThreadPoolExecutor] = None
+    _lock = threading.Lock()
+
+    # 本进程正在执行的任务，由心跳线程定期更新心跳
+    _running: Set[int] = set()
+    _heartbeat_stop: Optional[threading.Event] = None
+
+    @staticmethod
+    def _get_executor() -> ThreadPoolExecutor:
+        with ImportJobService._lock:
+            if ImportJobService._executor is None:
+                ImportJobService._executor = ThreadPoolExecutor(max_workers=IMPORT_WORKERS, thread_name_prefix="import-job")
+                ImportJobService._heartbeat_stop = threading.Event()
+                threading.Thread(
+                    target=ImportJobService._heartbeat, args=(ImportJobService._heartbeat_stop,),
+                    name="import-job-heartbeat", daemon=True
+                ).start()
+            return ImportJobService._executor
+
+    @staticmethod
+    def _heartbeat(stop: threading.Event) -> None:
+        """定期更新本进程执行中任务的心跳；导入批次占用写锁超过忙等待时间时本次跳过，下次再试"""
+        owner = _worker_id()
+        while not stop.wait(IMPORT_JOB_HEARTBEAT_SECONDS):
+            with ImportJobService._lock:
+                job_ids = list(ImportJobService._running)
+            if not job_ids:
+                continue
+            try:
+                with Session(write_engine) as session:
+                    session.exec(
+                        update(ImportJob)
+                        .where(ImportJob.id.in_(job_ids), ImportJob.owner == owner, ImportJob.status == ImportJobStatus.RUNNING)
+                        .values(heartbeat_at=datetime.now())
+                    )
+                    session.commit()
+            except OperationalError as e:
+                logger.warning(f"Import job heartbeat failed: {e}")
+
+    @staticmethod
+    def submit(
+        session: Session,
+        kind: str,
+        file: BinaryIO,
+        filename: Optional[str] = None,
+        options: Optional[ImportOptions] = None,
+        user_id: Optional[int] = None
+    ) -> ImportJob:
+        """
+        把上传内容落盘并创建导入任务，立即返回
+
+        请求会话中的读事务先结束，任务记录在新的写事务中创建：SQLite 下未结束的读事务
+        会阻塞提交，已读取过数据的事务在其他导入进行时也无法再升级为写事务。
+        """
+        if kind not in IMPORT_SPECS:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"不支持的导入类型: {kind}")
+        options = options or ImportOptions()
+
+        # 落盘文件的扩展名即文件格式
+        os.makedirs(IMPORT_SPOOL_DIR, exist_ok=True)
+        file_path = os.path.join(IMPORT_SPOOL_DIR, f"{uuid4().hex}.{options.file_format}")
+        with open(file_path, "wb") as spool:
+            shutil.copyfileobj(file, spool)
+
+        job = ImportJob(
+            kind=kind, filename=filename, file_path=file_path,
+            options=options.model_dump(mode="json"), created_by=user_id
+        )
+        session.rollback()
+        session.connection(execution_options={"sqlite_begin": "IMMEDIATE"})
+        session.add(job)
+        session.commit()
+        session.refresh(job)
+
+        ImportJobService._get_executor().submit(ImportJobService._run, job.id)
+        return job
+
+    @staticmethod
+    def resume() -> int:
+        """
+        服务启动时重新排队未完成的任务，返回任务数
+
+        只有心跳已超过 IMPORT_JOB_STALE_SECONDS 的执行中任务（执行进程已退出）改回排队中，
+        从断点继续并保留开始时间；其他工作进程仍在执行的任务不受影响。
+        排队中的任务可能同时被多个进程提交，执行前按状态条件认领，只会执行一次。
+        """
+        cutoff = datetime.now() - timedelta(seconds=IMPORT_JOB_STALE_SECONDS)
+        with Session(write_engine) as session:
+            session.exec(
+                update(ImportJob)
+                .where(
+                    ImportJob.status == ImportJobStatus.RUNNING,
+                    or_(ImportJob.heartbeat_at.is_(None), ImportJob.heartbeat_at < cutoff)
+                )
+                .values(status=ImportJobStatus.PENDING, owner=None)
+            )
+            job_ids = list(session.exec(
+                select(ImportJob.id).where(ImportJob.status == ImportJobStatus.PENDING).order_by(ImportJob.id)
+            ).all())
+            session.commit()
+
+        for job_id in job_ids:
+            ImportJobService._get_executor().submit(ImportJobService._run, job_id)
+        if job_ids:
+            logger.info(f"Resumed {len(job_ids)} import job(s)")
+        return len(job_ids)
+
+    @staticmethod
+    def shutdown() -> None:
+        """停止接收新任务，排队中的任务保留在数据库中，下次启动时继续执行"""
+        with ImportJobService._lock:
+            if ImportJobService._executor is not None:
+                ImportJobService._executor.shutdown(wait=False, cancel_futures=True)
+                ImportJobService._executor = None
+                ImportJobService._heartbeat_stop.set()
+
+    @staticmethod
+    def _run(job_id: int) -> None:
+        """执行一个导入任务，从任务记录中的断点继续"""
+        owner = _worker_id()
+        with Session(write_engine) as session:
+            # 条件更新认领任务，避免与取消操作及其他进程竞争
+            claimed = session.exec(
+                update(ImportJob)
+                .where(ImportJob.id == job_id, ImportJob.status == ImportJobStatus.PENDING)
+                .values(
+                    status=ImportJobStatus.RUNNING, owner=owner, heartbeat_at=datetime.now(),
+                    started_at=func.coalesce(ImportJob.started_at, datetime.now())
+                )
+            ).rowcount
+            session.commit()
+            if not claimed:
+                return
+            job = session.get(ImportJob, job_id)
+            kind, file_path, start_after = job.kind, job.file_path, job.checkpoint_row
+            checkpoint = JobCheckpoint(job)
+            # 早期任务没有保存选项，文件格式取落盘文件的扩展名
+            options = ImportOptions.model_validate(job.options or {})
+            if not job.options:
+                file_format = os.path.splitext(file_path)[1].lstrip(".").lower()
+                options.file_format = file_format if file_format in IMPORT_FORMATS else "xlsx"
+
+        with ImportJobService._lock:
+            ImportJobService._running.add(job_id)
+        try:
+            ImportJobService._execute(job_id, owner, kind, file_path, start_after, checkpoint, options)
+        except ImportJobLost:
+            # 本进程心跳过期、任务已被其他进程重新执行：不修改任务记录，也不删除落盘文件
+            logger.warning(f"Import job {job_id} was taken over by another process, stopping")
+        finally:
+            with ImportJobService._lock:
+                ImportJobService._running.discard(job_id)
+
+    @staticmethod
+    def _execute(
+        job_id: int,
+        owner: str,
+        kind: str,
+        file_path: str,
+        start_after: int,
+        checkpoint: JobCheckpoint,
+        options: ImportOptions
+    ) -> None:
+        """执行已认领的任务并写入结果"""
+        result, message, total_rows = None, None, None
+        try:
+            with open(file_path, "rb") as file:
+                total_rows = ImportService.estimate_rows(file, options.file_format)
+                file.seek(0)
+                with Session(write_engine) as session:
+                    session.exec(update(ImportJob).where(ImportJob.id == job_id).values(total_rows=total_rows))
+                    session.commit()
+                with Session(write_engine) as import_session:
+                    result = ImportService.import_file(
+                        import_session, kind, file, options, None, ImportResults.FAILURES,
+                        checkpoint.save, start_after
+                    )
+            job_status = ImportJobStatus.SUCCEEDED if result["success"] else ImportJobStatus.FAILED
+            message = result.get("message")
+        except ImportJobLost:
+            raise
+        except ImportCancelled:
+            job_status, message = ImportJobStatus.CANCELLED, "任务已取消，已提交的批次保留"
+        except FileNotFoundError:
+            job_status, message = ImportJobStatus.FAILED, "导入文件不存在"
+        except Exception as e:
+            logger.exception(f"Import job {job_id} failed")
+            job_status, message = ImportJobStatus.FAILED, f"导入失败: {str(e)}"
+
+        with Session(write_engine) as session:
+            job = session.get(ImportJob, job_id)
+            if job.owner != owner:
+                raise ImportJobLost()
+            job.status = job_status
+            job.finished_at = datetime.now()
+            if job_status == ImportJobStatus.FAILED and job.checkpoint_row:
+                # 逐批提交，失败前的批次已写入
+                message = f"{message}（第 {job.checkpoint_row} 行及之前的批次已提交）"
+            job.message = message
+            if result and "summary" in result:
+                # 复用上次结果时没有逐批回调，失败行取自导入结果
+                failures = checkpoint.failures if checkpoint.summary["total"] else result["failures"][:IMPORT_JOB_FAILURE_LIMIT]
+                summary = checkpoint.summary if checkpoint.summary["total"] else result["summary"]
+                job.total_rows = summary["total"]
+                job.processed_rows, job.success_rows, job.failure_rows = summary["total"], summary["success"], summary["failure"]
+                job.result = {
+                    "summary": summary,
+                    "failures": failures,
+                    **{key: result[key] for key in ("unknown_names", "reused") if key in result},
+                }
+            elif total_rows is not None and job.total_rows is None:
+                job.total_rows = total_rows
+            session.add(job)
+            session.commit()
+
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+    @staticmethod
+    def get_job(session: Session, job_id: int) -> ImportJob:
+        job = session.get(ImportJob, job_id)
+        if not job:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="导入任务不存在")
+        return job
+
+    @staticmethod
+    def to_response(job: ImportJob) -> ImportJobResponse:
+        """任务状态，由任务记录中的进度计算速率和预计剩余时间"""
+        response = ImportJobResponse.model_validate(job, from_attributes=True)
+        if job.result:
+            response.errors = job.result.get("failures", [])[:IMPORT_JOB_ERROR_LIMIT]
+        if job.started_at and job.processed_rows:
+            elapsed = ((job.finished_at or datetime.now()) - job.started_at).total_seconds()
+            rate = job.processed_rows / elapsed if elapsed > 0 else None
+            response.rows_per_second = round(rate, 1) if rate else None
+            if rate and job.status == ImportJobStatus.RUNNING and job.total_rows is not None:
+                response.eta_seconds = round(max(job.total_rows - job.processed_rows, 0) / rate, 1)
+        return response
+
+    @staticmethod
+    def list_jobs(session: Session, skip: int = 0, limit: int = 20) -> List[ImportJob]:
+        return session.exec(select(ImportJob).order_by(ImportJob.id.desc()).offset(skip).limit(limit)).all()
+
+    @staticmethod
+    def cancel(session: Session, job_id: int) -> ImportJob:
+        """取消任务：排队中的任务直接取消，执行中的任务在下一批提交前中止（当前批次回滚，之前的批次保留）"""
+        # 先读后写：事务开始时即取得写锁，避免读取之后任务进度已提交、升级写锁失败
+        session.connection(execution_options={"sqlite_begin": "IMMEDIATE"})
+        job = ImportJobService.get_job(session, job_id)
+        if job.status in FINISHED_STATUSES:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="导入任务已结束，无法取消")
+
+        if job.status == ImportJobStatus.PENDING:
+            job.status = ImportJobStatus.CANCELLED
+            job.message = "任务已取消"
+            job.finished_at = datetime.now()
+            session.add(job)
+            session.commit()
+            session.refresh(job)
+            if os.path.exists(job.file_path):
+                os.remove(job.file_path)
+            return job
+
+        # 执行中的任务设置取消请求，执行任务的进程（可能是其他进程）在下一批提交前中止
+        job.cancel_requested = True
+        session.add(job)
+        session.commit()
+        session.refresh(job)
+        return job
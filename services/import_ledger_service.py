@@ -0,0 +1,151 @@
+"""
+导入记录服务 - 重复上传的文件和未变化的行不再重新处理
+
+文件级：每次成功导入后记录文件内容的 SHA-256、导入模式、相关表的版本号和导入结果
+（汇总和逐行结果）。同一文件按同一模式再次导入时，如果相关表的版本号没有变化
+（期间没有任何写入），直接返回上次的结果，不再读取文件。
+流式请求体无法预先计算哈希，不参与文件级去重（仍按行跳过未变化的行）。
+
+行级：每条记录最近一次导入时文件中提供的字段值的哈希，按唯一字段保存。
+upsert / update_only 模式下 skip_unchanged（默认开启）时，哈希与上次导入相同、且与数据库中记录的当前值
+也相同的行直接标记为未变化，不再校验和写入；通过接口修改过的记录与文件不同，照常写入。
+insert 模式不跳过：已存在的行仍按唯一字段重复报告失败。
+"""
+import hashlib
+import numbers
+import os
+from typing import Any, BinaryIO, Dict, List, Optional, Set, Tuple
+
+import orjson
+from sqlalchemy import delete, insert
+from sqlmodel import Session, select
+
+from model.import_job import ImportOptions
+from model.import_ledger import ImportLedger, ImportRowHash
+from services.import_mapping import ImportSpec
+from services.version_service import VersionService
+
+# 导入记录中保存的逐行结果数上限；超过时不记录该文件（无法完整复用结果）
+IMPORT_LEDGER_RESULT_LIMIT = int(os.getenv("IMPORT_LEDGER_RESULT_LIMIT", "10000"))
+
+
+class ImportLedgerService:
+    """导入记录服务类"""
+
+    @staticmethod
+    def content_hash(file: BinaryIO) -> Optional[str]:
+        """可随机访问的文件计算 SHA-256 后回到开头；流式请求体无法预先读取，返回 None"""
+        if not file.seekable():
+            return None
+        digest = hashlib.sha256()
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+        file.seek(0)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _versions(session: Session, spec: ImportSpec) -> List[int]:
+        """导入结果依赖的表（目标表，以及解析名称用到的品牌和卡口表）的版本号"""
+        tables = (spec.model.__tablename__, "brand", "mount") if spec.resolve_relations else (spec.model.__tablename__,)
+        return list(VersionService.get_versions(session, tables))
+
+    @staticmethod
+    def find(session: Session, spec: ImportSpec, options: ImportOptions, content_hash: str) -> Optional[ImportLedger]:
+        """同一文件按同一模式最近一次的导入记录，之后相关表有过写入时返回 None"""
+        ledger = session.exec(
+            select(ImportLedger)
+            .where(
+                ImportLedger.kind == spec.model.__tablename__,
+                ImportLedger.mode == options.mode.value,
+                ImportLedger.content_hash == content_hash
+            )
+            .order_by(ImportLedger.id.desc())
+        ).first()
+        if ledger is None or ledger.versions != ImportLedgerService._versions(session, spec):
+            return None
+        return ledger
+
+    @staticmethod
+    def record(
+        session: Session,
+        spec: ImportSpec,
+        options: ImportOptions,
+        content_hash: str,
+        result: Dict[str, Any]
+    ) -> None:
+        """在导入事务提交前记录本次导入（版本号取本次写入递增之后的值）"""
+        session.add(ImportLedger(
+            kind=spec.model.__tablename__, mode=options.mode.value, content_hash=content_hash,
+            versions=ImportLedgerService._versions(session, spec), result=result
+        ))
+
+    @staticmethod
+    def _normalize(value: Any) -> Any:
+        """数值统一类型（映射后含空值的列为浮点数，数据库中的整数列为 int），值相同的行哈希相同"""
+        if isinstance(value, bool) or not isinstance(value, numbers.Real):
+            return value
+        value = float(value)
+        return int(value) if value.is_integer() else value
+
+    @staticmethod
+    def row_hash(values: Dict[str, Any], fields: List[str]) -> str:
+        """文件中提供的字段值的哈希（不含模型默认值和时间戳）"""
+        normalized = {field: ImportLedgerService._normalize(values[field]) for field in fields}
+        payload = orjson.dumps(normalized, option=orjson.OPT_SORT_KEYS, default=str)
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    @staticmethod
+    def split_unchanged(
+        session: Session,
+        spec: ImportSpec,
+        fields: List[str],
+        rows: List[Tuple[int, str, Dict[str, Any]]],
+        hashes: Dict[int, str],
+        seen_keys: Set[Any]
+    ) -> Tuple[List[Tuple[int, str, Dict[str, Any]]], List[Tuple[int, str]]]:
+        """
+        分出与上次导入相比没有变化、且与数据库中记录的当前值相同的行，整批两次查询
+
+        Returns:
+            (需要处理的行, 未变化的 (行号, 条目) 列表)
+        """
+        kind = spec.model.__tablename__
+        keys = {str(values[spec.key_field]) for _, _, values in rows}
+        stored = dict(session.exec(
+            select(ImportRowHash.key, ImportRowHash.row_hash)
+            .where(ImportRowHash.kind == kind, ImportRowHash.key.in_(keys))
+        ).all()) if keys else {}
+        candidates = {values[spec.key_field] for row_num, _, values in rows if stored.get(str(values[spec.key_field])) == hashes[row_num]}
+        # 行哈希只在导入时更新，再按记录的当前值计算一次（通过接口修改或删除过的记录不会被跳过）；
+        # 文件中为空的单元格更新时保持原值，不参与比较
+        table = spec.model.__table__
+        current = {
+            row[0]: dict(zip(fields, row[1:]))
+            for row in session.execute(
+                select(table.c[spec.key_field], *[table.c[field] for field in fields])
+                .where(table.c[spec.key_field].in_(candidates))
+            ).all()
+        } if candidates else {}
+
+        changed, unchanged = [], []
+        for row_num, item, values in rows:
+            key = values[spec.key_field]
+            record = current.get(key)
+            # 文件中重复的唯一字段交给唯一字段检查处理
+            if key not in seen_keys and record is not None and ImportLedgerService.row_hash(
+                {field: None if values[field] is None else record[field] for field in fields}, fields
+            ) == hashes[row_num]:
+                seen_keys.add(key)
+                unchanged.append((row_num, item))
+            else:
+                changed.append((row_num, item, values))
+        return changed, unchanged
+
+    @staticmethod
+    def save_row_hashes(session: Session, spec: ImportSpec, entries: Dict[str, str]) -> None:
+        """保存写入成功的行的哈希（唯一字段值 -> 哈希），随导入事务一起提交"""
+        if not entries:
+            return
+        kind = spec.model.__tablename__
+        session.execute(delete(ImportRowHash).where(ImportRowHash.kind == kind, ImportRowHash.key.in_(list(entries))))
+        session.execute(insert(ImportRowHash), [{"kind": kind, "key": key, "row_hash": row_hash} for key, row_hash in entries.items()])
@@ -0,0 +1,345 @@
+"""
+导入数据映射与校验（纯计算，不访问数据库）
+
+整批按列完成：列名映射、空值归一、布尔值识别、类型转换、品牌/卡口名称解析和行级校验。
+每项校验生成一个行掩码，第一个失败的校验决定该行的错误信息；
+最后只有通过校验的行被转换为字典，交给写入阶段。
+"""
+import unicodedata
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Type
+
+import pandas as pd
+from sqlalchemy import Boolean, Float, Integer
+from sqlmodel import SQLModel
+
+from model.brand import Brand
+from model.brand_mount import BrandMount
+from model.camera import Camera
+from model.lens import Lens, LensType
+from model.mount import Mount
+
+# Excel 列名 -> 字段名
+BRAND_MAPPING = {"品牌名称": "name", "国家": "country", "官方网站": "website", "品牌描述": "description", "品牌类型": "brand_type", "是否激活": "is_active"}
+
+CAMERA_MAPPING = {
+    "品牌": "brand_id", "卡口": "mount_id", "型号": "model", "系列": "series",
+    "传感器尺寸": "sensor_size", "像素": "megapixels", "防抖": "ibis_level",
+    "热靴": "has_hot_shoe", "内置闪光灯": "has_built_in_flash", "WiFi": "has_wifi",
+    "蓝牙": "has_bluetooth", "发布日期": "release_date", "价格": "release_price",
+    "重量": "weight", "描述": "description"
+}
+
+LENS_MAPPING = {
+    "品牌": "brand_id", "卡口": "mount_id", "型号": "model", "系列": "series",
+    "最小焦距": "min_focal_length", "最大焦距": "max_focal_length",
+    "最大光圈": "max_aperture_min", "最小光圈": "max_aperture_max",
+    "是否恒定光圈": "is_constant_aperture", "防抖": "has_stabilization",
+    "对焦方式": "focus_type", "最近对焦距离": "min_focus_distance",
+    "重量": "weight", "长度": "length", "滤镜口径": "filter_thread",
+    "发布日期": "release_date", "价格": "release_price", "描述": "description"
+}
+
+MOUNT_MAPPING = {"卡口名称": "name", "法兰距": "flange_distance", "发布年份": "release_year", "是否在用": "is_active", "描述": "description"}
+
+BRAND_MOUNT_MAPPING = {"品牌": "brand_id", "卡口": "mount_id", "是否主要卡口": "is_primary", "兼容性说明": "compatibility_notes"}
+
+BRAND_TYPE_MAPPING = {"相机": "camera", "镜头": "lens", "配件": "accessory"}
+
+# 布尔列中视为"是"的取值（比较前去除空白并转为小写）
+TRUE_VALUES = ['是', 'yes', 'true', '1', '有', '支持']
+ACTIVE_TRUE_VALUES = ['是', 'yes', 'true', '1', '激活', '在用']
+
+
+def normalize_name(name: Any) -> str:
+    """名称规范化：全角转半角（NFKC）、去除首尾空白、忽略大小写"""
+    return unicodedata.normalize("NFKC", str(name)).strip().casefold()
+
+
+class NameIndex:
+    """导入期间使用的名称 -> ID 索引，一次加载全部名称，之后在内存中解析"""
+
+    def __init__(self, rows: Iterable[Tuple[str, int]]):
+        self._exact: Dict[str, int] = {}
+        self._normalized: Dict[str, int] = {}
+        for name, pk in rows:
+            self._exact[name] = pk
+            self._normalized.setdefault(normalize_name(name), pk)
+        # 无法解析的名称（原始写法），用于汇总报告
+        self.unknown: Dict[str, None] = {}
+
+    def resolve(self, name: Any) -> Optional[int]:
+        if name is None:
+            return None
+        pk = self._exact.get(name)
+        if pk is None:
+            pk = self._normalized.get(normalize_name(name))
+        if pk is None:
+            self.unknown.setdefault(str(name).strip(), None)
+        return pk
+
+
+class RowErrors:
+    """按行记录错误信息，每行只保留第一个错误"""
+
+    def __init__(self, index: pd.Index):
+        self.messages = pd.Series(None, index=index, dtype=object)
+
+    def add(self, mask: pd.Series, message) -> None:
+        """
+        Args:
+            mask: 失败行掩码
+            message: 错误信息，字符串或与行对齐的 Series
+        """
+        mask = mask.fillna(False).astype(bool) & self.messages.isna()
+        if mask.any():
+            self.messages[mask] = message if isinstance(message, str) else message[mask]
+
+    @property
+    def valid(self) -> pd.Series:
+        return self.messages.isna()
+
+
+class ImportSpec(NamedTuple):
+    """导入配置"""
+    model: Type[SQLModel]                       # 目标表模型
+    mapping: Dict[str, str]                     # Excel 列名 -> 字段名
+    required_col: str                           # 必填列（同时作为结果中的条目名称）
+    key_field: str                              # 唯一字段，用于重复检查和 upsert 匹配
+    duplicate_message: str                      # 唯一字段已存在时的提示（insert 模式）
+    missing_message: str                        # 唯一字段不存在时的提示（update_only 模式）
+    resolve_relations: bool                     # 是否需要把品牌/卡口名称解析为 ID
+    prepare: Optional[Callable[[pd.DataFrame, RowErrors], pd.DataFrame]] = None  # 整批转换和校验
+    derived: Dict[str, Tuple[str, ...]] = {}    # prepare 推导的字段 -> 来源字段，来源字段都提供时才在更新中覆盖
+
+
+def _numeric(frame: pd.DataFrame, field: str) -> pd.Series:
+    return pd.to_numeric(frame[field], errors="coerce")
+
+
+def prepare_brand(frame: pd.DataFrame, errors: RowErrors) -> pd.DataFrame:
+    """品牌类型中文名称转换为枚举值"""
+    text = frame["brand_type"].astype(str).str.strip()
+    frame["brand_type"] = text.map(BRAND_TYPE_MAPPING).fillna(text.str.lower()).where(frame["brand_type"].notna(), None)
+    return frame
+
+
+def prepare_lens(frame: pd.DataFrame, errors: RowErrors) -> pd.DataFrame:
+    """焦距和光圈范围校验（与 LensService.validate_ranges 一致），并推导镜头类型和是否恒定光圈"""
+    min_focal, max_focal = _numeric(frame, "min_focal_length"), _numeric(frame, "max_focal_length")
+    min_aperture, max_aperture = _numeric(frame, "max_aperture_min"), _numeric(frame, "max_aperture_max")
+
+    errors.add((min_focal != 0) & (max_focal != 0) & (min_focal > max_focal), "最小焦距不能大于最大焦距")
+    errors.add((min_aperture != 0) & (max_aperture != 0) & (min_aperture < max_aperture), "最小光圈值应小于最大光圈值")
+
+    frame["lens_type"] = (min_focal == max_focal).map({True: LensType.PRIME, False: LensType.ZOOM})
+    # 光圈未完整提供时不推导：新增时使用默认值，更新时保持原值
+    frame["is_constant_aperture"] = (min_aperture == max_aperture).astype(object).where(min_aperture.notna() & max_aperture.notna(), None)
+    return frame
+
+
+BRAND_SPEC = ImportSpec(
+    model=Brand, mapping=BRAND_MAPPING, required_col="品牌名称", key_field="name",
+    duplicate_message="品牌名称已存在", missing_message="品牌不存在",
+    resolve_relations=False, prepare=prepare_brand
+)
+CAMERA_SPEC = ImportSpec(
+    model=Camera, mapping=CAMERA_MAPPING, required_col="型号", key_field="model",
+    duplicate_message="相机型号已存在", missing_message="相机型号不存在",
+    resolve_relations=True
+)
+LENS_SPEC = ImportSpec(
+    model=Lens, mapping=LENS_MAPPING, required_col="型号", key_field="model",
+    duplicate_message="镜头型号已存在", missing_message="镜头型号不存在",
+    resolve_relations=True, prepare=prepare_lens,
+    derived={"lens_type": ("min_focal_length", "max_focal_length"), "is_constant_aperture": ("max_aperture_min", "max_aperture_max")}
+)
+
+# 卡口和品牌-卡口关联只通过离线批量加载（bulk_load.py）导入；
+# 关联表的唯一字段为 brand_id + mount_id，由批量加载自行去重
+MOUNT_SPEC = ImportSpec(
+    model=Mount, mapping=MOUNT_MAPPING, required_col="卡口名称", key_field="name",
+    duplicate_message="卡口名称已存在", missing_message="卡口不存在",
+    resolve_relations=False
+)
+BRAND_MOUNT_SPEC = ImportSpec(
+    model=BrandMount, mapping=BRAND_MOUNT_MAPPING, required_col="卡口", key_field="mount_id",
+    duplicate_message="品牌卡口关联已存在", missing_message="品牌卡口关联不存在",
+    resolve_relations=True
+)
+
+# 导入类型 -> 导入配置
+IMPORT_SPECS = {"brand": BRAND_SPEC, "camera": CAMERA_SPEC, "lens": LENS_SPEC}
+
+
+class ImportColumnError(ValueError):
+    """同一字段同时以中文表头和英文字段名提供，无法确定使用哪一列"""
+
+
+def canonical_columns(chunk: pd.DataFrame, spec: ImportSpec) -> pd.DataFrame:
+    """列名既可以是中文表头，也可以是英文字段名，统一转换为中文表头；两者同时出现时抛出 ImportColumnError"""
+    aliases = {field: name for name, field in spec.mapping.items()}
+    if not any(column in aliases for column in chunk.columns):
+        return chunk
+    conflicts = [f"{aliases[column]} / {column}" for column in chunk.columns if column in aliases and aliases[column] in chunk.columns]
+    if conflicts:
+        raise ImportColumnError(f"列名重复（中文表头和英文字段名对应同一字段，请只保留一列）: {', '.join(conflicts)}")
+    return chunk.rename(columns=lambda column: aliases.get(column, column))
+
+
+def provided_fields(chunk: pd.DataFrame, spec: ImportSpec) -> List[str]:
+    """本批数据中提供了的字段（含可以推导的字段），upsert 时只更新这些字段，未提供的列保持原值"""
+    columns = spec.model.__table__.columns
+    fields = [spec.mapping[name] for name in chunk.columns if name in spec.mapping and spec.mapping[name] in columns]
+    fields += [field for field, sources in spec.derived.items() if all(source in fields for source in sources)]
+    return fields
+
+
+def required_fields(spec: ImportSpec) -> Dict[str, str]:
+    """没有默认值的非空字段 -> Excel 列名，写入前检查，不依赖数据库的非空约束报错"""
+    labels: Dict[str, str] = {}
+    for name, field in spec.mapping.items():
+        labels.setdefault(field, name)
+    return {
+        column.name: labels.get(column.name, column.name)
+        for column in spec.model.__table__.columns
+        if column.name != "id" and not column.nullable and spec.model.model_fields[column.name].is_required()
+    }
+
+
+def column_defaults(model: Type[SQLModel]) -> Dict[str, Any]:
+    """
+    插入列及其默认值（executemany 要求每行的键一致，缺失或为空的值用模型默认值补齐；
+    没有默认值的必填列补 None，由数据库的非空约束报告为该行的错误）
+    """
+    defaults = {}
+    for column in model.__table__.columns:
+        if column.name != "id":
+            field = model.model_fields[column.name]
+            defaults[column.name] = None if field.is_required() else field.get_default(call_default_factory=True)
+    return defaults
+
+
+def fill_defaults(
+    spec: ImportSpec,
+    rows: List[Tuple[int, str, Dict[str, Any]]]
+) -> List[Tuple[int, str, Dict[str, Any]]]:
+    """新增的行：空值使用模型默认值（更新已有记录时空值表示保持原值，不补默认值）"""
+    defaults = {field: default for field, default in column_defaults(spec.model).items() if default is not None}
+    return [
+        (row_num, item, {**values, **{field: default for field, default in defaults.items() if values.get(field) is None}})
+        for row_num, item, values in rows
+    ]
+
+
+def _to_text(value: Any) -> str:
+    """文本字段：Excel 中的日期单元格只保留日期部分"""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def _to_none(frame: pd.DataFrame) -> pd.DataFrame:
+    """NaN/NaT 统一转换为 None"""
+    frame = frame.astype(object)
+    return frame.where(frame.notna(), None)
+
+
+def _coerce_column(frame: pd.DataFrame, field: str, column_type: Any, errors: RowErrors) -> pd.Series:
+    """按列类型整列转换，无法转换的值记录为该行的错误"""
+    values = frame[field]
+    present = values.notna()
+
+    enum_class = getattr(column_type, "enum_class", None)
+    if enum_class is not None:
+        text = values.map(lambda value: value.value if isinstance(value, Enum) else str(value).strip(), na_action="ignore")
+        errors.add(present & ~text.isin(list(enum_class._value2member_map_)), f"{field} 取值无效: " + text.astype(str))
+        return text.map(enum_class._value2member_map_)
+
+    if isinstance(column_type, Boolean):
+        text = values.astype(str).str.strip().str.lower()
+        vocabulary = ACTIVE_TRUE_VALUES if field == "is_active" else TRUE_VALUES
+        truthy = text.isin(vocabulary) | (pd.to_numeric(values, errors="coerce") == 1)
+        return truthy.astype(object).where(present, None)
+
+    if isinstance(column_type, (Integer, Float)):
+        numbers = pd.to_numeric(values, errors="coerce")
+        errors.add(present & numbers.isna(), f"{field} 必须是数字: " + values.astype(str))
+        if isinstance(column_type, Integer):
+            return numbers.map(int, na_action="ignore")
+        return numbers
+
+    return values.map(_to_text, na_action="ignore")
+
+
+def map_chunk(
+    chunk: pd.DataFrame,
+    spec: ImportSpec,
+    indexes: Optional[Dict[str, NameIndex]] = None
+) -> Tuple[List[Tuple[int, str, Dict[str, Any]]], List[Dict[str, Any]]]:
+    """
+    映射并校验一批行
+
+    Args:
+        chunk: 原始数据，列名为 Excel 表头，索引为行号
+        spec: 导入配置
+        indexes: 品牌/卡口名称索引（spec.resolve_relations 时必须提供）
+
+    Returns:
+        (通过校验的 (行号, 条目, 字段值) 列表, 失败结果列表)
+    """
+    errors = RowErrors(chunk.index)
+    if spec.required_col in chunk.columns:
+        items = chunk[spec.required_col].astype(str)
+    else:
+        items = pd.Series("未知", index=chunk.index)
+
+    # 列名映射，NaN 统一为 None
+    present = [name for name in spec.mapping if name in chunk.columns]
+    frame = _to_none(chunk[present].rename(columns=spec.mapping))
+
+    required = spec.mapping[spec.required_col]
+    errors.add(frame[required].isna() | (frame[required].astype(str).str.strip() == ""), f"{spec.required_col}不能为空")
+
+    # 品牌和卡口名称解析为 ID，每个不同的名称只解析一次（未提供的列在更新时保持原值）
+    if spec.resolve_relations:
+        for field, label, index in (("brand_id", "品牌", indexes["brand"]), ("mount_id", "卡口", indexes["mount"])):
+            if field not in frame.columns:
+                continue
+            names = frame[field]
+            lookup = {name: index.resolve(name) for name in names.dropna().unique()}
+            ids = names.map(lookup)
+            errors.add(ids.isna(), f"找不到{label}: " + names.astype(str))
+            frame[field] = ids
+
+    # 只保留表中存在的列，按列类型转换
+    columns = spec.model.__table__.columns
+    frame = frame[[field for field in frame.columns if field in columns and field != "id"]]
+    for field in frame.columns:
+        frame[field] = _coerce_column(frame, field, columns[field].type, errors)
+
+    # 提供了的必填列不能有空值（整列未提供时由调用方按新增或更新判断）
+    for field, label in required_fields(spec).items():
+        if field in frame.columns:
+            errors.add(frame[field].isna(), f"{label}不能为空")
+
+    # 缺失的列使用模型默认值；提供了的列中的空值保留为 None：
+    # 更新已有记录时保持原值，新增的行写入前由 fill_defaults 补默认值
+    for field, default in column_defaults(spec.model).items():
+        if field not in frame.columns:
+            frame[field] = default
+
+    if spec.prepare:
+        frame = spec.prepare(frame, errors)
+
+    valid = errors.valid
+    failures = [
+        {"row": row_num, "item": items[row_num], "status": "failure", "message": message}
+        for row_num, message in errors.messages[~valid].items()
+    ]
+    records = _to_none(frame[valid]).to_dict("records")
+    rows = list(zip(frame.index[valid], items[valid], records))
+    return rows, failures
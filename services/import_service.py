@@ -1,143 +1,622 @@
+import os
+import csv
+import io
+import multiprocessing
+import threading
 import pandas as pd
-from typing import List, Dict, Any, Optional, Callable
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import chain
+from typing import List, Dict, Any, BinaryIO, Callable, Iterator, Optional, Tuple, Union
 from io import BytesIO
+import orjson
+from openpyxl import load_workbook
+from sqlalchemy import bindparam, func, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import DBAPIError
 from sqlmodel import Session, select
 import logging
 
 from model.brand import Brand
+from model.import_job import ImportMode, ImportOptions, ImportResults
 from model.mount import Mount
-from services.brand_service import BrandService
-from services.camera_service import CameraService
-from services.lens_service import LensService
+from services.import_ledger_service import IMPORT_LEDGER_RESULT_LIMIT, ImportLedgerService
+from services.import_mapping import (
+    BRAND_SPEC, CAMERA_SPEC, LENS_SPEC, IMPORT_SPECS, ImportColumnError, ImportSpec, NameIndex,
+    canonical_columns, fill_defaults, map_chunk, provided_fields, required_fields
+)
+from services.version_service import VersionService
 
 logger = logging.getLogger(__name__)
 
+# 每批处理的行数：同一批次按列整体校验并通过一条 executemany 插入
+CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "500"))
+
+# 映射和校验使用的进程数；小于 2 时在当前进程内完成。
+# 读取 Excel 和写入数据库始终在当前进程中顺序进行（SQLite 只有一个写连接）
+IMPORT_PROCESSES = int(os.getenv("IMPORT_PROCESSES", str(max((os.cpu_count() or 1) - 1, 1))))
+
+# 支持的文件格式 -> 结果信息中的名称
+IMPORT_FORMATS = {"xlsx": "Excel", "csv": "CSV", "ndjson": "NDJSON"}
+
+# 支持 upsert 的数据库方言 -> INSERT ... ON CONFLICT 语句构造
+UPSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+# 进度回调：每批处理完成后调用，参数为 (已处理行数, 成功行数, 失败行数, 本批失败结果)
+ProgressCallback = Callable[[int, int, int, List[Dict[str, Any]]], None]
+
+# 逐批提交时每批写入后、提交前调用，参数为 (会话, 本批最后一行的行号, 本次导入的累计汇总, 本批失败结果)；
+# 回调中的写入随本批一起提交
+ChunkCheckpoint = Callable[[Session, int, Dict[str, int], List[Dict[str, Any]]], None]
+
+
+class ImportCancelled(Exception):
+    """导入被取消，由进度回调或断点回调抛出；当前批次回滚（整体导入时整个导入回滚）"""
+
+
+class ImportReadError(Exception):
+    """读取过程中文件内容无效或上传中断，整个导入回滚"""
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """映射进程池，首次使用时创建，之后在各次导入之间复用"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # 服务进程中有多个线程，使用 spawn 避免 fork 复制其他线程持有的锁
+            _pool = ProcessPoolExecutor(max_workers=IMPORT_PROCESSES, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _map_in_worker(
+    chunk: pd.DataFrame,
+    spec: ImportSpec,
+    indexes: Optional[Dict[str, NameIndex]]
+) -> Tuple[List[Tuple[int, str, Dict[str, Any]]], List[Dict[str, Any]], Dict[str, List[str]]]:
+    """在子进程中映射并校验一批行，同时返回本批无法识别的名称（子进程中的索引是副本）"""
+    if indexes:
+        for index in indexes.values():
+            index.unknown.clear()
+    rows, failures = map_chunk(chunk, spec, indexes)
+    unknown = {name: list(index.unknown) for name, index in indexes.items()} if indexes else {}
+    return rows, failures, unknown
+
+
 class ImportService:
-    """数据导入服务，处理 Excel 解析和批量插入逻辑"""
+    """数据导入服务，处理 Excel / CSV / NDJSON 流式解析和批量插入逻辑"""
+
+    @staticmethod
+    def _iter_excel_chunks(file: BinaryIO, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """
+        流式读取 Excel 第一个工作表（openpyxl 只读模式），内存占用与文件大小无关
+
+        每次产出最多 chunk_size 行的 DataFrame，列名取自首行，索引为 Excel 中的行号，空行跳过。
+        """
+        workbook = load_workbook(file, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            columns = [str(name).strip() if name is not None else "" for name in header]
+
+            records, row_nums = [], []
+            for row_num, values in enumerate(rows, start=2):
+                if all(value is None or (isinstance(value, str) and not value.strip()) for value in values):
+                    continue
+                records.append(values)
+                row_nums.append(row_num)
+                if len(records) >= chunk_size:
+                    yield pd.DataFrame.from_records(records, columns=columns, index=row_nums)
+                    records, row_nums = [], []
+            if records:
+                yield pd.DataFrame.from_records(records, columns=columns, index=row_nums)
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _iter_csv_chunks(file: BinaryIO, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """
+        逐行解析 CSV（UTF-8，可带 BOM），首行为表头，索引为文件中的行号，空行跳过，空字符串视为空值
+        """
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        try:
+            reader = csv.reader(text)
+            header = next(reader, None)
+            if header is None:
+                return
+            columns = [name.strip() for name in header]
+            width = len(columns)
+
+            records, row_nums = [], []
+            for values in reader:
+                if not any(value.strip() for value in values):
+                    continue
+                values = [value if value.strip() else None for value in values[:width]]
+                records.append(values + [None] * (width - len(values)))
+                row_nums.append(reader.line_num)
+                if len(records) >= chunk_size:
+                    yield pd.DataFrame.from_records(records, columns=columns, index=row_nums)
+                    records, row_nums = [], []
+            if records:
+                yield pd.DataFrame.from_records(records, columns=columns, index=row_nums)
+        finally:
+            # 不关闭调用方传入的文件（导入中止后生成器可能在文件关闭后才被回收）
+            if not file.closed:
+                text.detach()
+
+    @staticmethod
+    def _iter_ndjson_chunks(file: BinaryIO, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """
+        逐行解析 NDJSON，每行一个 JSON 对象，索引为文件中的行号，空行跳过，空字符串视为空值
+        """
+        records, row_nums = [], []
+        for line_num, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                raise ImportReadError(f"第 {line_num} 行不是有效的 JSON")
+            if not isinstance(record, dict):
+                raise ImportReadError(f"第 {line_num} 行不是 JSON 对象")
+            records.append({
+                key: None if isinstance(value, str) and not value.strip() else value
+                for key, value in record.items()
+            })
+            row_nums.append(line_num)
+            if len(records) >= chunk_size:
+                yield pd.DataFrame.from_records(records, index=row_nums)
+                records, row_nums = [], []
+        if records:
+            yield pd.DataFrame.from_records(records, index=row_nums)
 
     @staticmethod
-    def _get_df(file_content: bytes) -> Optional[pd.DataFrame]:
+    def _iter_chunks(file: BinaryIO, file_format: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """按文件格式流式读取，读取过程中的错误统一转换为 ImportReadError"""
+        readers = {
+            "xlsx": ImportService._iter_excel_chunks,
+            "csv": ImportService._iter_csv_chunks,
+            "ndjson": ImportService._iter_ndjson_chunks,
+        }
         try:
-            df = pd.read_excel(BytesIO(file_content))
-            return df if not df.empty else None
+            yield from readers[file_format](file, chunk_size)
+        except ImportReadError:
+            raise
         except Exception as e:
-            logger.error(f"Excel read error: {str(e)}")
-            return None
+            raise ImportReadError(str(e)) from e
 
     @staticmethod
-    def _resolve_relation(session: Session, model: Any, name: str) -> Optional[int]:
-        """根据名称解析关联表的 ID"""
-        if not name or pd.isna(name):
+    def estimate_rows(file: BinaryIO, file_format: str = "xlsx") -> Optional[int]:
+        """
+        估算数据行数（可能包含空行），无法获取时返回 None
+
+        Excel 根据工作表的尺寸信息（不含表头），CSV / NDJSON 统计换行符数量。
+        """
+        if file_format != "xlsx":
+            lines = sum(block.count(b"\n") for block in iter(lambda: file.read(1 << 20), b""))
+            return max(lines - 1, 0) if file_format == "csv" else lines
+        try:
+            workbook = load_workbook(file, read_only=True, data_only=True)
+        except Exception:
             return None
-        stmt = select(model.id).where(model.name == str(name).strip())
-        result = session.exec(stmt).first()
-        return result
-
-    @staticmethod
-    def _map_row(row: pd.Series, mapping: Dict[str, str], df_columns: List[str]) -> Dict[str, Any]:
-        data = {}
-        for chi, eng in mapping.items():
-            if chi in df_columns:
-                val = row[chi]
-                if pd.isna(val):
-                    data[eng] = None
-                elif eng == "is_active":
-                    data[eng] = str(val).strip().lower() in ['是', 'yes', 'true', '1', '激活']
-                elif eng in ["has_hot_shoe", "has_built_in_flash", "has_wifi", "has_bluetooth", "has_stabilization"]:
-                    data[eng] = str(val).strip().lower() in ['是', 'yes', 'true', '1', '有', '支持']
+        try:
+            max_row = workbook.active.max_row
+            return max(max_row - 1, 0) if max_row else None
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _map_chunks(
+        chunks: Iterator[pd.DataFrame],
+        spec: ImportSpec,
+        indexes: Optional[Dict[str, NameIndex]] = None
+    ) -> Iterator[Tuple[int, List[str], List[Tuple[int, str, Dict[str, Any]]], List[Dict[str, Any]]]]:
+        """
+        映射并校验各批数据，按读取顺序产出 (行数, 本批提供的字段, 通过校验的行, 失败结果)
+
+        文件超过一批且 IMPORT_PROCESSES >= 2 时，各批分发到进程池并行处理；
+        同时在途的批次数有上限，读取不会远远领先于写入。
+        """
+        head = [chunk for chunk in (next(chunks, None), next(chunks, None)) if chunk is not None]
+        if IMPORT_PROCESSES < 2 or len(head) < 2:
+            for chunk in chain(head, chunks):
+                yield (len(chunk), provided_fields(chunk, spec), *map_chunk(chunk, spec, indexes))
+            return
+
+        pool = _get_pool()
+        pending: deque = deque()
+
+        def collect(size: int, fields: List[str], future: Future):
+            rows, failures, unknown = future.result()
+            for name, names in unknown.items():
+                indexes[name].unknown.update(dict.fromkeys(names))
+            return size, fields, rows, failures
+
+        try:
+            for chunk in chain(head, chunks):
+                pending.append((len(chunk), provided_fields(chunk, spec), pool.submit(_map_in_worker, chunk, spec, indexes)))
+                if len(pending) >= IMPORT_PROCESSES * 2:
+                    yield collect(*pending.popleft())
+            while pending:
+                yield collect(*pending.popleft())
+        finally:
+            # 导入中止（如任务被取消）时丢弃尚未开始的批次
+            for _, _, future in pending:
+                future.cancel()
+
+    @staticmethod
+    def _check_keys(
+        session: Session,
+        spec: ImportSpec,
+        rows: List[Tuple[int, str, Dict[str, Any]]],
+        seen_keys: set,
+        mode: ImportMode = ImportMode.INSERT
+    ) -> Tuple[List[Tuple[int, str, Dict[str, Any]]], List[Dict[str, Any]], set]:
+        """
+        唯一字段检查：文件内重复，以及按导入模式检查数据库中是否已存在，整批一次查询
+
+        Returns:
+            (待写入的 (行号, 条目, 数据) 列表, 失败结果列表, 其中数据库已存在的唯一字段值)
+        """
+        key_attr = getattr(spec.model, spec.key_field)
+        keys = {values[spec.key_field] for _, _, values in rows}
+        existing = set(session.exec(select(key_attr).where(key_attr.in_(keys))).all()) if keys else set()
+
+        accepted, failures = [], []
+        for row_num, item, values in rows:
+            key = values[spec.key_field]
+            if key in seen_keys:
+                message = spec.duplicate_message if mode == ImportMode.INSERT else f"{spec.required_col}在文件中重复"
+            elif mode == ImportMode.INSERT and key in existing:
+                message = spec.duplicate_message
+            elif mode == ImportMode.UPDATE_ONLY and key not in existing:
+                message = spec.missing_message
+            else:
+                seen_keys.add(key)
+                accepted.append((row_num, item, values))
+                continue
+            failures.append({"row": row_num, "item": item, "status": "failure", "message": message})
+        return accepted, failures, existing
+
+    @staticmethod
+    def _check_required(
+        spec: ImportSpec,
+        fields: List[str],
+        rows: List[Tuple[int, str, Dict[str, Any]]]
+    ) -> Tuple[List[Tuple[int, str, Dict[str, Any]]], List[Dict[str, Any]]]:
+        """新增的行必须提供所有必填列（更新已有记录时未提供的列保持原值，不受影响）"""
+        missing = [label for field, label in required_fields(spec).items() if field not in fields]
+        if not missing:
+            return rows, []
+        message = f"{'、'.join(missing)}不能为空"
+        return [], [{"row": row_num, "item": item, "status": "failure", "message": message} for row_num, item, _ in rows]
+
+    @staticmethod
+    def _insert_statement(session: Session, spec: ImportSpec, mode: ImportMode, fields: List[str]):
+        """
+        新记录的插入语句：insert 模式使用普通 INSERT；upsert 使用 INSERT ... ON CONFLICT DO UPDATE，
+        检查之后被并发写入的记录按唯一字段更新本批提供的字段
+        """
+        table = spec.model.__table__
+        if mode != ImportMode.UPSERT:
+            return insert(table)
+        statement = UPSERT_DIALECTS[session.get_bind().dialect.name](table)
+        updates = {field: statement.excluded[field] for field in ImportService._update_fields(spec, fields)}
+        return statement.on_conflict_do_update(index_elements=[spec.key_field], set_=updates)
+
+    @staticmethod
+    def _update_rows(
+        spec: ImportSpec,
+        fields: List[str],
+        rows: List[Tuple[int, str, Dict[str, Any]]]
+    ) -> Tuple[Any, List[Tuple[int, str, Dict[str, Any]]]]:
+        """
+        已存在记录的更新语句和参数：按唯一字段 executemany UPDATE，只更新本批提供的字段
+        （文件中没有的列保持原值，也不需要为非空列补值）；单元格为空时 COALESCE 保持该字段的原值
+        """
+        table = spec.model.__table__
+        update_fields = ImportService._update_fields(spec, fields)
+        statement = update(table).where(table.c[spec.key_field] == bindparam("_key")).values({
+            field: func.coalesce(bindparam(f"_{field}", type_=table.c[field].type), table.c[field]) for field in update_fields
+        })
+        return statement, [
+            (row_num, item, {"_key": values[spec.key_field], **{f"_{field}": values[field] for field in update_fields}})
+            for row_num, item, values in rows
+        ]
+
+    @staticmethod
+    def _update_fields(spec: ImportSpec, fields: List[str]) -> List[str]:
+        """更新时写入的字段：本批提供的字段（唯一字段除外）和更新时间"""
+        columns = spec.model.__table__.columns
+        update_fields = [field for field in fields if field not in (spec.key_field, "id", "create_time", "update_time")]
+        return update_fields + ["update_time"] if "update_time" in columns else update_fields
+
+    @staticmethod
+    def _check_transaction(session: Session) -> None:
+        """
+        确认写入前已在真正的事务中：pysqlite 默认不会在 SAVEPOINT 前开启事务，RELEASE 时直接提交，
+        导入中途失败就会留下部分数据。database.engine 创建的引擎在开始事务时显式发出 BEGIN，
+        其他方式创建的 SQLite 引擎拒绝导入
+        """
+        connection = session.connection()
+        if connection.dialect.name == "sqlite" and not connection.connection.dbapi_connection.in_transaction:
+            raise RuntimeError("SQLite 引擎未显式开启事务，批量导入无法整体回滚，请使用 database.engine.build_engine 创建引擎")
+
+    @staticmethod
+    def _write_chunk(
+        session: Session,
+        statement: Any,
+        rows: List[Tuple[int, Any, Dict[str, Any]]]
+    ) -> Tuple[List[Tuple[int, Any]], List[Dict[str, Any]]]:
+        """
+        在保存点内通过 executemany 执行一批写入；整批失败时逐行重试，定位出错的行
+
+        Returns:
+            (成功的 (行号, 条目) 列表, 失败结果列表)
+        """
+        if not rows:
+            return [], []
+        try:
+            with session.begin_nested():
+                session.execute(statement, [values for _, _, values in rows])
+            return [(row_num, item) for row_num, item, _ in rows], []
+        except DBAPIError:
+            inserted, failures = [], []
+            for row_num, item, values in rows:
+                try:
+                    with session.begin_nested():
+                        session.execute(statement, [values])
+                    inserted.append((row_num, item))
+                except DBAPIError as e:
+                    failures.append(ImportService._failure(row_num, item, e.orig))
+            return inserted, failures
+
+    @staticmethod
+    def _failure(row_num: int, item: Any, error: Exception) -> Dict[str, Any]:
+        return {"row": row_num, "item": str(item), "status": "failure", "message": getattr(error, "detail", str(error))}
+
+    @staticmethod
+    def _iter_import(
+        session: Session,
+        file: Union[bytes, BinaryIO],
+        spec: ImportSpec,
+        options: Optional[ImportOptions] = None,
+        progress: Optional[ProgressCallback] = None,
+        checkpoint: Optional[ChunkCheckpoint] = None,
+        start_after: int = 0
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        批量导入：边读取边按 CHUNK_SIZE 分批校验和写入，整个文件在一个事务中完成，
+        每批使用保存点，单行失败不影响其他行；progress 抛出异常或读取出错时不提交
+
+        每批处理完成后按行号产出该批每一行的结果，最后产出导入结果（汇总，不含逐行结果）；
+        逐行结果不在这里累积。迭代中途停止（如客户端断开）时不提交。
+        第一批的列名有冲突（同一字段同时以中文表头和英文字段名提供）时，产出任何结果之前抛出 ImportColumnError。
+
+        options.dry_run 时只做校验（整批的列运算和每批一次的唯一字段查询），不写入数据库，
+        产出与实际导入相同格式的逐行报告。
+
+        同一文件此前已按同一模式导入、且之后相关数据没有变化时，按行号产出上次的逐行结果和导入结果
+        （options.force 时重新导入）；upsert / update_only 模式下 options.skip_unchanged（默认开启）时跳过与数据库中的记录相同的行。
+
+        提供 checkpoint 时（后台任务）改为逐批提交：每批写入后调用 checkpoint 保存进度和断点，
+        随本批一起提交，批与批之间不持有写锁；中途失败或取消时只回滚当前批次。
+        start_after 为上次提交的最后一行的行号，从其后的行继续导入。
+        """
+        options = options or ImportOptions()
+        if isinstance(file, bytes):
+            file = BytesIO(file)
+        dialect = session.get_bind().dialect.name
+        if options.mode == ImportMode.UPSERT and dialect not in UPSERT_DIALECTS:
+            yield {"success": False, "message": f"当前数据库（{dialect}）不支持 {options.mode.value} 导入模式"}
+            return
+
+        # 重复上传的文件直接返回上次的结果
+        content_hash = None if options.dry_run else ImportLedgerService.content_hash(file)
+        if content_hash and not options.force:
+            previous = ImportLedgerService.find(session, spec, options, content_hash)
+            # 只记录了失败行的旧记录无法还原全部结果，重新导入
+            if previous is not None and "results" in previous.result:
+                response = {key: value for key, value in previous.result.items() if key != "results"}
+                response["reused"] = {"import_id": previous.id, "imported_at": previous.create_time.isoformat()}
+                session.rollback()
+                yield from previous.result["results"]
+                yield response
+                return
+
+        label = IMPORT_FORMATS[options.file_format]
+        chunks = (
+            canonical_columns(chunk[chunk.index > start_after], spec)
+            for chunk in ImportService._iter_chunks(file, options.file_format, CHUNK_SIZE)
+        )
+        try:
+            first = next(chunks, None)
+        except ImportReadError as e:
+            logger.error(f"{label} read error: {str(e)}")
+            yield {"success": False, "message": f"{label} 文件读取失败: {str(e)}"}
+            return
+        if first is None:
+            yield {"success": False, "message": f"{label} 文件为空或读取失败"}
+            return
+
+        if spec.required_col not in first.columns:
+            yield {"success": False, "message": f"缺少必要列: {spec.required_col}"}
+            return
+
+        # 品牌和卡口名称在导入开始时一次性加载
+        indexes = {
+            "brand": NameIndex(session.exec(select(Brand.name, Brand.id)).all()),
+            "mount": NameIndex(session.exec(select(Mount.name, Mount.id)).all()),
+        } if spec.resolve_relations else None
+
+        seen_keys = set()
+        total, success, failure, updated, unchanged_count = 0, 0, 0, 0, 0
+        # 记录到导入记录中的逐行结果，超过上限后不再记录；从断点继续的导入结果不完整，不记录
+        ledger_results: Optional[List[Dict[str, Any]]] = [] if content_hash and not start_after else None
+        if not options.dry_run:
+            ImportService._check_transaction(session)
+        if checkpoint:
+            # 逐批提交：结束读取名称索引的事务，映射下一批期间不持有写锁
+            session.commit()
+        try:
+            # 从断点继续时已提交的行被过滤掉，跳过因此变空的批次
+            remaining = (chunk for chunk in chain([first], chunks) if len(chunk))
+            for size, fields, rows, failures in ImportService._map_chunks(remaining, spec, indexes):
+                total += size
+                hashes = {row_num: ImportLedgerService.row_hash(values, fields) for row_num, _, values in rows}
+                unchanged = []
+                # insert 模式下已存在的行仍按重复报告失败，不标记为未变化
+                if options.skip_unchanged and options.mode != ImportMode.INSERT:
+                    rows, unchanged = ImportLedgerService.split_unchanged(session, spec, fields, rows, hashes, seen_keys)
+                rows, key_failures, existing = ImportService._check_keys(session, spec, rows, seen_keys, options.mode)
+                failures.extend(key_failures)
+
+                # 已存在的记录（upsert / update_only）按唯一字段更新，其余插入
+                new_rows, required_failures = ImportService._check_required(
+                    spec, fields, [row for row in rows if row[2][spec.key_field] not in existing]
+                )
+                new_rows = fill_defaults(spec, new_rows)
+                old_rows = [row for row in rows if row[2][spec.key_field] in existing]
+                failures.extend(required_failures)
+                if options.dry_run:
+                    inserted = [(row_num, item) for row_num, item, _ in new_rows]
+                    modified = [(row_num, item) for row_num, item, _ in old_rows]
                 else:
-                    data[eng] = val
-        return data
+                    inserted, insert_failures = ImportService._write_chunk(
+                        session, ImportService._insert_statement(session, spec, options.mode, fields), new_rows
+                    )
+                    modified, update_failures = ImportService._write_chunk(
+                        session, *ImportService._update_rows(spec, fields, old_rows)
+                    )
+                    failures.extend(insert_failures + update_failures)
+
+                    # 写入成功的行更新行哈希
+                    written = {row_num for row_num, _ in chain(inserted, modified)}
+                    ImportLedgerService.save_row_hashes(session, spec, {
+                        str(values[spec.key_field]): hashes[row_num]
+                        for row_num, _, values in chain(new_rows, old_rows) if row_num in written
+                    })
+
+                success += len(inserted) + len(modified) + len(unchanged)
+                failure += len(failures)
+                updated += len(modified)
+                unchanged_count += len(unchanged)
+                if progress:
+                    progress(total, success, failure, failures)
+
+                # 各批的行号依次递增，批内排序后整个文件的结果即按行号排列
+                chunk_results = [{"row": row_num, "item": item, "status": "success", "action": "inserted"} for row_num, item in inserted]
+                chunk_results += [{"row": row_num, "item": item, "status": "success", "action": "updated"} for row_num, item in modified]
+                chunk_results += [{"row": row_num, "item": item, "status": "success", "action": "unchanged"} for row_num, item in unchanged]
+                chunk_results += failures
+                chunk_results.sort(key=lambda result: result["row"])
+                if ledger_results is not None and len(ledger_results) + len(chunk_results) > IMPORT_LEDGER_RESULT_LIMIT:
+                    ledger_results = None
+                elif ledger_results is not None:
+                    ledger_results.extend(chunk_results)
+
+                if checkpoint and not options.dry_run:
+                    if inserted or modified:
+                        VersionService.bump(session, spec.model.__tablename__)
+                    checkpoint(session, chunk_results[-1]["row"], {
+                        "total": total, "success": success, "failure": failure,
+                        "inserted": success - updated - unchanged_count, "updated": updated, "unchanged": unchanged_count
+                    }, failures)
+                    session.commit()
+                yield from chunk_results
+        except (ImportReadError, ImportColumnError) as e:
+            # 文件中途出错（内容无效、上传中断或 NDJSON 中途出现冲突的列名）时不保留部分数据（逐批提交时只回滚当前批次）
+            session.rollback()
+            logger.error(f"{label} read error: {str(e)}")
+            yield {"success": False, "message": f"{label} 文件读取失败: {str(e)}"}
+            return
+
+        summary = {
+            "total": total, "success": success, "failure": failure,
+            "inserted": success - updated - unchanged_count, "updated": updated, "unchanged": unchanged_count
+        }
+        response = {"success": True, "summary": summary}
+        if options.dry_run:
+            response["dry_run"] = True
+        if indexes:
+            # 汇总无法识别的品牌和卡口名称，便于一次性补录
+            response["unknown_names"] = {name: list(index.unknown) for name, index in indexes.items()}
+
+        if options.dry_run:
+            session.rollback()
+        else:
+            # 逐批提交时各批已分别递增版本号
+            if success > unchanged_count and not checkpoint:
+                VersionService.bump(session, spec.model.__tablename__)
+            if ledger_results is not None:
+                ImportLedgerService.record(session, spec, options, content_hash, {**response, "results": ledger_results})
+            session.commit()
+        yield response
 
     @staticmethod
     def _batch_import(
-        session: Session, 
-        file_content: bytes, 
-        mapping: Dict[str, str], 
-        required_col: str,
-        create_func: Callable,
-        pre_process: Optional[Callable] = None
+        session: Session,
+        file: Union[bytes, BinaryIO],
+        spec: ImportSpec,
+        options: Optional[ImportOptions] = None,
+        progress: Optional[ProgressCallback] = None,
+        results: ImportResults = ImportResults.ALL,
+        checkpoint: Optional[ChunkCheckpoint] = None,
+        start_after: int = 0
     ) -> Dict[str, Any]:
-        df = ImportService._get_df(file_content)
-        if df is None:
-            return {"success": False, "message": "Excel 文件为空或读取失败", "results": []}
+        """
+        批量导入并返回导入结果（checkpoint、start_after 见 _iter_import）；results 为 failures 时只保留失败的行（放在 failures 中），
+        成功的行不累积，为 all 时在 results 中返回全部行
+        """
+        kept, response = [], None
+        for result in ImportService._iter_import(session, file, spec, options, progress, checkpoint, start_after):
+            if "row" not in result:
+                response = result
+            elif results == ImportResults.ALL or result["status"] == "failure":
+                kept.append(result)
+        # 读取出错时已导入的行全部回滚，不返回逐行结果
+        key = "failures" if results == ImportResults.FAILURES else "results"
+        response[key] = kept if response["success"] else []
+        return response
 
-        if required_col not in df.columns:
-            return {"success": False, "message": f"缺少必要列: {required_col}", "results": []}
+    @staticmethod
+    def import_file(
+        session: Session,
+        kind: str,
+        file: Union[bytes, BinaryIO],
+        options: Optional[ImportOptions] = None,
+        progress: Optional[ProgressCallback] = None,
+        results: ImportResults = ImportResults.ALL,
+        checkpoint: Optional[ChunkCheckpoint] = None,
+        start_after: int = 0
+    ) -> Dict[str, Any]:
+        """按导入类型（brand / camera / lens）导入，文件格式和导入模式由 options 指定"""
+        return ImportService._batch_import(session, file, IMPORT_SPECS[kind], options, progress, results, checkpoint, start_after)
 
-        success, failure, results = 0, 0, []
-        for index, row in df.iterrows():
-            row_num = index + 2
-            try:
-                data = ImportService._map_row(row, mapping, df.columns)
-                if not data.get(mapping[required_col]):
-                    raise ValueError(f"{required_col}不能为空")
-                
-                if pre_process:
-                    data = pre_process(session, data, row)
-                
-                create_func(session, data)
-                success += 1
-                results.append({"row": row_num, "item": data.get(mapping[required_col]), "status": "success"})
-            except Exception as e:
-                failure += 1
-                results.append({"row": row_num, "item": str(row.get(required_col, "未知")), "status": "failure", "message": getattr(e, "detail", str(e))})
-
-        return {"success": True, "summary": {"total": len(df), "success": success, "failure": failure}, "results": results}
-
-    @staticmethod
-    def import_brands(session: Session, file_content: bytes) -> Dict[str, Any]:
-        mapping = {"品牌名称": "name", "国家": "country", "官方网站": "website", "品牌描述": "description", "品牌类型": "brand_type", "是否激活": "is_active"}
-        
-        def pre_proc(s, data, row):
-            if data.get("brand_type"):
-                t_map = {"相机": "camera", "镜头": "lens", "配件": "accessory"}
-                data["brand_type"] = t_map.get(data["brand_type"], data["brand_type"].lower())
-            return data
-
-        return ImportService._batch_import(session, file_content, mapping, "品牌名称", BrandService.create_brand, pre_proc)
-
-    @staticmethod
-    def import_cameras(session: Session, file_content: bytes) -> Dict[str, Any]:
-        mapping = {
-            "品牌": "brand_id", "卡口": "mount_id", "型号": "model", "系列": "series", 
-            "传感器尺寸": "sensor_size", "像素": "megapixels", "防抖": "ibis_level",
-            "热靴": "has_hot_shoe", "内置闪光灯": "has_built_in_flash", "WiFi": "has_wifi",
-            "蓝牙": "has_bluetooth", "发布日期": "release_date", "价格": "release_price",
-            "重量": "weight", "描述": "description"
-        }
+    @staticmethod
+    def iter_import(
+        session: Session,
+        kind: str,
+        file: Union[bytes, BinaryIO],
+        options: Optional[ImportOptions] = None,
+        progress: Optional[ProgressCallback] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """按导入类型导入，边处理边产出每一行的结果，最后一项为导入结果（含 success，不含 row）"""
+        return ImportService._iter_import(session, file, IMPORT_SPECS[kind], options, progress)
 
-        def pre_proc(s, data, row):
-            # 解析名称到 ID
-            brand_name = row.get("品牌")
-            mount_name = row.get("卡口")
-            data["brand_id"] = ImportService._resolve_relation(s, Brand, brand_name)
-            data["mount_id"] = ImportService._resolve_relation(s, Mount, mount_name)
-            if not data["brand_id"]: raise ValueError(f"找不到品牌: {brand_name}")
-            if not data["mount_id"]: raise ValueError(f"找不到卡口: {mount_name}")
-            return data
-
-        return ImportService._batch_import(session, file_content, mapping, "型号", CameraService.create_camera, pre_proc)
-
-    @staticmethod
-    def import_lenses(session: Session, file_content: bytes) -> Dict[str, Any]:
-        mapping = {
-            "品牌": "brand_id", "卡口": "mount_id", "型号": "model", "系列": "series",
-            "最小焦距": "min_focal_length", "最大焦距": "max_focal_length", 
-            "最大光圈": "max_aperture_min", "最小光圈": "max_aperture_max",
-            "是否恒定光圈": "is_constant_aperture", "防抖": "has_stabilization",
-            "对焦方式": "focus_type", "最近对焦距离": "min_focus_distance",
-            "重量": "weight", "长度": "length", "滤镜口径": "filter_thread",
-            "发布日期": "release_date", "价格": "release_price", "描述": "description"
-        }
+    @staticmethod
+    def import_brands(session: Session, file: Union[bytes, BinaryIO], options: Optional[ImportOptions] = None) -> Dict[str, Any]:
+        return ImportService._batch_import(session, file, BRAND_SPEC, options)
 
-        def pre_proc(s, data, row):
-            brand_name = row.get("品牌")
-            mount_name = row.get("卡口")
-            data["brand_id"] = ImportService._resolve_relation(s, Brand, brand_name)
-            data["mount_id"] = ImportService._resolve_relation(s, Mount, mount_name)
-            if not data["brand_id"]: raise ValueError(f"找不到品牌: {brand_name}")
-            if not data["mount_id"]: raise ValueError(f"找不到卡口: {mount_name}")
-            return data
+    @staticmethod
+    def import_cameras(session: Session, file: Union[bytes, BinaryIO], options: Optional[ImportOptions] = None) -> Dict[str, Any]:
+        return ImportService._batch_import(session, file, CAMERA_SPEC, options)
 
-        return ImportService._batch_import(session, file_content, mapping, "型号", LensService.create_lens, pre_proc)
+    @staticmethod
+    def import_lenses(session: Session, file: Union[bytes, BinaryIO], options: Optional[ImportOptions] = None) -> Dict[str, Any]:
+        return ImportService._batch_import(session, file, LENS_SPEC, options)
@@ -2,10 +2,13 @@ from typing import List, Optional, Dict, Any
 from fastapi import HTTPException, status
 from sqlmodel import Session, select
 
-from model.lens import Lens, LensType, FocusType
+from model.lens import Lens, LensResponse, LensType, FocusType
 from model.brand import Brand
 from model.mount import Mount
+from services.projection import select_columns, fetch_rows
+from services.search_service import SearchService
 from services.validation_service import ValidationService
+from services.version_service import VersionService
 
 
 class LensService:
@@ -27,6 +30,19 @@ class LensService:
         # 检查卡口是否存在
         ValidationService.validate_mount_exists(session, lens_data.get("mount_id"))
         
+        # 验证焦距和光圈范围
+        LensService.validate_ranges(lens_data)
+        
+        lens = Lens(**lens_data)
+        session.add(lens)
+        VersionService.bump(session, "lens")
+        session.commit()
+        session.refresh(lens)
+        return lens
+    
+    @staticmethod
+    def validate_ranges(lens_data: Dict[str, Any]) -> None:
+        """验证焦距和光圈范围（不访问数据库，创建镜头时调用；批量导入由 import_mapping.prepare_lens 按列做相同的校验）"""
         # 验证焦距范围
         min_focal = lens_data.get("min_focal_length")
         max_focal = lens_data.get("max_focal_length")
@@ -44,28 +60,18 @@ class LensService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="最小光圈值应小于最大光圈值"
             )
-        
-        lens = Lens(**lens_data)
-        session.add(lens)
-        session.commit()
-        session.refresh(lens)
-        return lens
     
     @staticmethod
-    def get_lenses(
-        session: Session, 
-        skip: int = 0, 
-        limit: int = 100, 
+    def _apply_list_filters(
+        query,
         is_active: Optional[bool] = None,
         brand_id: Optional[int] = None,
         mount_id: Optional[int] = None,
         lens_type: Optional[LensType] = None,
         focus_type: Optional[FocusType] = None,
         has_stabilization: Optional[bool] = None
-    ) -> List[Lens]:
-        """获取镜头列表"""
-        query = select(Lens)
-        
+    ):
+        """应用镜头列表的过滤条件"""
         if is_active is not None:
             query = query.where(Lens.is_active == is_active)
         
@@ -84,9 +90,49 @@ class LensService:
         if has_stabilization is not None:
             query = query.where(Lens.has_stabilization == has_stabilization)
         
+        return query
+    
+    @staticmethod
+    def get_lenses(
+        session: Session, 
+        skip: int = 0, 
+        limit: int = 100, 
+        is_active: Optional[bool] = None,
+        brand_id: Optional[int] = None,
+        mount_id: Optional[int] = None,
+        lens_type: Optional[LensType] = None,
+        focus_type: Optional[FocusType] = None,
+        has_stabilization: Optional[bool] = None
+    ) -> List[Lens]:
+        """获取镜头列表"""
+        query = LensService._apply_list_filters(
+            select(Lens), is_active, brand_id, mount_id,
+            lens_type, focus_type, has_stabilization
+        )
+        
         lenses = session.exec(query.offset(skip).limit(limit)).all()
         return lenses
     
+    @staticmethod
+    def get_lens_rows(
+        session: Session, 
+        skip: int = 0, 
+        limit: int = 100, 
+        is_active: Optional[bool] = None,
+        brand_id: Optional[int] = None,
+        mount_id: Optional[int] = None,
+        lens_type: Optional[LensType] = None,
+        focus_type: Optional[FocusType] = None,
+        has_stabilization: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
+        """获取镜头列表（投影模式，只查询 LensResponse 需要的列并返回字典）"""
+        query = LensService._apply_list_filters(
+            select_columns(Lens, LensResponse), is_active, brand_id, mount_id,
+            lens_type, focus_type, has_stabilization
+        )
+        
+        return fetch_rows(session, query.offset(skip).limit(limit))
+    
     @staticmethod
     def get_lens_by_id(session: Session, lens_id: int) -> Lens:
         """根据ID获取镜头"""
@@ -133,6 +179,7 @@ class LensService:
             setattr(lens, key, value)
         
         session.add(lens)
+        VersionService.bump(session, "lens")
         session.commit()
         session.refresh(lens)
         return lens
@@ -143,6 +190,7 @@ class LensService:
         lens = ValidationService.validate_lens_exists(session, lens_id)
         
         session.delete(lens)
+        VersionService.bump(session, "lens")
         session.commit()
         return {"message": "镜头删除成功"}
     
@@ -153,6 +201,7 @@ class LensService:
         
         lens.is_active = is_active
         session.add(lens)
+        VersionService.bump(session, "lens")
         session.commit()
         
         action = "激活" if is_active else "停用"
@@ -185,12 +234,21 @@ class LensService:
         skip: int = 0,
         limit: int = 100
     ) -> List[Lens]:
-        """搜索镜头"""
-        search_query = select(Lens).where(
-            Lens.model.contains(query) | 
-            Lens.series.contains(query) |
-            Lens.description.contains(query)
-        )
+        """搜索镜头（优先使用全文索引并按相关度排序，索引在运行期间失效时回退到 LIKE）"""
+        def run() -> List[Lens]:
+            matches = SearchService.match_subquery(session, Lens, query)
+            if matches is not None:
+                search_query = (
+                    select(Lens)
+                    .join(matches, matches.c.rowid == Lens.id)
+                    .order_by(matches.c.rank, Lens.id)
+                )
+            else:
+                search_query = select(Lens).where(
+                    Lens.model.contains(query) | 
+                    Lens.series.contains(query) |
+                    Lens.description.contains(query)
+                )
+            return session.exec(search_query.offset(skip).limit(limit)).all()
         
-        lenses = session.exec(search_query.offset(skip).limit(limit)).all()
-        return lenses
\ No newline at end of file
+        return SearchService.with_fallback(session, Lens, run)
\ No newline at end of file
@@ -1,12 +1,14 @@
 from sqlmodel import Session, select
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from fastapi import HTTPException, status
-from model.mount import Mount
+from model.mount import Mount, MountResponse
 from model.brand import Brand
 from model.brand_mount import BrandMount
 from model.camera import Camera
 from model.lens import Lens
+from services.projection import select_columns, fetch_rows
 from services.validation_service import ValidationService
+from services.version_service import VersionService
 
 
 class MountService:
@@ -33,6 +35,7 @@ class MountService:
         )
         
         session.add(mount)
+        VersionService.bump(session, "mount")
         session.commit()
         session.refresh(mount)
         return mount
@@ -51,6 +54,17 @@ class MountService:
         mounts = session.exec(query).all()
         return mounts
 
+    @staticmethod
+    def get_mount_rows(session: Session, skip: int = 0, limit: int = 100, 
+                       is_active: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """获取卡口列表（投影模式，只查询 MountResponse 需要的列并返回字典）"""
+        query = select_columns(Mount, MountResponse)
+        
+        if is_active is not None:
+            query = query.where(Mount.is_active == is_active)
+        
+        return fetch_rows(session, query.offset(skip).limit(limit))
+
     @staticmethod
     def get_mount_by_id(session: Session, mount_id: int) -> Mount:
         """根据ID获取卡口"""
@@ -93,6 +107,7 @@ class MountService:
             mount.is_active = is_active
             
         session.add(mount)
+        VersionService.bump(session, "mount")
         session.commit()
         session.refresh(mount)
         return mount
@@ -124,6 +139,7 @@ class MountService:
             session.delete(brand_mount)
             
         session.delete(mount)
+        VersionService.bump(session, "mount", "brandmount")
         session.commit()
         return True
 
@@ -134,6 +150,7 @@ class MountService:
             
         mount.is_active = is_active
         session.add(mount)
+        VersionService.bump(session, "mount")
         session.commit()
         session.refresh(mount)
         return mount
@@ -178,6 +195,7 @@ class MountService:
         )
         
         session.add(brand_mount)
+        VersionService.bump(session, "brandmount")
         session.commit()
         session.refresh(brand_mount)
         return brand_mount
@@ -195,10 +213,29 @@ class MountService:
         ).first()
         
         session.delete(brand_mount)
+        VersionService.bump(session, "brandmount")
         session.commit()
         return True
 
     @staticmethod
     def get_mount_brands(session: Session, mount_id: int) -> List[Brand]:
         """获取支持该卡口的品牌列表"""
-        ValidationService.validate_mount_exists(session, mount_id)
\ No newline at end of file
+        ValidationService.validate_mount_exists(session, mount_id)
+        query = (
+            select(Brand)
+            .join(BrandMount, BrandMount.brand_id == Brand.id)
+            .where(BrandMount.mount_id == mount_id)
+        )
+        return session.exec(query).all()
+
+    @staticmethod
+    def get_mount_cameras(session: Session, mount_id: int) -> List[Camera]:
+        """获取使用该卡口的相机列表"""
+        ValidationService.validate_mount_exists(session, mount_id)
+        return session.exec(select(Camera).where(Camera.mount_id == mount_id)).all()
+
+    @staticmethod
+    def get_mount_lenses(session: Session, mount_id: int) -> List[Lens]:
+        """获取使用该卡口的镜头列表"""
+        ValidationService.validate_mount_exists(session, mount_id)
+        return session.exec(select(Lens).where(Lens.mount_id == mount_id)).all()
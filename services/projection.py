@@ -0,0 +1,44 @@
+"""
+列投影查询 - 只选择响应模型需要的列，直接返回字典行，不构建 ORM 对象
+"""
+from typing import Any, Dict, List, Type
+
+from sqlmodel import Session, SQLModel, select
+
+from model.brand import Brand
+from model.mount import Mount
+
+
+def response_columns(model_class: Type[SQLModel], response_class: Type[SQLModel]) -> List:
+    """获取响应模型字段对应的表列"""
+    return [
+        getattr(model_class, name)
+        for name in response_class.model_fields
+        if hasattr(model_class, name)
+    ]
+
+
+def select_columns(model_class: Type[SQLModel], response_class: Type[SQLModel], with_names: bool = False):
+    """
+    构建投影查询
+
+    Args:
+        model_class: 表模型（Camera、Lens 等）
+        response_class: 响应模型，决定选择哪些列
+        with_names: 是否通过一次显式 JOIN 附带 brand_name 和 mount_name
+    """
+    columns = response_columns(model_class, response_class)
+    if not with_names:
+        return select(*columns)
+
+    return (
+        select(*columns, Brand.name.label("brand_name"), Mount.name.label("mount_name"))
+        .select_from(model_class)
+        .outerjoin(Brand, Brand.id == model_class.brand_id)
+        .outerjoin(Mount, Mount.id == model_class.mount_id)
+    )
+
+
+def fetch_rows(session: Session, query) -> List[Dict[str, Any]]:
+    """执行投影查询并返回字典列表"""
+    return [dict(row) for row in session.exec(query).mappings()]
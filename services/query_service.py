@@ -1,31 +1,101 @@
-from typing import Type, List, Optional, Dict, Any, Union
+import base64
+import json
+import os
+import threading
+import time
+from datetime import date, datetime
+from enum import Enum
+from typing import Type, List, NamedTuple, Optional, Dict, Any, Tuple, Union
 from abc import ABC, abstractmethod
+from fastapi import HTTPException, status
 from sqlmodel import Session, select, func, SQLModel
-from sqlalchemy import and_, or_, asc, desc, text
+from sqlalchemy import and_, or_, asc, desc, text, case, cast, literal, null, union_all, Boolean, Date, DateTime, Float, Integer, String
 
-from model.query import BaseQueryParams, FilterCondition, FilterOperator, SortOrder, QueryResponse
+from model.query import BaseQueryParams, CountMode, FilterCondition, FilterOperator, SortOrder, QueryResponse
+from services.projection import select_columns, fetch_rows
+from services.search_service import SearchService
+from services.version_service import VersionService
+from utils.cache import ResultCache
+from utils.serialization import dumps
+
+
+class FacetDefinition(NamedTuple):
+    """分面定义"""
+    kind: str                  # terms: 按值计数；range: 最小/最大值和直方图
+    column: str                # 统计的字段
+    params: Tuple[str, ...]    # 该分面自身对应的过滤参数，统计时忽略
+
+
+# 范围分面的直方图分桶数
+FACET_BUCKETS = int(os.getenv("QUERY_FACET_BUCKETS", "10"))
+
+
+class _CountCache:
+    """按过滤条件签名缓存记录数（count=estimate 使用）"""
+    
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[int]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+    
+    def set(self, key: str, value: int) -> None:
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                # 先清理过期项，仍然超出时丢弃最早写入的一项
+                now = time.monotonic()
+                self._entries = {k: v for k, v in self._entries.items() if v[0] >= now}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+
+_count_cache = _CountCache(
+    ttl=float(os.getenv("QUERY_COUNT_CACHE_TTL", "60")),
+    max_entries=int(os.getenv("QUERY_COUNT_CACHE_SIZE", "1024"))
+)
+
+
+# 查询结果缓存，键中包含相关表的版本号，数据写入后自动失效
+query_cache = ResultCache(
+    max_entries=int(os.getenv("QUERY_CACHE_SIZE", "512")),
+    max_bytes=int(os.getenv("QUERY_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+)
 
 
 class QueryService(ABC):
     """通用查询服务基类"""
     
-    def __init__(self, model_class: Type[SQLModel]):
+    def __init__(self, model_class: Type[SQLModel], response_class: Type[SQLModel], dependent_tables: Tuple[str, ...]):
         self.model_class = model_class
+        self.response_class = response_class
+        # 查询结果依赖的表（包括 JOIN 带出名称的品牌和卡口表）
+        self.dependent_tables = dependent_tables
     
     def build_query(self, session: Session, params: BaseQueryParams):
         """构建查询"""
-        # 基础查询
-        query = select(self.model_class)
+        # 基础查询（投影响应字段，并通过一次 JOIN 带出品牌和卡口名称）
+        query = select_columns(self.model_class, self.response_class, with_names=True)
         
         # 构建过滤条件
         query = self._apply_filters(query, params)
         
         # 应用搜索
+        matches = self._get_search_matches(session, params)
         if params.search:
-            query = self._apply_search(query, params)
+            query = self._apply_search(query, params, matches)
         
-        # 应用排序
-        if params.sort_by:
+        if self._orders_by_relevance(params, matches):
+            # 全文搜索且未指定排序时按 BM25 相关度排序
+            query = query.order_by(matches.c.rank.nulls_last(), self.model_class.id)
+        else:
+            # 应用排序（始终以 id 作为次级排序，保证游标分页稳定）
             query = self._apply_sorting(query, params)
         
         return query
@@ -90,12 +160,30 @@ class QueryService(ABC):
         
         return None
     
-    def _apply_search(self, query, params: BaseQueryParams):
-        """应用搜索条件"""
+    def _get_search_matches(self, session: Session, params: BaseQueryParams):
+        """全文索引匹配子查询，不可用时返回 None"""
+        if not params.search:
+            return None
+        search_fields = params.search_fields or self._get_default_search_fields()
+        return SearchService.match_subquery(session, self.model_class, params.search, search_fields)
+    
+    def _orders_by_relevance(self, params: BaseQueryParams, matches) -> bool:
+        """是否按相关度排序（全文搜索、未指定排序字段且不是游标翻页）"""
+        return matches is not None and not params.sort_by and not params.cursor
+    
+    def _apply_search(self, query, params: BaseQueryParams, matches=None):
+        """
+        应用搜索条件，有全文索引时使用 FTS5，否则回退到 LIKE
+
+        使用全文索引时，search_fields 中不在索引中的字段仍以 LIKE 搜索，
+        与全文匹配为 OR 关系（只由 LIKE 匹配到的记录相关度为空，排在最后）
+        """
         if not params.search:
             return query
         
         search_fields = params.search_fields or self._get_default_search_fields()
+        if matches is not None:
+            search_fields = SearchService.like_fields(search_fields)
         search_conditions = []
         
         for field_name in search_fields:
@@ -103,24 +191,106 @@ class QueryService(ABC):
                 field = getattr(self.model_class, field_name)
                 search_conditions.append(field.ilike(f"%{params.search}%"))
         
+        if matches is not None:
+            if not search_conditions:
+                return query.join(matches, matches.c.rowid == self.model_class.id)
+            query = query.outerjoin(matches, matches.c.rowid == self.model_class.id)
+            search_conditions.append(matches.c.rowid.isnot(None))
+        
         if search_conditions:
             query = query.where(or_(*search_conditions))
         
         return query
     
+    def _get_sort_field_name(self, params: BaseQueryParams) -> str:
+        """获取排序字段名，未指定或字段无效时按 id 排序"""
+        if params.sort_by and params.sort_by in self.model_class.__table__.columns:
+            return params.sort_by
+        return "id"
+    
     def _apply_sorting(self, query, params: BaseQueryParams):
         """应用排序"""
-        if not params.sort_by or not hasattr(self.model_class, params.sort_by):
-            return query
+        field_name = self._get_sort_field_name(params)
+        field = getattr(self.model_class, field_name)
+        id_field = self.model_class.id
         
-        field = getattr(self.model_class, params.sort_by)
+        # NULL 视为最小值：升序排在最前，降序排在最后
+        if params.sort_order == SortOrder.ASC:
+            if field_name == "id":
+                return query.order_by(asc(id_field))
+            return query.order_by(asc(field).nulls_first(), asc(id_field))
+        
+        if field_name == "id":
+            return query.order_by(desc(id_field))
+        return query.order_by(desc(field).nulls_last(), desc(id_field))
+    
+    def _encode_cursor(self, params: BaseQueryParams, row: Dict[str, Any]) -> str:
+        """根据最后一行的排序键和 id 生成不透明游标"""
+        field_name = self._get_sort_field_name(params)
+        value = row.get(field_name)
+        if isinstance(value, Enum):
+            value = value.value
+        elif isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        payload = [field_name, params.sort_order.value, value, row["id"]]
+        raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+    
+    def _decode_cursor(self, params: BaseQueryParams):
+        """解析游标，返回 (排序值, id)；游标与当前排序不一致时抛出400异常"""
+        invalid = HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="无效的分页游标"
+        )
+        try:
+            raw = base64.urlsafe_b64decode(params.cursor + "=" * (-len(params.cursor) % 4))
+            field_name, sort_order, value, last_id = json.loads(raw)
+        except (ValueError, TypeError):
+            raise invalid
+        
+        if field_name != self._get_sort_field_name(params) or sort_order != params.sort_order.value:
+            raise invalid
+        if not isinstance(last_id, int):
+            raise invalid
+        
+        # 还原为列对应的 Python 类型
+        if value is not None:
+            column_type = self.model_class.__table__.columns[field_name].type
+            try:
+                if getattr(column_type, "enum_class", None) is not None:
+                    value = column_type.enum_class(value)
+                elif isinstance(column_type, DateTime):
+                    value = datetime.fromisoformat(value)
+                elif isinstance(column_type, Date):
+                    value = date.fromisoformat(value)
+            except (ValueError, TypeError):
+                raise invalid
+        
+        return value, last_id
+    
+    def _apply_cursor(self, query, params: BaseQueryParams):
+        """应用游标条件：只返回排在游标之后的记录"""
+        value, last_id = self._decode_cursor(params)
+        field_name = self._get_sort_field_name(params)
+        field = getattr(self.model_class, field_name)
+        id_field = self.model_class.id
         
         if params.sort_order == SortOrder.ASC:
-            query = query.order_by(asc(field))
+            if field_name == "id":
+                return query.where(id_field > last_id)
+            if value is None:
+                condition = or_(and_(field.is_(None), id_field > last_id), field.isnot(None))
+            else:
+                condition = or_(field > value, and_(field == value, id_field > last_id))
         else:
-            query = query.order_by(desc(field))
-        
-        return query
+            if field_name == "id":
+                return query.where(id_field < last_id)
+            if value is None:
+                condition = and_(field.is_(None), id_field < last_id)
+            else:
+                condition = or_(field < value, field.is_(None), and_(field == value, id_field < last_id))
+        
+        return query.where(condition)
     
     @abstractmethod
     def _build_model_specific_conditions(self, params: BaseQueryParams) -> List:
@@ -132,54 +302,250 @@ class QueryService(ABC):
         """获取默认搜索字段"""
         pass
     
-    def query_with_pagination(self, session: Session, params: BaseQueryParams) -> QueryResponse:
-        """执行分页查询"""
-        # 构建查询
-        query = self.build_query(session, params)
+    @abstractmethod
+    def _get_facet_definitions(self) -> Dict[str, FacetDefinition]:
+        """获取支持的分面"""
+        pass
+    
+    def _build_facet_branches(self, session: Session, params: BaseQueryParams, name: str, facet: FacetDefinition) -> List:
+        """构建单个分面的聚合查询（忽略该分面自身的过滤条件）"""
+        # 去掉自身过滤参数和针对该字段的自定义过滤条件
+        update = {field: None for field in facet.params}
+        if params.filters:
+            update["filters"] = [f for f in params.filters if f.field != facet.column] or None
+        facet_params = params.model_copy(update=update)
+        
+        def filtered(query):
+            query = self._apply_filters(query, facet_params)
+            if facet_params.search:
+                query = self._apply_search(query, facet_params, self._get_search_matches(session, facet_params))
+            return query
+        
+        column = getattr(self.model_class, facet.column)
+        facet_name = literal(name, String).label("facet")
+        no_value = cast(null(), Float)
+        
+        if facet.kind == "terms":
+            return [
+                filtered(
+                    select(facet_name, cast(column, String).label("value"), func.count().label("count"),
+                           no_value.label("low"), no_value.label("high"))
+                    .select_from(self.model_class)
+                ).group_by(column)
+            ]
+        
+        # 范围分面：一行统计最小/最大值，另一组按桶计数
+        stats = filtered(
+            select(facet_name, literal("__range__", String).label("value"), func.count(column).label("count"),
+                   cast(func.min(column), Float).label("low"), cast(func.max(column), Float).label("high"))
+            .select_from(self.model_class)
+        )
         
-        # 获取总数
+        low = filtered(select(func.min(column)).select_from(self.model_class)).scalar_subquery()
+        high = filtered(select(func.max(column)).select_from(self.model_class)).scalar_subquery()
+        scaled = (column - low) * FACET_BUCKETS / (high - low)
+        if session.get_bind().dialect.name != "sqlite":
+            # SQLite 的 CAST 直接截断，其他数据库需要先取整
+            scaled = func.floor(scaled)
+        index = case((high == low, 0), else_=cast(scaled, Integer))
+        bucket = case((index >= FACET_BUCKETS, FACET_BUCKETS - 1), else_=index)
+        buckets = filtered(
+            select(facet_name, cast(bucket, String).label("value"), func.count().label("count"),
+                   no_value.label("low"), no_value.label("high"))
+            .select_from(self.model_class)
+            .where(column.isnot(None))
+        ).group_by(bucket)
+        
+        return [stats, buckets]
+    
+    def _decode_facet_value(self, column_name: str, value: Optional[str]):
+        """将分面统计中转换为字符串的值还原为字段类型"""
+        if value is None:
+            return None
+        column_type = self.model_class.__table__.columns[column_name].type
+        enum_class = getattr(column_type, "enum_class", None)
+        if enum_class is not None:
+            member = enum_class.__members__.get(value)
+            return member.value if member is not None else value
+        if isinstance(column_type, Boolean):
+            return value.lower() in ("1", "true", "t")
+        if isinstance(column_type, Integer):
+            return int(value)
+        return value
+    
+    def compute_facets(self, session: Session, params: BaseQueryParams) -> Dict[str, Any]:
+        """
+        统计分面，所有分面通过一条 UNION ALL 语句完成
+        
+        Returns:
+            terms 分面: [{"value": 值, "count": 数量}]，按数量降序
+            range 分面: {"min", "max", "count", "buckets": [{"min", "max", "count"}]}
+        """
+        definitions = self._get_facet_definitions()
+        requested = {name: definitions[name] for name in (params.facets or []) if name in definitions}
+        if not requested:
+            return {}
+        
+        branches = []
+        for name, facet in requested.items():
+            branches.extend(self._build_facet_branches(session, params, name, facet))
+        rows = session.exec(union_all(*branches)).all()
+        
+        terms: Dict[str, List[Dict[str, Any]]] = {}
+        ranges: Dict[str, Dict[str, Any]] = {}
+        bucket_counts: Dict[str, Dict[int, int]] = {}
+        for facet_name, value, count, low, high in rows:
+            facet = requested[facet_name]
+            if facet.kind == "terms":
+                terms.setdefault(facet_name, []).append(
+                    {"value": self._decode_facet_value(facet.column, value), "count": count}
+                )
+            elif value == "__range__":
+                ranges[facet_name] = {"min": low, "max": high, "count": count}
+            else:
+                bucket_counts.setdefault(facet_name, {})[int(value)] = count
+        
+        result: Dict[str, Any] = {}
+        for name, facet in requested.items():
+            if facet.kind == "terms":
+                result[name] = sorted(terms.get(name, []), key=lambda item: item["count"], reverse=True)
+                continue
+            
+            stats = ranges.get(name, {"min": None, "max": None, "count": 0})
+            buckets = []
+            if stats["min"] is not None:
+                width = (stats["max"] - stats["min"]) / FACET_BUCKETS
+                counts = bucket_counts.get(name, {})
+                for index in range(FACET_BUCKETS if width else 1):
+                    buckets.append({
+                        "min": stats["min"] + index * width,
+                        "max": stats["min"] + (index + 1) * width if width else stats["max"],
+                        "count": counts.get(index, 0)
+                    })
+            result[name] = {**stats, "buckets": buckets}
+        
+        return result
+    
+    def _get_filter_signature(self, params: BaseQueryParams) -> str:
+        """过滤条件签名：只包含影响结果集的参数，不含分页和排序"""
+        filters = params.model_dump(
+            mode="json",
+            exclude={"skip", "limit", "cursor", "sort_by", "sort_order", "count", "facets"},
+            exclude_none=True
+        )
+        return f"{self.model_class.__tablename__}:{json.dumps(filters, sort_keys=True, ensure_ascii=False)}"
+    
+    def count(self, session: Session, params: BaseQueryParams) -> int:
+        """统计符合过滤和搜索条件的记录数"""
         count_query = select(func.count(self.model_class.id))
         count_query = self._apply_filters(count_query, params)
         if params.search:
-            count_query = self._apply_search(count_query, params)
-        
-        total = session.scalar(count_query)
-        
-        # 应用分页
-        query = query.offset(params.skip).limit(params.limit)
-        
-        # 执行查询
-        items = session.exec(query).all()
-        
-        # 转换为字典
-        data = []
-        for item in items:
-            item_dict = item.model_dump()
-            # 添加关联数据
-            if hasattr(item, 'brand') and item.brand:
-                item_dict['brand_name'] = item.brand.name
-            if hasattr(item, 'mount') and item.mount:
-                item_dict['mount_name'] = item.mount.name
-            data.append(item_dict)
-        
-        # 计算是否有更多数据
-        has_more = (params.skip + params.limit) < total
-        
-        return QueryResponse(
-            data=data,
-            total=total,
-            skip=params.skip,
-            limit=params.limit,
-            has_more=has_more
+            count_query = self._apply_search(count_query, params, self._get_search_matches(session, params))
+        
+        return session.scalar(count_query)
+    
+    def estimate_count(self, session: Session, params: BaseQueryParams) -> int:
+        """按过滤条件签名缓存的记录数，缓存过期前不再重复统计"""
+        signature = self._get_filter_signature(params)
+        total = _count_cache.get(signature)
+        if total is None:
+            total = self.count(session, params)
+            _count_cache.set(signature, total)
+        return total
+    
+    def _get_cache_key(self, session: Session, params: BaseQueryParams) -> Tuple:
+        """结果缓存键：完整查询参数 + 相关表版本号"""
+        signature = params.model_dump(mode="json", exclude_none=True)
+        for name, value in signature.items():
+            # 多值参数与顺序无关
+            if isinstance(value, list) and name != "filters":
+                signature[name] = sorted(value, key=str)
+        return (
+            self.model_class.__tablename__,
+            VersionService.get_versions(session, self.dependent_tables),
+            json.dumps(signature, sort_keys=True, ensure_ascii=False)
         )
+    
+    def query_with_pagination(self, session: Session, params: BaseQueryParams) -> QueryResponse:
+        """执行分页查询"""
+        return QueryResponse(**self._execute_search_pagination(session, params))
+    
+    def query_json(self, session: Session, params: BaseQueryParams) -> bytes:
+        """执行分页查询并编码为 QueryResponse 格式的 JSON，结果按参数和数据版本缓存"""
+        key = self._get_cache_key(session, params)
+        body = query_cache.get(key)
+        if body is None:
+            body = dumps(self._execute_search_pagination(session, params))
+            query_cache.set(key, body, size=len(body))
+        return body
+    
+    def _execute_search_pagination(self, session: Session, params: BaseQueryParams) -> Dict[str, Any]:
+        """执行分页查询，全文索引在运行期间失效时重新检查并回退到 LIKE"""
+        if not params.search:
+            return self._execute_pagination(session, params)
+        return SearchService.with_fallback(session, self.model_class, lambda: self._execute_pagination(session, params))
+    
+    def _execute_pagination(self, session: Session, params: BaseQueryParams) -> Dict[str, Any]:
+        """执行分页查询，返回 QueryResponse 字段组成的字典"""
+        # 构建查询
+        query = self.build_query(session, params)
+        
+        # exact 且不使用游标时，通过窗口函数在同一条语句中带出总数
+        window_total = params.count == CountMode.EXACT and not params.cursor
+        if window_total:
+            query = query.add_columns(func.count().over().label("_total"))
+        
+        # 应用分页：有游标时按排序键定位（忽略 skip），否则使用 offset
+        if params.cursor:
+            query = self._apply_cursor(query, params)
+        else:
+            query = query.offset(params.skip)
+        
+        if window_total:
+            data = fetch_rows(session, query.limit(params.limit))
+            if data:
+                total = data[0]["_total"]
+                for row in data:
+                    del row["_total"]
+            else:
+                # 当前页为空时窗口函数没有返回行，单独统计
+                total = self.count(session, params) if params.skip else 0
+            has_more = (params.skip + params.limit) < total
+        else:
+            # 多取一行判断是否还有更多数据
+            data = fetch_rows(session, query.limit(params.limit + 1))
+            has_more = len(data) > params.limit
+            data = data[:params.limit]
+            
+            if params.count == CountMode.EXACT:
+                total = self.count(session, params)
+            elif params.count == CountMode.ESTIMATE:
+                total = self.estimate_count(session, params)
+            else:
+                total = None
+        
+        # 生成下一页游标（按相关度排序时不支持游标）
+        next_cursor = None
+        if has_more and data and not self._orders_by_relevance(params, self._get_search_matches(session, params)):
+            next_cursor = self._encode_cursor(params, data[-1])
+        
+        return {
+            "data": data,
+            "total": total,
+            "skip": params.skip,
+            "limit": params.limit,
+            "has_more": has_more,
+            "next_cursor": next_cursor,
+            "facets": self.compute_facets(session, params) if params.facets else None
+        }
 
 
 class CameraQueryService(QueryService):
     """相机查询服务"""
     
     def __init__(self):
-        from model.camera import Camera
-        super().__init__(Camera)
+        from model.camera import Camera, CameraResponse
+        super().__init__(Camera, CameraResponse, ("camera", "brand", "mount"))
     
     def _build_model_specific_conditions(self, params) -> List:
         """构建相机特定的过滤条件"""
@@ -259,14 +625,29 @@ class CameraQueryService(QueryService):
     def _get_default_search_fields(self) -> List[str]:
         """获取相机默认搜索字段"""
         return ['model', 'series', 'description']
+    
+    def _get_facet_definitions(self) -> Dict[str, FacetDefinition]:
+        """获取相机支持的分面"""
+        return {
+            'brand_id': FacetDefinition('terms', 'brand_id', ('brand_id', 'brand_ids')),
+            'mount_id': FacetDefinition('terms', 'mount_id', ('mount_id', 'mount_ids')),
+            'sensor_size': FacetDefinition('terms', 'sensor_size', ('sensor_size', 'sensor_sizes')),
+            'has_wifi': FacetDefinition('terms', 'has_wifi', ('has_wifi',)),
+            'has_bluetooth': FacetDefinition('terms', 'has_bluetooth', ('has_bluetooth',)),
+            'has_hot_shoe': FacetDefinition('terms', 'has_hot_shoe', ('has_hot_shoe',)),
+            'has_built_in_flash': FacetDefinition('terms', 'has_built_in_flash', ('has_built_in_flash',)),
+            'megapixels': FacetDefinition('range', 'megapixels', ('megapixels_min', 'megapixels_max')),
+            'price': FacetDefinition('range', 'release_price', ('price_min', 'price_max')),
+            'weight': FacetDefinition('range', 'weight', ('weight_min', 'weight_max')),
+        }
 
 
 class LensQueryService(QueryService):
     """镜头查询服务"""
     
     def __init__(self):
-        from model.lens import Lens
-        super().__init__(Lens)
+        from model.lens import Lens, LensResponse
+        super().__init__(Lens, LensResponse, ("lens", "brand", "mount"))
     
     def _build_model_specific_conditions(self, params) -> List:
         """构建镜头特定的过滤条件"""
@@ -360,4 +741,19 @@ class LensQueryService(QueryService):
     
     def _get_default_search_fields(self) -> List[str]:
         """获取镜头默认搜索字段"""
-        return ['model', 'series', 'description']
\ No newline at end of file
+        return ['model', 'series', 'description']
+    
+    def _get_facet_definitions(self) -> Dict[str, FacetDefinition]:
+        """获取镜头支持的分面"""
+        return {
+            'brand_id': FacetDefinition('terms', 'brand_id', ('brand_id', 'brand_ids')),
+            'mount_id': FacetDefinition('terms', 'mount_id', ('mount_id', 'mount_ids')),
+            'lens_type': FacetDefinition('terms', 'lens_type', ('lens_type', 'lens_types')),
+            'focus_type': FacetDefinition('terms', 'focus_type', ('focus_type', 'focus_types')),
+            'has_stabilization': FacetDefinition('terms', 'has_stabilization', ('has_stabilization',)),
+            'is_constant_aperture': FacetDefinition('terms', 'is_constant_aperture', ('is_constant_aperture',)),
+            'aperture': FacetDefinition('range', 'max_aperture_min', ('aperture_min', 'aperture_max')),
+            'price': FacetDefinition('range', 'release_price', ('price_min', 'price_max')),
+            'weight': FacetDefinition('range', 'weight', ('weight_min', 'weight_max')),
+            'filter_size': FacetDefinition('range', 'filter_size', ('filter_size_min', 'filter_size_max')),
+        }
\ No newline at end of file
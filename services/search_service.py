@@ -0,0 +1,141 @@
+"""
+全文搜索服务 - 基于 SQLite FTS5 全文索引，结果按 BM25 相关度排序
+"""
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Type, TypeVar
+
+from sqlalchemy import column, func, inspect, literal_column, table, text
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, SQLModel, select
+
+from database.fts import FTS_COLUMNS, FTS_TABLES
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 索引表不存在的检查结果保留的秒数，之后重新检查（运行期间执行迁移创建索引后自动启用）
+FTS_RECHECK_SECONDS = float(os.getenv("FTS_RECHECK_SECONDS", "60"))
+
+
+class SearchService:
+    """全文搜索服务类，FTS5 不可用或关键词过短时返回 None，由调用方回退到 LIKE 搜索"""
+
+    # trigram 分词器只能匹配不少于3个字符的片段
+    MIN_TERM_LENGTH = 3
+
+    # (数据库URL, 索引表) -> (索引表是否存在, 检查时间)
+    _availability: Dict[Tuple[str, str], Tuple[bool, float]] = {}
+    # 保护 _availability 的读取-判断-写入（请求在线程池中并发执行）
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _key(session: Session, model_class: Type[SQLModel]) -> Optional[Tuple[str, str]]:
+        fts_table = FTS_TABLES.get(model_class.__tablename__)
+        bind = session.get_bind()
+        if fts_table is None or bind.dialect.name != "sqlite":
+            return None
+        return str(bind.url), fts_table
+
+    @staticmethod
+    def is_available(session: Session, model_class: Type[SQLModel]) -> bool:
+        """
+        检查当前数据库是否存在该模型的全文索引
+
+        存在的结果一直保留，直到使用索引的查询失败（见 with_fallback）；
+        不存在的结果 FTS_RECHECK_SECONDS 秒后重新检查。
+        """
+        key = SearchService._key(session, model_class)
+        if key is None:
+            return False
+
+        with SearchService._lock:
+            cached = SearchService._availability.get(key)
+        if cached is None or (not cached[0] and time.monotonic() - cached[1] > FTS_RECHECK_SECONDS):
+            # 检查在锁外进行，不让一次数据库查询阻塞其他请求；并发的检查结果相同，后写入的覆盖即可
+            cached = (inspect(session.get_bind()).has_table(key[1]), time.monotonic())
+            with SearchService._lock:
+                SearchService._availability[key] = cached
+        return cached[0]
+
+    @staticmethod
+    def with_fallback(session: Session, model_class: Type[SQLModel], run: Callable[[], T]) -> T:
+        """
+        执行可能使用全文索引的查询 run()
+
+        使用了全文索引且查询失败（如索引表在运行期间被删除）时，重新检查索引是否存在并再执行一次：
+        索引已不存在时改用 LIKE 搜索，仍然存在时抛出原来的错误。
+        """
+        try:
+            return run()
+        except OperationalError:
+            key = SearchService._key(session, model_class)
+            if key is None:
+                raise
+            with SearchService._lock:
+                cached = SearchService._availability.get(key)
+                if cached is not None and not cached[0]:
+                    raise
+                # 并发失败的查询可能已经清除了检查结果
+                SearchService._availability.pop(key, None)
+            logger.warning(f"Full-text query on {key[1]} failed, re-checking index availability")
+            return run()
+
+    @staticmethod
+    def build_match_expression(term: str, fields: Optional[List[str]] = None) -> Optional[str]:
+        """
+        将搜索关键词转换为 FTS5 MATCH 表达式
+
+        关键词按空白拆分，每个片段作为短语匹配，片段之间为 AND 关系。
+        fields 中不在全文索引中的字段不参与匹配（由调用方以 LIKE 搜索，见 like_fields）。
+        任一片段短于 MIN_TERM_LENGTH 或没有可索引的字段时返回 None。
+        """
+        tokens = term.split()
+        if not tokens or any(len(token) < SearchService.MIN_TERM_LENGTH for token in tokens):
+            return None
+
+        columns = [field for field in (fields or FTS_COLUMNS) if field in FTS_COLUMNS]
+        if not columns:
+            return None
+
+        phrases = " AND ".join('"' + token.replace('"', '""') + '"' for token in tokens)
+        if len(columns) == len(FTS_COLUMNS):
+            return phrases
+        return "{" + " ".join(columns) + "} : (" + phrases + ")"
+
+    @staticmethod
+    def like_fields(fields: List[str]) -> List[str]:
+        """搜索字段中不在全文索引中的字段，使用全文索引时这些字段仍以 LIKE 搜索"""
+        return [field for field in fields if field not in FTS_COLUMNS]
+
+    @staticmethod
+    def match_subquery(
+        session: Session,
+        model_class: Type[SQLModel],
+        term: str,
+        fields: Optional[List[str]] = None
+    ):
+        """
+        构建全文匹配子查询，包含 rowid（即记录 id）和 rank（BM25，越小越相关）两列
+
+        Returns:
+            Subquery 或 None（无法使用全文索引时）
+        """
+        if not SearchService.is_available(session, model_class):
+            return None
+
+        match = SearchService.build_match_expression(term, fields)
+        if match is None:
+            return None
+
+        fts_table = FTS_TABLES[model_class.__tablename__]
+        fts = table(fts_table, column("rowid"))
+        return (
+            select(fts.c.rowid, func.bm25(literal_column(fts_table)).label("rank"))
+            .select_from(fts)
+            .where(text(f"{fts_table} MATCH :match").bindparams(match=match))
+            .subquery("fts_match")
+        )
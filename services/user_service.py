@@ -82,6 +82,11 @@ class UserService:
         """根据ID获取用户"""
         return ValidationService.validate_user_exists(session, user_id)
     
+    @staticmethod
+    def get_user_by_username(session: Session, username: str) -> Optional[User]:
+        """根据用户名获取用户，不存在时返回 None"""
+        return session.exec(select(User).where(User.username == username)).first()
+    
     @staticmethod
     def update_user(session: Session, user: User, user_update: UserUpdate) -> User:
         """更新用户信息"""
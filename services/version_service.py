@@ -0,0 +1,74 @@
+"""
+数据版本服务 - 每张表一个版本号，写入时在同一事务内递增
+
+查询结果缓存和 ETag 以相关表的版本号作为计算依据，
+版本号存放在数据库中，多个工作进程之间也能正确失效。
+同一事务内读取到的版本号缓存在 session.info 中，事务结束时清除。
+"""
+from typing import Iterable, Tuple
+
+from sqlalchemy import event, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+
+from model.table_version import TableVersion
+
+
+_INFO_KEY = "table_versions"
+
+# 支持 INSERT ... ON CONFLICT 的数据库
+_UPSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _clear_cached_versions(session, transaction) -> None:
+    """事务结束后其他连接可能已写入，丢弃缓存的版本号"""
+    if transaction.parent is None:
+        session.info.pop(_INFO_KEY, None)
+
+
+class VersionService:
+    """数据版本服务类"""
+
+    @staticmethod
+    def bump(session: Session, *tables: str) -> None:
+        """
+        递增表版本号，需在写入数据的事务提交前调用
+
+        通过一条 INSERT ... ON CONFLICT(name) DO UPDATE 完成：表第一次写入时两个事务并发递增，
+        不会因为都没有更新到行而重复插入（主键冲突）
+        """
+        names = list(dict.fromkeys(tables))
+        dialect = session.get_bind().dialect.name
+        if names and dialect in _UPSERT_DIALECTS:
+            statement = _UPSERT_DIALECTS[dialect](TableVersion).values([{"name": name, "version": 1} for name in names])
+            session.exec(statement.on_conflict_do_update(
+                index_elements=[TableVersion.name], set_={"version": TableVersion.version + 1}
+            ))
+            session.info.pop(_INFO_KEY, None)
+            return
+
+        for name in names:
+            result = session.exec(
+                update(TableVersion)
+                .where(TableVersion.name == name)
+                .values(version=TableVersion.version + 1)
+            )
+            if result.rowcount == 0:
+                session.add(TableVersion(name=name, version=1))
+        session.flush()
+        session.info.pop(_INFO_KEY, None)
+
+    @staticmethod
+    def get_versions(session: Session, tables: Iterable[str]) -> Tuple[int, ...]:
+        """按给定顺序返回表版本号，未写入过的表为0"""
+        tables = tuple(tables)
+        cached = session.info.setdefault(_INFO_KEY, {})
+        missing = [name for name in tables if name not in cached]
+        if missing:
+            rows = session.exec(
+                select(TableVersion.name, TableVersion.version).where(TableVersion.name.in_(missing))
+            ).all()
+            cached.update({name: 0 for name in missing})
+            cached.update(dict(rows))
+        return tuple(cached[name] for name in tables)
@@ -0,0 +1,73 @@
+"""
+测试配置 - 导入应用之前设置环境变量
+
+- 临时 SQLite 数据库和导入文件目录，测试结束后删除
+- SQL_STRICT：请求执行的语句数超出上限时直接失败
+- 导入每批 2 行、不使用映射进程池，几行数据即可覆盖逐批提交
+"""
+import os
+import shutil
+import sys
+import tempfile
+from itertools import count
+
+_tmp = tempfile.mkdtemp(prefix="camera-db-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'test.db')}"
+os.environ["IMPORT_SPOOL_DIR"] = os.path.join(_tmp, "imports")
+os.environ["SQL_STRICT"] = "true"
+os.environ["IMPORT_CHUNK_SIZE"] = "2"
+os.environ["IMPORT_PROCESSES"] = "1"
+os.environ.pop("DATABASE_REPLICA_URLS", None)
+os.environ.pop("DB_ASYNC", None)
+
+# 应用以相对路径挂载静态文件
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+import main
+from database.engine import engine
+from model.user import User, UserRole
+from services.user_service import hash_password
+
+_names = count(1)
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(main.app) as test_client:
+        yield test_client
+    shutil.rmtree(_tmp, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    """管理员的认证请求头"""
+    with Session(engine) as session:
+        session.add(User(username="admin", hash_password=hash_password("secret1"), role=UserRole.ADMIN, is_active=True))
+        session.commit()
+    response = client.post("/api/v1/auth/login", data={"username": "admin", "password": "secret1"})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def unique_name():
+    """生成本次测试运行中唯一的名称（各测试共用一个数据库）"""
+    return lambda prefix: f"{prefix}{next(_names)}"
+
+
+@pytest.fixture
+def catalog(client, admin_headers, unique_name):
+    """新建一个品牌和卡口，返回 (品牌名称, 品牌ID, 卡口名称, 卡口ID)"""
+    brand, mount = unique_name("Brand"), unique_name("Mount")
+    response = client.post("/api/v1/brands/", json={"name": brand, "country": "JP", "brand_type": "camera"}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    brand_id = response.json()["id"]
+    response = client.post("/api/v1/mounts/", json={"name": mount, "flange_distance": 20}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    return brand, brand_id, mount, response.json()["id"]
@@ -0,0 +1,62 @@
+"""游标翻页：排序字段可为空时逐页遍历不重复、不遗漏"""
+import pytest
+
+# 型号 -> 重量（None 表示未填写），相同重量的行按 id 排序
+WEIGHTS = [650.0, None, 500.0, None, 650.0, 720.0, None, 500.0]
+
+
+@pytest.fixture
+def cameras(client, admin_headers, catalog):
+    """新品牌下的一组相机，部分没有重量；返回 (品牌ID, 型号 -> 重量)"""
+    brand, brand_id, mount, _ = catalog
+    weights = {f"{brand}-{i}": weight for i, weight in enumerate(WEIGHTS)}
+    csv = "品牌,卡口,型号,重量\n" + "".join(
+        f"{brand},{mount},{model},{'' if weight is None else weight}\n" for model, weight in weights.items()
+    )
+    response = client.post("/api/v1/cameras/import", content=csv.encode(), headers={**admin_headers, "Content-Type": "text/csv"})
+    assert response.json()["summary"]["inserted"] == len(WEIGHTS)
+    return brand_id, weights
+
+
+def _walk(client, url: str):
+    """沿 next_cursor 取完所有页，返回各页的行"""
+    pages, cursor = [], None
+    while True:
+        response = client.get(url + (f"&cursor={cursor}" if cursor else ""))
+        assert response.status_code == 200, response.text
+        body = response.json()
+        pages.append(body["data"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            assert not body["has_more"]
+            return pages
+        assert len(pages) <= len(WEIGHTS), "游标没有前进"
+
+
+def _sort_key(row, descending: bool):
+    # 升序时空值在前，降序时空值在后；相同值按 id 同向排序
+    weight, row_id = row["weight"], row["id"]
+    if descending:
+        return (weight is None, -(weight or 0), -row_id)
+    return (weight is not None, weight or 0, row_id)
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+@pytest.mark.parametrize("limit", [1, 2, 3])
+def test_cursor_walk_over_nullable_sort_column(client, cameras, order, limit):
+    brand_id, weights = cameras
+    pages = _walk(client, f"/api/v1/cameras/query?brand_id={brand_id}&sort_by=weight&sort_order={order}&limit={limit}&count=none")
+    rows = [row for page in pages for row in page]
+
+    assert sorted(row["model"] for row in rows) == sorted(weights)
+    assert {row["model"]: row["weight"] for row in rows} == weights
+    assert rows == sorted(rows, key=lambda row: _sort_key(row, order == "desc"))
+    assert all(len(page) == limit for page in pages[:-1])
+
+
+def test_cursor_from_another_sort_is_rejected(client, cameras):
+    brand_id, _ = cameras
+    response = client.get(f"/api/v1/cameras/query?brand_id={brand_id}&sort_by=weight&limit=2&count=none")
+    cursor = response.json()["next_cursor"]
+    response = client.get(f"/api/v1/cameras/query?brand_id={brand_id}&sort_by=weight&sort_order=desc&limit=2&cursor={cursor}")
+    assert response.status_code == 400
@@ -0,0 +1,56 @@
+"""目录接口的 ETag 和条件请求"""
+
+
+def _queries(response) -> int:
+    """Server-Timing 响应头中的语句数"""
+    return int(response.headers["server-timing"].split('db-queries;desc="')[1].split('"')[0])
+
+
+def test_matching_if_none_match_returns_304(client, catalog):
+    _, _, _, mount_id = catalog
+    url = f"/api/v1/mounts/{mount_id}"
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"].startswith("public")
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    # 弱比较：W/ 前缀和列表中的其他值不影响匹配
+    response = client.get(url, headers={"If-None-Match": f'"other", W/{etag}'})
+    assert response.status_code == 304
+
+
+def test_304_skips_the_route_queries(client, catalog):
+    _, _, _, mount_id = catalog
+    url = f"/api/v1/mounts/{mount_id}"
+    response = client.get(url)
+    full = _queries(response)
+    response = client.get(url, headers={"If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
+    # 只读取版本号，不执行接口中的查询
+    assert _queries(response) < full
+
+
+def test_write_changes_the_etag(client, admin_headers, catalog, unique_name):
+    url = "/api/v1/mounts/"
+    etag = client.get(url).headers["etag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    response = client.post("/api/v1/mounts/", json={"name": unique_name("Mount"), "flange_distance": 18}, headers=admin_headers)
+    assert response.status_code == 200
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_etag_depends_on_query_parameters(client, catalog):
+    first = client.get("/api/v1/mounts/?limit=5").headers["etag"]
+    second = client.get("/api/v1/mounts/?limit=6").headers["etag"]
+    assert first != second
+    # 参数顺序不影响 ETag
+    assert client.get("/api/v1/mounts/?skip=0&limit=5").headers["etag"] == client.get("/api/v1/mounts/?limit=5&skip=0").headers["etag"]
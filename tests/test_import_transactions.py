@@ -0,0 +1,139 @@
+"""导入的提交和回滚：同步导入整体提交或整体回滚，后台任务逐批提交"""
+import threading
+import time
+
+import orjson
+import pytest
+from sqlmodel import Session, func, select
+
+import services.import_service as import_service
+from database.engine import engine
+from model.brand import Brand
+from model.import_job import ImportJobStatus
+
+# 每批行数（conftest 中设置 IMPORT_CHUNK_SIZE）
+CHUNK = import_service.CHUNK_SIZE
+
+
+def _count(prefix: str) -> int:
+    with Session(engine) as session:
+        return session.exec(select(func.count()).select_from(Brand).where(Brand.name.like(f"{prefix}%"))).one()
+
+
+def _ndjson(names, broken_at=None) -> bytes:
+    """每行一个品牌；broken_at 指定的行（从 1 开始）不是有效的 JSON"""
+    lines = [orjson.dumps({"品牌名称": name}) for name in names]
+    if broken_at is not None:
+        lines.insert(broken_at - 1, b"{not json")
+    return b"\n".join(lines) + b"\n"
+
+
+def _import(client, headers, body: bytes, query: str = ""):
+    return client.post(
+        f"/api/v1/brands/import{query}", content=body,
+        headers={**headers, "Content-Type": "application/x-ndjson"}
+    )
+
+
+def _wait(client, headers, job_id: int, timeout: float = 10):
+    """等待后台任务结束，返回任务状态"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/v1/imports/{job_id}", headers=headers).json()
+        if job["status"] not in (ImportJobStatus.PENDING.value, ImportJobStatus.RUNNING.value):
+            return job
+        time.sleep(0.05)
+    pytest.fail(f"导入任务 {job_id} 未在 {timeout} 秒内结束")
+
+
+def test_row_failures_do_not_roll_back_other_rows(client, admin_headers, unique_name):
+    prefix = unique_name("Rows")
+    names = [f"{prefix}-{i}" for i in range(5)]
+    names[3] = names[1]  # 文件内重复
+    response = _import(client, admin_headers, _ndjson(names))
+    assert response.status_code == 200
+    summary = response.json()["summary"]
+    assert (summary["inserted"], summary["failure"]) == (4, 1)
+    assert _count(prefix) == 4
+
+
+def test_sync_import_rolls_back_entirely_when_the_file_breaks(client, admin_headers, unique_name):
+    # 错误出现在已写入两批之后，同步导入不保留任何一批
+    prefix = unique_name("Sync")
+    body = _ndjson([f"{prefix}-{i}" for i in range(CHUNK * 3)], broken_at=CHUNK * 2 + 1)
+    response = _import(client, admin_headers, body)
+    assert response.status_code == 200
+    assert response.json()["success"] is False
+    assert _count(prefix) == 0
+
+
+def test_stream_import_rolls_back_entirely_when_the_file_breaks(client, admin_headers, unique_name):
+    prefix = unique_name("Stream")
+    body = _ndjson([f"{prefix}-{i}" for i in range(CHUNK * 3)], broken_at=CHUNK * 2 + 1)
+    response = _import(client, admin_headers, body, "?results=stream")
+    lines = [orjson.loads(line) for line in response.content.splitlines()]
+    # 已输出的逐行结果之后，最后一行报告读取失败
+    assert lines[-1]["success"] is False
+    assert _count(prefix) == 0
+
+
+def test_dry_run_writes_nothing(client, admin_headers, unique_name):
+    prefix = unique_name("Dry")
+    response = _import(client, admin_headers, _ndjson([f"{prefix}-{i}" for i in range(CHUNK * 2)]), "?dry_run=true")
+    assert response.json()["summary"]["inserted"] == CHUNK * 2
+    assert _count(prefix) == 0
+
+
+def test_background_import_keeps_committed_chunks_when_the_file_breaks(client, admin_headers, unique_name):
+    prefix = unique_name("Background")
+    body = _ndjson([f"{prefix}-{i}" for i in range(CHUNK * 3)], broken_at=CHUNK * 2 + 1)
+    response = _import(client, admin_headers, body, "?background=true")
+    assert response.status_code == 202
+    job = _wait(client, admin_headers, response.json()["id"])
+
+    assert job["status"] == ImportJobStatus.FAILED.value
+    # 逐批提交：出错之前读完的批次已提交，出错的批次回滚
+    committed = _count(prefix)
+    assert 0 < committed < CHUNK * 2 + 1
+    assert committed % CHUNK == 0
+    assert job["checkpoint_row"] == committed
+
+
+def test_background_import_commits_every_chunk(client, admin_headers, unique_name):
+    prefix = unique_name("Chunks")
+    response = _import(client, admin_headers, _ndjson([f"{prefix}-{i}" for i in range(CHUNK * 3)]), "?background=true")
+    job = _wait(client, admin_headers, response.json()["id"])
+    assert job["status"] == ImportJobStatus.SUCCEEDED.value
+    assert job["success_rows"] == CHUNK * 3
+    assert _count(prefix) == CHUNK * 3
+
+
+def test_cancel_running_job_rolls_back_only_the_current_chunk(client, admin_headers, unique_name, monkeypatch):
+    # 第二批映射时暂停，期间取消任务：第一批已提交，第二批在提交前回滚，之后的批次不再执行
+    prefix = unique_name("Cancel")
+    paused, resume = threading.Event(), threading.Event()
+    map_chunk = import_service.map_chunk
+    calls = []
+
+    def pausing_map_chunk(chunk, spec, indexes=None):
+        calls.append(len(chunk))
+        if len(calls) == 2:
+            paused.set()
+            resume.wait(10)
+        return map_chunk(chunk, spec, indexes)
+
+    monkeypatch.setattr(import_service, "map_chunk", pausing_map_chunk)
+    response = _import(client, admin_headers, _ndjson([f"{prefix}-{i}" for i in range(CHUNK * 4)]), "?background=true")
+    job_id = response.json()["id"]
+    assert paused.wait(10)
+
+    response = client.post(f"/api/v1/imports/{job_id}/cancel", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json()["cancel_requested"] is True
+    resume.set()
+
+    job = _wait(client, admin_headers, job_id)
+    assert job["status"] == ImportJobStatus.CANCELLED.value
+    assert _count(prefix) == CHUNK
+    assert job["checkpoint_row"] == CHUNK
+    assert len(calls) == 2
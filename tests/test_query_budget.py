@@ -0,0 +1,76 @@
+"""SQL 语句数上限（query_budget）在严格模式下的行为"""
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from database import instrumentation
+from database.instrumentation import QueryBudgetExceeded, SQLInstrumentationMiddleware, query_budget
+from database.session import Database, get_db
+
+
+def _queries(response) -> int:
+    """Server-Timing 响应头中的语句数"""
+    return int(response.headers["server-timing"].split('db-queries;desc="')[1].split('"')[0])
+
+
+def _execute(session, statements: int) -> None:
+    for _ in range(statements):
+        session.execute(text("SELECT 1"))
+
+
+@pytest.fixture
+def budget_client():
+    """只有一个路由的应用：执行 n 条语句，语句数上限为 3"""
+    app = FastAPI()
+    app.add_middleware(SQLInstrumentationMiddleware)
+
+    @app.get("/statements/{n}", dependencies=[Depends(query_budget(3))])
+    async def statements(n: int, db: Database = Depends(get_db)):
+        await db.run(_execute, n)
+        return {"n": n}
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_strict_mode_is_enabled():
+    assert instrumentation.SQL_STRICT
+
+
+def test_within_budget(budget_client):
+    response = budget_client.get("/statements/2")
+    assert response.status_code == 200
+    # SQLite 显式发出的 BEGIN 也计为一条语句
+    assert _queries(response) == 3
+
+
+def test_over_budget_fails_in_strict_mode(budget_client):
+    with pytest.raises(QueryBudgetExceeded):
+        budget_client.get("/statements/5")
+
+
+def test_query_budget_none_lifts_the_limit_for_imports(client, admin_headers, unique_name):
+    # 每批 2 行，60 行的导入执行的语句远超默认上限；导入路由用 query_budget(None) 取消限制
+    names = [unique_name("Budget") for _ in range(60)]
+    csv = "品牌名称\n" + "".join(f"{name}\n" for name in names)
+    response = client.post("/api/v1/brands/import", content=csv.encode(), headers={**admin_headers, "Content-Type": "text/csv"})
+    assert response.status_code == 200, response.text
+    assert response.json()["summary"]["inserted"] == 60
+    assert _queries(response) > instrumentation.SQL_QUERY_BUDGET
+
+
+def test_list_query_count_does_not_grow_with_page_size(client, admin_headers, catalog):
+    # 结果行数不影响语句数（没有逐行加载关联的 N+1）
+    brand, brand_id, mount, _ = catalog
+    csv = "品牌,卡口,型号\n" + "".join(f"{brand},{mount},{brand}-{i}\n" for i in range(8))
+    response = client.post("/api/v1/cameras/import", content=csv.encode(), headers={**admin_headers, "Content-Type": "text/csv"})
+    assert response.json()["summary"]["inserted"] == 8
+
+    def queries(limit: int) -> int:
+        response = client.get(f"/api/v1/cameras/query?brand_id={brand_id}&limit={limit}")
+        assert response.status_code == 200
+        assert len(response.json()["data"]) == limit
+        return _queries(response)
+
+    assert queries(2) == queries(8)
@@ -0,0 +1,49 @@
+"""
+高速 JSON 序列化 - 列表类接口直接把投影出的字典行编码为 JSON 字节
+
+路由返回 FastJSONResponse 时 FastAPI 不再按 response_model 校验和序列化，
+response_model 仅用于生成接口文档，因此行数据必须已经只包含响应模型的字段。
+"""
+from typing import Any, Iterable
+
+import orjson
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+
+# 允许非字符串键（分面统计中的数值）
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps(content: Any) -> bytes:
+    """编码为 JSON 字节（datetime/date/Enum 由 orjson 原生处理）"""
+    return orjson.dumps(content, option=_OPTIONS)
+
+
+class FastJSONResponse(Response):
+    """使用 orjson 编码的 JSON 响应，也可以直接传入已编码的字节"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    逐项编码为 NDJSON 的流式响应（每项一行）
+
+    不在发送期间监听客户端断开：请求体本身可能仍在边接收边读取（如流式导入），
+    监听会取走尚未读取的请求体分块；客户端断开时发送失败，迭代随之中止。
+    """
+
+    media_type = "application/x-ndjson"
+
+    def __init__(self, content: Iterable[Any], **kwargs):
+        super().__init__((dumps(item) + b"\n" for item in content), **kwargs)
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,46 @@
+"""
+流式请求体适配 - 把异步的请求体分块转换为同步读取的文件对象
+
+导入在线程池中同步执行；读取时通过 anyio 回到事件循环取下一块请求体，
+上传尚未结束时就可以开始解析和写入，请求体不会整体缓存在内存或磁盘中。
+"""
+import io
+from typing import AsyncIterator, Iterator
+
+import anyio.from_thread
+
+
+class IterStream(io.RawIOBase):
+    """由字节块迭代器构成的只读原始流"""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        while not self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._buffer = chunk
+        size = min(len(target), len(self._buffer))
+        target[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+def iter_from_thread(chunks: AsyncIterator[bytes]) -> Iterator[bytes]:
+    """在 anyio 工作线程中逐块读取异步迭代器（如 request.stream()）"""
+    while True:
+        try:
+            yield anyio.from_thread.run(chunks.__anext__)
+        except StopAsyncIteration:
+            return
+
+
+def open_stream(chunks: AsyncIterator[bytes]) -> io.BufferedReader:
+    """把异步请求体包装为同步的二进制文件对象，只能在 anyio 工作线程中读取"""
+    return io.BufferedReader(IterStream(iter_from_thread(chunks)))